@@ -1,37 +1,230 @@
+import asyncio
+import threading
+import time
 from abc import ABC, abstractmethod
-from langchain_community.llms import Ollama
-from langchain.callbacks.manager import CallbackManager
-from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+from contextlib import nullcontext
+from typing import Any, Dict, Optional
+from langchain_community.chat_models import ChatOllama
+from config.settings import CONFIG
 from core.exceptions import ModelError
+from utils.llm_cache import InFlightCalls, get_shared_llm_cache, make_cache_key
+from utils.llm_scheduler import current_session_id, get_shared_llm_scheduler
+from utils.prompt_stats import get_current_recorder
+from utils.tracing import span
+
+# One Ollama client per model for the whole process, shared by every session
+_llm_pool = {}
+_llm_pool_lock = threading.Lock()
+
+# Cached calls being made right now, shared like the cache itself
+_inflight_calls = InFlightCalls()
+
+def get_shared_llm(model_name: str = "llama3.2"):
+    """Get the process-wide LLM client for a model, creating it on first use"""
+    with _llm_pool_lock:
+        llm = _llm_pool.get(model_name)
+        if llm is None:
+            llm = _create_llm(model_name)
+            _llm_pool[model_name] = llm
+        return llm
+
+def _create_llm(model_name: str):
+    """Initialize the local LLAMA model via Ollama"""
+    try:
+        # Chat messages keep the instruction prefix identical across calls, and
+        # keep_alive holds the model (and its KV cache) in memory between turns
+        llm = ChatOllama(
+            model=model_name,
+            base_url=CONFIG.model.base_url,
+            temperature=CONFIG.model.temperature,
+            num_ctx=CONFIG.model.num_ctx,
+            num_predict=CONFIG.model.num_predict,
+            keep_alive=CONFIG.model.keep_alive,
+        )
+        
+        # Test the model once per process
+        test_response = llm.invoke("Hello")
+        print(f"✅ Local LLM initialized successfully with model: {model_name}")
+        return llm
+        
+    except Exception as e:
+        raise ModelError(f"Error initializing local LLM: {e}")
 
 class BaseAgent(ABC):
     """Base class for all agents"""
     
-    def __init__(self, model_name: str = "llama3.2"):
-        self.llm = self._initialize_llm(model_name)
+    # Stage name of this agent's LLM calls in traces
+    trace_name = "agent"
+    
+    # Reuse responses to identical prompts; for deterministic extraction, not conversation
+    cache_responses = False
+    
+    # Scheduling class of this agent's LLM calls: interactive, extraction or background
+    llm_priority = "extraction"
+    
+    def __init__(self, model_name: str = "llama3.2", llm=None):
+        self.llm = llm if llm is not None else self._initialize_llm(model_name)
+        self.response_cache = get_shared_llm_cache() if self.cache_responses else None
+        self.scheduler = get_shared_llm_scheduler()
     
     def _initialize_llm(self, model_name: str):
-        """Initialize the local LLAMA model via Ollama"""
-        try:
-            callback_manager = CallbackManager([StreamingStdOutCallbackHandler()])
-            
-            llm = Ollama(
-                model=model_name,
-                callback_manager=callback_manager,
-                temperature=0.7,
-                num_ctx=4096,
-                num_predict=512,
-            )
-            
-            # Test the model
-            test_response = llm.invoke("Hello")
-            print(f"✅ Local LLM initialized successfully with model: {model_name}")
-            return llm
-            
-        except Exception as e:
-            raise ModelError(f"Error initializing local LLM: {e}")
+        """Get the shared local LLAMA client for this model"""
+        return get_shared_llm(model_name)
+    
+    def _llm_config(self) -> Dict[str, Any]:
+        """Per-call config that reports prompt-eval stats to the current turn's recorder"""
+        recorder = get_current_recorder()
+        return {"callbacks": [recorder]} if recorder else {}
+    
+    def _invoke_llm(self, messages, use_cache: bool = True, **llm_options) -> str:
+        """Run an LLM completion and return its text; llm_options override model options for this call
+
+        Agents with cache_responses reuse the text of an identical earlier call
+        unless use_cache is False. Identical calls made at the same time wait for
+        the first one and take its text from the cache.
+        """
+        cache_key = self._cache_key(messages, llm_options) if use_cache else None
+        with span(f"llm.{self.trace_name}", prompt_chars=self._prompt_chars(messages)) as attributes:
+            text = self._cached_response(cache_key, attributes)
+            while text is None:
+                running = _inflight_calls.claim(cache_key) if cache_key is not None else None
+                if running is not None:
+                    running.result()
+                    attributes["coalesced"] = True
+                    text = self._cached_response(cache_key, attributes)
+                    continue
+                try:
+                    with self._llm_slot():
+                        response = self.llm.invoke(messages, config=self._llm_config(), **llm_options)
+                    text = getattr(response, "content", response)
+                    self._store_response(cache_key, text)
+                finally:
+                    if cache_key is not None:
+                        _inflight_calls.release(cache_key)
+            attributes["chars"] = len(text)
+        return text
+    
+    async def _ainvoke_llm(self, messages, use_cache: bool = True, **llm_options) -> str:
+        """Async variant of _invoke_llm"""
+        cache_key = self._cache_key(messages, llm_options) if use_cache else None
+        with span(f"llm.{self.trace_name}", prompt_chars=self._prompt_chars(messages)) as attributes:
+            text = self._cached_response(cache_key, attributes)
+            while text is None:
+                running = _inflight_calls.claim(cache_key) if cache_key is not None else None
+                if running is not None:
+                    # Shielded so a cancelled waiter does not cancel the call it waits for
+                    await asyncio.shield(asyncio.wrap_future(running))
+                    attributes["coalesced"] = True
+                    text = self._cached_response(cache_key, attributes)
+                    continue
+                try:
+                    async with self._allm_slot():
+                        response = await self.llm.ainvoke(messages, config=self._llm_config(), **llm_options)
+                    text = getattr(response, "content", response)
+                    self._store_response(cache_key, text)
+                finally:
+                    if cache_key is not None:
+                        _inflight_calls.release(cache_key)
+            attributes["chars"] = len(text)
+        return text
+    
+    def _llm_slot(self):
+        """Wait for a scheduler slot for one LLM call, at this agent's priority"""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot(self.llm_priority, current_session_id())
+    
+    def _allm_slot(self):
+        """Async variant of _llm_slot"""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.aslot(self.llm_priority, current_session_id())
+    
+    def _cache_key(self, messages, llm_options: Dict[str, Any]) -> Optional[str]:
+        """Key of a call in the response cache, or None when this agent does not cache"""
+        if self.response_cache is None:
+            return None
+        options = {
+            name: getattr(self.llm, name, None) for name in ("temperature", "num_ctx", "num_predict", "format")
+        }
+        options.update(llm_options)
+        model = getattr(self.llm, "model", None) or type(self.llm).__name__
+        return make_cache_key(model, options, messages)
+    
+    def _cached_response(self, cache_key: Optional[str], attributes: Dict[str, Any]) -> Optional[str]:
+        if cache_key is None:
+            return None
+        text = self.response_cache.get(cache_key)
+        attributes["cache_hit"] = text is not None
+        return text
+    
+    def _store_response(self, cache_key: Optional[str], text: str):
+        if cache_key is not None and text:
+            self.response_cache.set(cache_key, text)
+    
+    def _discard_cached_response(self, messages, **llm_options):
+        """Drop a cached response that turned out to be unusable, so the next call asks the LLM again"""
+        cache_key = self._cache_key(messages, llm_options)
+        if cache_key is not None:
+            self.response_cache.delete(cache_key)
+    
+    def _stream_llm(self, messages, on_token) -> str:
+        """Stream an LLM completion, passing each token to on_token, and return the full text"""
+        chunks = []
+        with span(f"llm.{self.trace_name}", prompt_chars=self._prompt_chars(messages)) as attributes, self._llm_slot():
+            for token in self._iter_tokens(self.llm.stream(messages, config=self._llm_config()), attributes):
+                chunks.append(token)
+                on_token(token)
+        return "".join(chunks)
+    
+    async def _astream_llm(self, messages, on_token) -> str:
+        """Async variant of _stream_llm"""
+        chunks = []
+        with span(f"llm.{self.trace_name}", prompt_chars=self._prompt_chars(messages)) as attributes:
+            async with self._allm_slot():
+                async for token in self._aiter_tokens(self.llm.astream(messages, config=self._llm_config()), attributes):
+                    chunks.append(token)
+                    on_token(token)
+        return "".join(chunks)
+    
+    def _iter_tokens(self, stream, attributes: Dict[str, Any]):
+        """Yield the text of each streamed chunk, counting tokens and time to the first one"""
+        started = time.perf_counter()
+        attributes["tokens"] = attributes["chars"] = 0
+        for chunk in stream:
+            token = getattr(chunk, "content", chunk)
+            if token:
+                if not attributes["tokens"]:
+                    attributes["first_token_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                attributes["tokens"] += 1
+                attributes["chars"] += len(token)
+                yield token
+    
+    async def _aiter_tokens(self, stream, attributes: Dict[str, Any]):
+        """Async variant of _iter_tokens"""
+        started = time.perf_counter()
+        attributes["tokens"] = attributes["chars"] = 0
+        async for chunk in stream:
+            token = getattr(chunk, "content", chunk)
+            if token:
+                if not attributes["tokens"]:
+                    attributes["first_token_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                attributes["tokens"] += 1
+                attributes["chars"] += len(token)
+                yield token
+    
+    @staticmethod
+    def _prompt_chars(messages) -> int:
+        if isinstance(messages, str):
+            return len(messages)
+        return sum(len(str(getattr(message, "content", message))) for message in messages)
     
     @abstractmethod
     def process(self, *args, **kwargs):
         """Process method to be implemented by subclasses"""
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    async def aprocess(self, *args, **kwargs):
+        """Async process method to be implemented by subclasses"""
+        pass
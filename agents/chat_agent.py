@@ -1,45 +1,110 @@
+import uuid
 from datetime import datetime
-from langchain.schema import HumanMessage, AIMessage
+from typing import Callable, List, Optional
+from langchain.schema import HumanMessage, AIMessage, BaseMessage
 from agents.base_agent import BaseAgent
 from agents.profile_analyzer import ProfileAnalyzerAgent
 from agents.question_bank import QuestionBankAgent
-from core.types import ChatState
+from agents.conversation_memory import ConversationMemoryAgent, full_history
+from agents.prompts import build_interview_messages
+from core.types import ChatState, InterviewQuestion, ProfileAnalysis
+from config.settings import CONFIG
+from utils.near_duplicates import NearDuplicateFilter, split_sentences
+from utils.prompt_stats import PromptEvalRecorder, record_prompt_stats
 from utils.timer import TimerUtils
+from utils.tracing import span
 from core.exceptions import AgentError
 
 class EnhancedChatAgent(BaseAgent):
     """Enhanced chat agent with profile awareness and voice capabilities"""
 
-    def __init__(self, model_name: str = "llama3.2"):
-        super().__init__(model_name)
-        self.profile_analyzer = ProfileAnalyzerAgent(model_name)
-        self.question_bank_agent = QuestionBankAgent(model_name)
-        self.current_question_index = 0
+    trace_name = "interview"
 
-    def process(self, state: ChatState) -> ChatState:
-        """Process the user message and generate response"""
+    # A candidate is waiting on every reply
+    llm_priority = "interactive"
+
+    def __init__(self, model_name: str = "llama3.2", llm=None):
+        super().__init__(model_name, llm)
+        # Sub-agents share this agent's LLM client; per-interview cursors live in ChatState
+        self.profile_analyzer = ProfileAnalyzerAgent(model_name, self.llm)
+        self.question_bank_agent = QuestionBankAgent(model_name, self.llm)
+        self.memory = ConversationMemoryAgent(model_name, self.llm)
+
+    def process(self, state: ChatState, on_token: Optional[Callable[[str], None]] = None) -> ChatState:
+        """Process the user message and generate response
+
+        When on_token is given, reply text is pushed to it as it is generated.
+        """
         try:
             # Check if interview time is up
             if self._check_time_up(state):
-                return self._handle_time_up(state)
+                return self._handle_time_up(state, on_token)
             
             # Get the last human message
             user_input = self._extract_user_input(state)
             
-            # Handle different interview stages
-            response = self._route_to_stage_handler(user_input, state)
+            # Handle different interview stages, tracking whether the handler streamed
+            emit, streamed = self._track_tokens(on_token)
+            with record_prompt_stats(CONFIG.memory.chars_per_token) as prompt_stats:
+                response = self._route_to_stage_handler(user_input, state, emit)
+            self._store_prompt_stats(state, prompt_stats)
 
-            # Add AI response to messages
-            state["messages"].append(AIMessage(content=response))
+            return self._complete_turn(state, user_input, response, on_token, streamed)
+
+        except Exception as e:
+            raise AgentError(f"Chat processing failed: {e}")
 
-            # Update conversation history
-            self._update_conversation_history(state, user_input, response)
+    async def aprocess(self, state: ChatState, on_token: Optional[Callable[[str], None]] = None) -> ChatState:
+        """Async variant of process that awaits the LLM instead of blocking a thread"""
+        try:
+            if self._check_time_up(state):
+                return self._handle_time_up(state, on_token)
+            
+            user_input = self._extract_user_input(state)
+            
+            emit, streamed = self._track_tokens(on_token)
+            with record_prompt_stats(CONFIG.memory.chars_per_token) as prompt_stats:
+                response = await self._aroute_to_stage_handler(user_input, state, emit)
+            self._store_prompt_stats(state, prompt_stats)
 
-            return state
+            return self._complete_turn(state, user_input, response, on_token, streamed)
 
         except Exception as e:
             raise AgentError(f"Chat processing failed: {e}")
 
+    def _track_tokens(self, on_token: Optional[Callable[[str], None]]):
+        """Wrap on_token to record whether the stage handler streamed anything"""
+        streamed = []
+        if not on_token:
+            return None, streamed
+
+        def emit(token: str):
+            streamed.append(token)
+            on_token(token)
+
+        return emit, streamed
+
+    def _store_prompt_stats(self, state: ChatState, prompt_stats: PromptEvalRecorder):
+        """Keep the turn's prompt-eval stats for the debug view"""
+        if prompt_stats.calls:
+            state["prompt_stats"] = prompt_stats.summary()
+
+    def _complete_turn(self, state: ChatState, user_input: str, response: str,
+                       on_token: Optional[Callable[[str], None]], streamed: list) -> ChatState:
+        """Record the reply in the state once a stage handler has produced it"""
+        # Non-generative stages produce their reply in one piece
+        if on_token and not streamed:
+            on_token(response)
+
+        # Add AI response to messages
+        state["messages"].append(AIMessage(content=response))
+
+        # Update conversation history and keep it within the memory budget
+        self._update_conversation_history(state, user_input, response)
+        self.memory.after_turn(state)
+
+        return state
+
     def _extract_user_input(self, state: ChatState) -> str:
         """Extract user input from messages"""
         if state["messages"]:
@@ -49,12 +114,14 @@ class EnhancedChatAgent(BaseAgent):
         return "Hello"
 
     def _update_conversation_history(self, state: ChatState, user_input: str, response: str):
-        """Update conversation history"""
+        """Update conversation history and the signatures of what was asked"""
+        self._asked_signatures(state)
         state["conversation_history"].append({
             "user": user_input,
             "assistant": response,
             "timestamp": datetime.now().isoformat(),
         })
+        self._remember_asked(state, split_sentences(response))
 
     def _check_time_up(self, state: ChatState) -> bool:
         """Check if interview time is up"""
@@ -66,7 +133,7 @@ class EnhancedChatAgent(BaseAgent):
         
         return TimerUtils.is_time_up(start_time, duration)
 
-    def _handle_time_up(self, state: ChatState) -> ChatState:
+    def _handle_time_up(self, state: ChatState, on_token: Optional[Callable[[str], None]] = None) -> ChatState:
         """Handle when interview time is up"""
         if not state.get("is_interview_ended", False):
             final_message = self._generate_time_up_message(state)
@@ -76,6 +143,9 @@ class EnhancedChatAgent(BaseAgent):
             
             state["messages"].append(AIMessage(content=final_message))
             self._update_conversation_history(state, "Time is up", final_message)
+
+            if on_token:
+                on_token(final_message)
         
         return state
 
@@ -88,7 +158,8 @@ class EnhancedChatAgent(BaseAgent):
 
 Thank you so much for your time today. I really enjoyed learning about your experience in {domain} and your professional journey. We'll be in touch soon regarding the next steps. Have a great day!"""
 
-    def _route_to_stage_handler(self, user_input: str, state: ChatState) -> str:
+    def _route_to_stage_handler(self, user_input: str, state: ChatState,
+                                on_token: Optional[Callable[[str], None]] = None) -> str:
         """Route to appropriate stage handler"""
         stage = state["interview_stage"]
         
@@ -97,12 +168,24 @@ Thank you so much for your time today. I really enjoyed learning about your expe
         elif stage == "profile_collection":
             return self._handle_profile_collection(user_input, state)
         elif stage == "interview":
-            return self._handle_interview(user_input, state)
+            return self._handle_interview(user_input, state, on_token)
         elif stage == "ended":
             return "Thank you for your time. The interview has concluded."
         else:
             return "How can I help you today?"
 
+    async def _aroute_to_stage_handler(self, user_input: str, state: ChatState,
+                                       on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Route to the async handler for stages that call the LLM"""
+        stage = state["interview_stage"]
+        
+        if stage == "profile_collection":
+            return await self._ahandle_profile_collection(user_input, state)
+        elif stage == "interview":
+            return await self._ahandle_interview(user_input, state, on_token)
+        else:
+            return self._route_to_stage_handler(user_input, state, on_token)
+
     def _handle_greeting(self, user_input: str, state: ChatState) -> str:
         """Handle initial greeting"""
         state["interview_start_time"] = datetime.now()
@@ -125,14 +208,52 @@ This will help me tailor our conversation to your experience."""
         
         # Store and analyze profile
         state["candidate_info"]["profile_text"] = user_input
+        if CONFIG.model.profile_with_questions and not self._has_requisition_bank(state):
+            # One generation for the profile and the custom questions
+            result = self.profile_analyzer.analyze_with_questions(user_input)
+            if result is not None:
+                return self._start_interview(state, *result)
+
         profile_analysis = self.profile_analyzer.process(user_input)
-        state["profile_analysis"] = profile_analysis
+        return self._start_interview(state, profile_analysis)
 
-        # Generate customized questions
-        question_bank = self.question_bank_agent.process(profile_analysis)
+    async def _ahandle_profile_collection(self, user_input: str, state: ChatState) -> str:
+        """Async variant of _handle_profile_collection"""
+        state["candidate_info"]["profile_text"] = user_input
+        if CONFIG.model.profile_with_questions and not self._has_requisition_bank(state):
+            result = await self.profile_analyzer.aanalyze_with_questions(user_input)
+            if result is not None:
+                return self._start_interview(state, *result)
+
+        profile_analysis = await self.profile_analyzer.aprocess(user_input)
+        return self._start_interview(state, profile_analysis)
+
+    def _start_interview(self, state: ChatState, profile_analysis: ProfileAnalysis,
+                         custom_questions: Optional[List[InterviewQuestion]] = None) -> str:
+        """Store the analyzed profile, seed the question bank and ask the first question"""
+        state["profile_analysis"] = profile_analysis
+        requisition_id = state.get("requisition_id") or None
+
+        # A stored bank (pre-generated or curated for the role) wins over questions
+        # written alongside the profile; those are only kept where none is stored yet
+        stored_questions = self.question_bank_agent.lookup_stored_questions(profile_analysis, requisition_id)
+        if stored_questions is not None:
+            custom_questions = stored_questions
+        elif custom_questions is not None:
+            self.question_bank_agent.store_questions(custom_questions, profile_analysis, requisition_id)
+
+        if custom_questions is not None:
+            question_bank = self.question_bank_agent.build_bank(profile_analysis, custom_questions)
+        else:
+            # Serve the standard questions now; custom ones are generated in the
+            # background and merged into the bank on later turns
+            question_bank = self.question_bank_agent.get_initial_questions(profile_analysis)
+            self.question_bank_agent.start_background_generation(
+                self._get_session_id(state), profile_analysis, requisition_id
+            )
         state["question_bank"] = question_bank
         state["interview_stage"] = "interview"
-        self.current_question_index = 0
+        state["current_question_index"] = 0
 
         # Provide feedback and ask first question
         domain = profile_analysis.get("domain", "your field")
@@ -149,56 +270,112 @@ Now let's dive deeper into your experience. """
         else:
             return feedback + "Can you tell me about a recent project you're particularly proud of?"
 
-    def _handle_interview(self, user_input: str, state: ChatState) -> str:
+    def _handle_interview(self, user_input: str, state: ChatState,
+                          on_token: Optional[Callable[[str], None]] = None) -> str:
         """Handle main interview conversation"""
-        
-        profile_analysis = state.get("profile_analysis", {})
-        question_bank = state.get("question_bank", [])
-        context = self._build_interview_context(state)
-
-        prompt = f"""You are an HR interviewer conducting a job interview. 
+        messages = self._build_interview_messages(user_input, state)
 
-Candidate Profile:
-- Domain: {profile_analysis.get('domain', 'General')}
-- Experience Level: {profile_analysis.get('experience_level', 'Mid')}
-- Key Skills: {', '.join(profile_analysis.get('skills', [])[:3])}
-
-Recent Context:
-{context}
+        try:
+            if on_token:
+                response = self._stream_llm(messages, on_token)
+            else:
+                response = self._invoke_llm(messages)
 
-Candidate's response: "{user_input}"
+            return self._advance_question(response, state, on_token)
 
-Provide a thoughtful follow-up. You can:
-1. Ask a relevant follow-up question
-2. Explore their skills in more depth
-3. Move to the next topic
+        except Exception as e:
+            raise AgentError(f"Interview response generation failed: {e}")
 
-Keep your response conversational and under 3 sentences."""
+    async def _ahandle_interview(self, user_input: str, state: ChatState,
+                                 on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Async variant of _handle_interview"""
+        messages = self._build_interview_messages(user_input, state)
 
         try:
-            response = self.llm.invoke(prompt)
-
-            # Optionally move to next structured question
-            if (question_bank and 
-                self.current_question_index < len(question_bank) - 1 and
-                len(state.get("conversation_history", [])) % 3 == 0):
-                
-                self.current_question_index += 1
-                next_q = question_bank[self.current_question_index]
-                state["current_question"] = next_q["question"]
-                response += f"\n\nLet me ask you about something else: {next_q['question']}"
+            if on_token:
+                response = await self._astream_llm(messages, on_token)
+            else:
+                response = await self._ainvoke_llm(messages)
 
-            return response.strip()
+            return self._advance_question(response, state, on_token)
 
         except Exception as e:
             raise AgentError(f"Interview response generation failed: {e}")
 
-    def _build_interview_context(self, state: ChatState) -> str:
-        """Build context from recent conversation"""
-        context = ""
-        conversation_history = state.get("conversation_history", [])
-        if conversation_history:
-            recent_history = conversation_history[-2:]
-            for exchange in recent_history:
-                context += f"Interviewer: {exchange['assistant']}\nCandidate: {exchange['user']}\n"
-        return context
\ No newline at end of file
+    def _build_interview_messages(self, user_input: str, state: ChatState) -> List[BaseMessage]:
+        """Build the follow-up chat for an interview turn"""
+        self._merge_background_questions(state)
+        summary, turns = self.memory.select_context(state)
+        return build_interview_messages(state.get("profile_analysis", {}), summary, turns, user_input)
+
+    def _advance_question(self, response: str, state: ChatState,
+                          on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Optionally move to the next structured question after the follow-up"""
+        question_bank = state.get("question_bank", [])
+        question_index = state.get("current_question_index", 0)
+        if (question_bank and 
+            question_index < len(question_bank) - 1 and
+            self.memory.turn_count(state) % 3 == 0):
+            
+            # Skip bank questions the interview has already covered, follow-ups included
+            with span("interview.next_question") as attributes:
+                next_index = self.question_bank_agent.next_question_index(
+                    question_bank, question_index + 1, self._asked_signatures(state), split_sentences(response)
+                )
+                if next_index is None:
+                    # Better a near-repeat than an interview that stops moving on
+                    attributes["all_repeat"] = True
+                    next_index = question_index + 1
+                attributes["skipped"] = next_index - question_index - 1
+            question_index = next_index
+            state["current_question_index"] = question_index
+            next_q = question_bank[question_index]
+            state["current_question"] = next_q["question"]
+            transition = f"\n\nLet me ask you about something else: {next_q['question']}"
+            response += transition
+            if on_token:
+                on_token(transition)
+
+        return response.strip()
+
+    def _asked_signatures(self, state: ChatState) -> List[str]:
+        """Near-duplicate signatures of everything the interviewer has said, kept in the state
+
+        Interviews checkpointed before signatures were kept are seeded once from
+        their bank questions and full history.
+        """
+        if "asked_signatures" not in state:
+            asked = [q["question"] for q in state.get("question_bank", [])[:state.get("current_question_index", 0) + 1]]
+            replies = [turn["assistant"] for turn in full_history(state)]
+            state["asked_signatures"] = []
+            self._remember_asked(state, asked + [sentence for reply in replies for sentence in split_sentences(reply)])
+        return state["asked_signatures"]
+
+    def _remember_asked(self, state: ChatState, texts: List[str]):
+        """Add the signatures of texts the interviewer said to the state"""
+        block = NearDuplicateFilter().encode(texts)
+        if block is not None:
+            state["asked_signatures"].append(block)
+
+    def _has_requisition_bank(self, state: ChatState) -> bool:
+        """Whether the interview's job requisition already has stored questions, so only the profile is needed"""
+        requisition_id = state.get("requisition_id")
+        store = self.question_bank_agent.store
+        return bool(requisition_id and store and store.contains(store.requisition_key(requisition_id)))
+
+    def _get_session_id(self, state: ChatState) -> str:
+        """Get the id that keys this interview's background work"""
+        if not state.get("session_id"):
+            state["session_id"] = uuid.uuid4().hex
+        return state["session_id"]
+
+    def _merge_background_questions(self, state: ChatState):
+        """Merge any custom questions generated since the last turn into the bank"""
+        new_questions = self.question_bank_agent.collect_background_questions(self._get_session_id(state))
+        if new_questions:
+            state["question_bank"] = self.question_bank_agent.merge_questions(
+                state.get("question_bank", []),
+                new_questions,
+                state.get("current_question_index", 0),
+                state.get("profile_analysis", {}),
+            )
@@ -0,0 +1,151 @@
+import base64
+import json
+import zlib
+from typing import Dict, List, Tuple
+from agents.base_agent import BaseAgent
+from agents.prompts import build_summary_messages
+from config.settings import CONFIG
+from core.types import ChatState
+from core.exceptions import AgentError
+from utils.background_tasks import BackgroundTask, BackgroundTaskRegistry
+
+Turn = Dict[str, str]
+
+def compress_turns(turns: List[Turn]) -> str:
+    """Pack turns into a compact text block that survives JSON checkpoints"""
+    return base64.b64encode(zlib.compress(json.dumps(turns).encode("utf-8"))).decode("ascii")
+
+def expand_turns(block: str) -> List[Turn]:
+    """Unpack a block written by compress_turns"""
+    return json.loads(zlib.decompress(base64.b64decode(block)).decode("utf-8"))
+
+def full_history(state: ChatState) -> List[Turn]:
+    """Get every turn of the interview, archived ones included"""
+    turns = []
+    for block in state.get("conversation_archive", []):
+        turns.extend(expand_turns(block))
+    return turns + state.get("conversation_history", [])
+
+class ConversationMemoryAgent(BaseAgent):
+    """Keep the interview context within a token budget
+
+    Turns that age out of the recent window are folded into a running summary
+    in the background, then moved compressed out of the live history.
+    """
+
+    trace_name = "memory_summary"
+
+    llm_priority = "background"
+
+    def __init__(self, model_name: str = "llama3.2", llm=None):
+        super().__init__(model_name, llm)
+        self.config = CONFIG.memory
+        # At most one summary job per interview session, keyed by session id
+        self.background_jobs = BackgroundTaskRegistry(CONFIG.model.background_workers)
+
+    def process(self, summary: str, turns: List[Turn]) -> str:
+        """Fold turns into the running summary"""
+        try:
+            return self._invoke_llm(build_summary_messages(summary, turns)).strip()
+        except Exception as e:
+            raise AgentError(f"Conversation summary failed: {e}")
+
+    async def aprocess(self, summary: str, turns: List[Turn]) -> str:
+        """Async variant of process"""
+        try:
+            response = await self._ainvoke_llm(build_summary_messages(summary, turns))
+            return response.strip()
+        except Exception as e:
+            raise AgentError(f"Conversation summary failed: {e}")
+
+    def select_context(self, state: ChatState) -> Tuple[str, List[Turn]]:
+        """Pick the running summary and the newest turns that fit the budget
+
+        Turns are taken from where the summary ends, so the selection only
+        changes at its end until the summary advances or the budget runs out.
+        """
+        self._collect_summary(state)
+        budget = self.config.context_tokens
+
+        summary = state.get("conversation_summary", "")
+        budget -= self.estimate_tokens(summary)
+
+        recent = []
+        for exchange in reversed(self._unsummarized_turns(state)):
+            cost = self.estimate_tokens(exchange["user"]) + self.estimate_tokens(exchange["assistant"])
+            if cost > budget:
+                # The newest turn is always kept, with the candidate's answer cut to what fits
+                keep_chars = (budget - self.estimate_tokens(exchange["assistant"])) * self.config.chars_per_token
+                if not recent and keep_chars > 0:
+                    recent.append({**exchange, "user": exchange["user"][-keep_chars:]})
+                break
+            recent.append(exchange)
+            budget -= cost
+
+        return summary, list(reversed(recent))
+
+    def after_turn(self, state: ChatState):
+        """Apply a finished summary, compact old turns and schedule the next summary"""
+        self._collect_summary(state)
+        self._archive_turns(state)
+        state["messages"] = state["messages"][-self.config.max_messages:]
+        self._schedule_summary(state)
+
+    def turn_count(self, state: ChatState) -> int:
+        """Number of turns in the interview so far, archived ones included"""
+        return state.get("archived_turns", 0) + len(state.get("conversation_history", []))
+
+    def estimate_tokens(self, text: str) -> int:
+        """Estimate the token count of text without a tokenizer"""
+        return -(-len(text) // self.config.chars_per_token)
+
+    def _unsummarized_turns(self, state: ChatState) -> List[Turn]:
+        """Live turns the running summary does not cover yet"""
+        start = state.get("summarized_turns", 0) - state.get("archived_turns", 0)
+        return state.get("conversation_history", [])[max(start, 0):]
+
+    def _schedule_summary(self, state: ChatState):
+        """Summarize turns that aged out of the recent window, off the request path"""
+        session_id = state.get("session_id")
+        if not session_id or self.background_jobs.get(session_id) is not None:
+            return
+
+        start = state.get("summarized_turns", 0)
+        end = self.turn_count(state) - self.config.recent_turns
+        if end - start < self.config.summary_batch_turns:
+            return
+
+        offset = state.get("archived_turns", 0)
+        turns = [dict(turn) for turn in state["conversation_history"][start - offset:end - offset]]
+        self.background_jobs.submit(session_id, self._summarize_in_background,
+                                    state.get("conversation_summary", ""), turns, end)
+
+    def _summarize_in_background(self, task: BackgroundTask, summary: str, turns: List[Turn], covered: int):
+        """Publish the updated summary with the number of turns it covers"""
+        task.add_result((self.process(summary, turns), covered))
+
+    def _collect_summary(self, state: ChatState):
+        """Take a finished summary job's result into the state"""
+        session_id = state.get("session_id")
+        task = self.background_jobs.get(session_id) if session_id else None
+        if task is None or not task.done:
+            return
+
+        self.background_jobs.discard(session_id)
+        results: List[Tuple[str, int]] = task.collect_new()
+        for summary, covered in results:
+            if covered > state.get("summarized_turns", 0):
+                state["conversation_summary"] = summary
+                state["summarized_turns"] = covered
+
+    def _archive_turns(self, state: ChatState):
+        """Move summarized turns beyond the live window into the compressed archive"""
+        history = state.get("conversation_history", [])
+        archived = state.get("archived_turns", 0)
+        count = min(state.get("summarized_turns", 0) - archived, len(history) - self.config.live_turns)
+        if count <= 0:
+            return
+
+        state.setdefault("conversation_archive", []).append(compress_turns(history[:count]))
+        state["conversation_history"] = history[count:]
+        state["archived_turns"] = archived + count
@@ -1,50 +1,215 @@
-from typing import Dict, Any
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from langchain.schema import BaseMessage
 from agents.base_agent import BaseAgent
-from core.types import ProfileAnalysis
+from agents.prompts import (
+    build_json_repair_messages,
+    build_profile_analysis_messages,
+    build_profile_json_messages,
+    build_profile_questions_messages,
+)
+from agents.question_bank import QuestionBankAgent
+from config.settings import CONFIG
+from core.types import InterviewQuestion, ProfileAnalysis
 from utils.text_processing import TextProcessor
 from core.exceptions import AgentError
+from utils.tracing import span
+
+EXPERIENCE_LEVELS = ("Junior", "Mid", "Senior")
+LIST_FIELDS = ("skills", "strengths", "focus_areas")
+
+# Checks parsed JSON; returns the validated result or the problems found
+Validator = Callable[[Any], Tuple[Any, List[str]]]
 
 class ProfileAnalyzerAgent(BaseAgent):
     """Analyze candidate profile and extract key information"""
 
-    def __init__(self, model_name: str = "llama3.2"):
-        super().__init__(model_name)
+    trace_name = "profile_analysis"
+
+    # Identical profile texts (retries, interview resets) get the same extraction
+    cache_responses = True
+
+    # A JSON answer gets one repair round before falling back to the text format
+    max_json_attempts = 2
+
+    def __init__(self, model_name: str = "llama3.2", llm=None):
+        super().__init__(model_name, llm)
         self.text_processor = TextProcessor()
 
     def process(self, profile_text: str) -> ProfileAnalysis:
         """Analyze candidate profile text and extract structured information"""
         
-        prompt = self._build_analysis_prompt(profile_text)
+        try:
+            if CONFIG.model.profile_json_output:
+                profile = self._analyze_as_json(profile_text)
+                if profile is not None:
+                    return profile
+
+            response = self._invoke_llm(build_profile_analysis_messages(profile_text))
+            return self._parse_response(response)
+        except Exception as e:
+            raise AgentError(f"Profile analysis failed: {e}")
+
+    async def aprocess(self, profile_text: str) -> ProfileAnalysis:
+        """Async variant of process"""
         
         try:
-            response = self.llm.invoke(prompt)
-            return self.text_processor.parse_profile_response(response)
+            if CONFIG.model.profile_json_output:
+                profile = await self._aanalyze_as_json(profile_text)
+                if profile is not None:
+                    return profile
+
+            response = await self._ainvoke_llm(build_profile_analysis_messages(profile_text))
+            return self._parse_response(response)
         except Exception as e:
             raise AgentError(f"Profile analysis failed: {e}")
 
-    def _build_analysis_prompt(self, profile_text: str) -> str:
-        """Build the analysis prompt"""
-        return f"""
-        Analyze the following candidate profile and extract key information:
-
-        Profile: "{profile_text}"
-
-        Extract and format the following information:
-        1. Experience Level (Junior/Mid/Senior)
-        2. Primary Skills (list up to 5 main skills)
-        3. Domain/Field (e.g., Software Engineering, Data Science, Marketing)
-        4. Years of Experience (estimate if not explicitly stated)
-        5. Key Strengths (based on description)
-        6. Potential Interview Focus Areas
-
-        Format your response as:
-        Experience Level: [level]
-        Primary Skills: [skill1, skill2, skill3]
-        Domain: [domain]
-        Years of Experience: [number]
-        Key Strengths: [strength1, strength2]
-        Interview Focus: [area1, area2, area3]
+    def analyze_with_questions(self, profile_text: str) -> Optional[Tuple[ProfileAnalysis, List[InterviewQuestion]]]:
+        """Extract the profile and write custom questions in one JSON generation
+
+        Returns None when the answer stays invalid, so callers can fall back to
+        separate analysis and question generation.
         """
+        return self._request_json(
+            build_profile_questions_messages(profile_text), self.validate_profile_with_questions,
+            CONFIG.model.profile_with_questions_num_predict, "profile_questions",
+        )
+
+    async def aanalyze_with_questions(self, profile_text: str) -> Optional[Tuple[ProfileAnalysis, List[InterviewQuestion]]]:
+        """Async variant of analyze_with_questions"""
+        return await self._arequest_json(
+            build_profile_questions_messages(profile_text), self.validate_profile_with_questions,
+            CONFIG.model.profile_with_questions_num_predict, "profile_questions",
+        )
+
+    def _analyze_as_json(self, profile_text: str) -> Optional[ProfileAnalysis]:
+        """Ask for the profile in Ollama's JSON mode"""
+        return self._request_json(
+            build_profile_json_messages(profile_text), self.validate_profile,
+            CONFIG.model.profile_num_predict, "profile",
+        )
+
+    async def _aanalyze_as_json(self, profile_text: str) -> Optional[ProfileAnalysis]:
+        """Async variant of _analyze_as_json"""
+        return await self._arequest_json(
+            build_profile_json_messages(profile_text), self.validate_profile,
+            CONFIG.model.profile_num_predict, "profile",
+        )
+
+    def _request_json(self, messages: List[BaseMessage], validate: Validator, num_predict: int, label: str):
+        """Generate in JSON mode and validate, repairing an invalid answer once; None if it stays invalid"""
+        with span(f"json_request.{label}") as attributes:
+            for _ in range(self.max_json_attempts):
+                response = self._invoke_llm(messages, format="json", num_predict=num_predict)
+                result, messages = self._check_json(messages, response, validate, num_predict, attributes)
+                if result is not None:
+                    return result
+        return None
+
+    async def _arequest_json(self, messages: List[BaseMessage], validate: Validator, num_predict: int, label: str):
+        """Async variant of _request_json"""
+        with span(f"json_request.{label}") as attributes:
+            for _ in range(self.max_json_attempts):
+                response = await self._ainvoke_llm(messages, format="json", num_predict=num_predict)
+                result, messages = self._check_json(messages, response, validate, num_predict, attributes)
+                if result is not None:
+                    return result
+        return None
+
+    def _check_json(self, messages: List[BaseMessage], response: str, validate: Validator, num_predict: int,
+                    attributes: Dict[str, Any]) -> Tuple[Any, List[BaseMessage]]:
+        """Validate one JSON-mode answer; an invalid one is dropped from the cache and the repair prompt returned"""
+        result, problems = self._parse_json_response(response, validate)
+        attributes["attempts"] = attributes.get("attempts", 0) + 1
+        attributes["valid"] = result is not None
+        if result is not None:
+            return result, messages
+
+        attributes["problems"] = "; ".join(problems)
+        self._discard_cached_response(messages, format="json", num_predict=num_predict)
+        return None, build_json_repair_messages(messages, response, problems)
+
+    def _parse_json_response(self, response: str, validate: Optional[Validator] = None) -> Tuple[Any, List[str]]:
+        """Parse and validate a JSON-mode answer; returns the result or the problems found"""
+        validate = validate or self.validate_profile
+        with span("parse.profile_json", chars=len(response)) as attributes:
+            # Tolerate a Markdown code fence around the object
+            text = re.sub(r"^```(?:json)?\s*|\s*```$", "", response.strip())
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError as e:
+                attributes["valid"] = False
+                return None, [f"not parseable JSON ({e.msg})"]
+
+            result, problems = validate(data)
+            attributes["valid"] = result is not None
+            return result, problems
+
+    @staticmethod
+    def validate_profile_with_questions(data: Any) -> Tuple[Optional[Tuple[ProfileAnalysis, List[InterviewQuestion]]], List[str]]:
+        """Check a combined answer: a profile object plus a list of questions"""
+        if not isinstance(data, dict):
+            return None, ["expected a JSON object with profile and questions"]
+
+        profile, problems = ProfileAnalyzerAgent.validate_profile(data.get("profile"))
+        problems = [f"profile: {problem}" for problem in problems]
+        questions, question_problems = QuestionBankAgent.validate_questions(data.get("questions"), profile or {})
+        problems += question_problems
+
+        if problems:
+            return None, problems
+        return (profile, questions), []
+
+    @staticmethod
+    def validate_profile(data: Any) -> Tuple[Optional[ProfileAnalysis], List[str]]:
+        """Check data against the ProfileAnalysis schema, normalizing what can be normalized"""
+        if not isinstance(data, dict):
+            return None, ["expected a JSON object"]
+
+        problems = []
+        level = str(data.get("experience_level", "")).strip().capitalize()
+        if level not in EXPERIENCE_LEVELS:
+            problems.append(f"experience_level must be one of {', '.join(EXPERIENCE_LEVELS)}")
+
+        domain = data.get("domain")
+        if not isinstance(domain, str) or not domain.strip():
+            problems.append("domain must be a non-empty string")
+
+        years = data.get("years_experience")
+        if isinstance(years, str) and years.strip().isdigit():
+            years = int(years.strip())
+        if isinstance(years, float) and years.is_integer():
+            years = int(years)
+        if not isinstance(years, int) or isinstance(years, bool) or years < 0:
+            problems.append("years_experience must be a non-negative integer")
+
+        lists = {}
+        for field in LIST_FIELDS:
+            value = data.get(field)
+            if isinstance(value, str):
+                value = value.split(",")
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                problems.append(f"{field} must be a list of strings")
+                continue
+            lists[field] = [item.strip() for item in value if item.strip()]
+
+        if problems:
+            return None, problems
+
+        return {
+            "experience_level": level,
+            "skills": lists["skills"][:5],
+            "domain": domain.strip(),
+            "years_experience": years,
+            "strengths": lists["strengths"],
+            "focus_areas": lists["focus_areas"],
+        }, []
+
+    def _parse_response(self, response: str) -> ProfileAnalysis:
+        """Parse the analysis text into a ProfileAnalysis"""
+        with span("parse.profile", chars=len(response)):
+            return self.text_processor.parse_profile_response(response)
 
     def get_default_profile(self) -> ProfileAnalysis:
         """Return default profile when analysis fails"""
@@ -0,0 +1,144 @@
+from typing import Dict, List, Optional, Sequence
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from core.types import ProfileAnalysis
+
+# Prompts are laid out most-stable first: static instructions, then per-session
+# context, then the conversation, then this call's input. Ollama can then reuse
+# the KV cache for the unchanged prefix instead of evaluating the whole prompt.
+
+INTERVIEWER_INSTRUCTIONS = """You are an HR interviewer conducting a job interview.
+
+After each candidate response, provide a thoughtful follow-up. You can:
+1. Ask a relevant follow-up question
+2. Explore their skills in more depth
+3. Move to the next topic
+
+Keep your response conversational and under 3 sentences."""
+
+PROFILE_ANALYST_INSTRUCTIONS = """Analyze the candidate profile you are given and extract key information:
+1. Experience Level (Junior/Mid/Senior)
+2. Primary Skills (list up to 5 main skills)
+3. Domain/Field (e.g., Software Engineering, Data Science, Marketing)
+4. Years of Experience (estimate if not explicitly stated)
+5. Key Strengths (based on description)
+6. Potential Interview Focus Areas
+
+Format your response as:
+Experience Level: [level]
+Primary Skills: [skill1, skill2, skill3]
+Domain: [domain]
+Years of Experience: [number]
+Key Strengths: [strength1, strength2]
+Interview Focus: [area1, area2, area3]"""
+
+PROFILE_JSON_SCHEMA = """{"experience_level": "Junior" | "Mid" | "Senior",
+ "skills": [up to 5 main skills],
+ "domain": field such as "Software Engineering", "Data Science" or "Marketing",
+ "years_experience": integer, estimated if not stated,
+ "strengths": [key strengths],
+ "focus_areas": [potential interview focus areas]}"""
+
+PROFILE_JSON_INSTRUCTIONS = f"""Extract the candidate profile you are given as a JSON object with exactly these keys:
+{PROFILE_JSON_SCHEMA}
+Answer with the JSON object only."""
+
+PROFILE_QUESTIONS_JSON_INSTRUCTIONS = f"""Extract the candidate profile you are given and write 3-5 interview questions for
+them, as one JSON object:
+{{"profile": {PROFILE_JSON_SCHEMA},
+ "questions": [{{"question": question text,
+                "type": "technical" | "behavioral" | "situational",
+                "difficulty": "easy" | "medium" | "hard"}}]}}
+Questions must be relevant to the candidate's domain and skills, appropriate for their
+experience level, and mix technical and behavioral topics.
+Answer with the JSON object only."""
+
+QUESTION_WRITER_INSTRUCTIONS = """Generate 3-5 interview questions for the candidate you are given.
+
+Create questions that are:
+1. Relevant to their domain and skills
+2. Appropriate for their experience level
+3. Mix of technical and behavioral questions
+
+Format each question as:
+Question: [question text]
+Type: [technical/behavioral/situational]
+Difficulty: [easy/medium/hard]"""
+
+NOTE_TAKER_INSTRUCTIONS = """You are keeping notes on a job interview.
+
+Update the notes you are given to cover the new part of the conversation. Keep the
+candidate's key claims, skills, examples and any concerns, and the topics already
+covered. Answer with the notes only, in under 150 words."""
+
+def format_profile(profile_analysis: ProfileAnalysis, max_skills: Optional[int] = 3) -> str:
+    """Describe the analyzed profile the same way in every prompt of a session"""
+    return f"""Candidate Profile:
+- Domain: {profile_analysis.get('domain', 'General')}
+- Experience Level: {profile_analysis.get('experience_level', 'Mid')}
+- Key Skills: {', '.join(profile_analysis.get('skills', [])[:max_skills])}"""
+
+def format_turns(turns: Sequence[Dict[str, str]]) -> str:
+    """Render turns as a plain transcript"""
+    return "".join(f"Candidate: {turn['user']}\nInterviewer: {turn['assistant']}\n" for turn in turns)
+
+def build_interview_messages(profile_analysis: ProfileAnalysis, summary: str,
+                             turns: Sequence[Dict[str, str]], user_input: str) -> List[BaseMessage]:
+    """Build the chat for an interview follow-up
+
+    The running summary gets its own message after the instructions and profile,
+    so that prefix stays byte-identical for the whole session as the summary changes.
+    """
+    system = f"{INTERVIEWER_INSTRUCTIONS}\n\n{format_profile(profile_analysis)}"
+    messages: List[BaseMessage] = [SystemMessage(content=system)]
+    if summary:
+        messages.append(SystemMessage(content=f"Notes on the earlier conversation:\n{summary}"))
+    for turn in turns:
+        messages.append(HumanMessage(content=turn["user"]))
+        messages.append(AIMessage(content=turn["assistant"]))
+    messages.append(HumanMessage(content=user_input))
+    return messages
+
+def build_profile_analysis_messages(profile_text: str) -> List[BaseMessage]:
+    """Build the chat for profile analysis"""
+    return [
+        SystemMessage(content=PROFILE_ANALYST_INSTRUCTIONS),
+        HumanMessage(content=f'Profile: "{profile_text}"'),
+    ]
+
+def build_profile_json_messages(profile_text: str) -> List[BaseMessage]:
+    """Build the chat for profile analysis in JSON mode"""
+    return [
+        SystemMessage(content=PROFILE_JSON_INSTRUCTIONS),
+        HumanMessage(content=f'Profile: "{profile_text}"'),
+    ]
+
+def build_profile_questions_messages(profile_text: str) -> List[BaseMessage]:
+    """Build the chat that extracts the profile and writes custom questions in one JSON answer"""
+    return [
+        SystemMessage(content=PROFILE_QUESTIONS_JSON_INSTRUCTIONS),
+        HumanMessage(content=f'Profile: "{profile_text}"'),
+    ]
+
+def build_json_repair_messages(messages: List[BaseMessage], response: str,
+                               problems: List[str]) -> List[BaseMessage]:
+    """Extend a JSON-mode chat with the invalid answer and a request to fix it"""
+    return messages + [
+        AIMessage(content=response),
+        HumanMessage(content=f"That JSON is invalid: {'; '.join(problems)}. "
+                             "Answer with the corrected JSON object only."),
+    ]
+
+def build_custom_questions_messages(profile_analysis: ProfileAnalysis) -> List[BaseMessage]:
+    """Build the chat for custom question generation"""
+    return [
+        SystemMessage(content=QUESTION_WRITER_INSTRUCTIONS),
+        HumanMessage(content=format_profile(profile_analysis, max_skills=None)),
+    ]
+
+def build_summary_messages(summary: str, turns: Sequence[Dict[str, str]]) -> List[BaseMessage]:
+    """Build the chat that extends the running interview notes"""
+    return [
+        SystemMessage(content=NOTE_TAKER_INSTRUCTIONS),
+        HumanMessage(content=f"Current notes:\n{summary or '(none yet)'}\n\n"
+                             f"New part of the conversation:\n{format_turns(turns)}"),
+    ]
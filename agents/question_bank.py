@@ -1,20 +1,75 @@
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
 from agents.base_agent import BaseAgent
+from agents.prompts import build_custom_questions_messages
+from config.settings import CONFIG
 from core.types import ProfileAnalysis, InterviewQuestion
 from core.exceptions import AgentError
+from utils.background_tasks import BackgroundTask, BackgroundTaskRegistry
+from utils.near_duplicates import NearDuplicateFilter
+from utils.question_bank_store import QuestionBankStore, get_shared_question_bank_store
+from utils.question_index import QuestionFeatures, QuestionIndex, get_shared_question_index, priority_order
+from utils.tracing import span
+
+QUESTION_HEADER = re.compile(r"\n\s*Question:")
+QUESTION_DIFFICULTIES = ("easy", "medium", "hard")
 
 class QuestionBankAgent(BaseAgent):
     """Generate and manage interview questions based on profile"""
 
-    def process(self, profile_analysis: ProfileAnalysis) -> List[InterviewQuestion]:
-        """Generate customized questions based on profile analysis"""
+    trace_name = "question_bank"
+
+    llm_priority = "background"
+
+    def __init__(self, model_name: str = "llama3.2", llm=None, store: Optional[QuestionBankStore] = None,
+                 corpus: Optional[QuestionIndex] = None):
+        super().__init__(model_name, llm)
+        # Custom question jobs per interview session, generated off the request path
+        self.background_jobs = BackgroundTaskRegistry(CONFIG.model.background_workers)
+        # Pre-generated custom questions per role; None when shared banks are disabled
+        self.store = store if store is not None else get_shared_question_bank_store()
+        # Curated questions retrieved per profile; None when no corpus is available
+        self.corpus = corpus if corpus is not None else get_shared_question_index()
+
+    def process(self, profile_analysis: ProfileAnalysis, requisition_id: Optional[str] = None) -> List[InterviewQuestion]:
+        """Generate customized questions based on profile analysis, serving a stored bank when there is one"""
+        
+        base_questions = self._get_base_questions() + self._get_corpus_questions(profile_analysis)
+        custom_questions = self.lookup_stored_questions(profile_analysis, requisition_id)
+        if custom_questions is None:
+            custom_questions = self._generate_custom_questions(profile_analysis)
+            self.store_questions(custom_questions, profile_analysis, requisition_id)
+        
+        all_questions = base_questions + custom_questions
+        return self._rank_questions(all_questions, profile_analysis)
+
+    async def aprocess(self, profile_analysis: ProfileAnalysis, requisition_id: Optional[str] = None) -> List[InterviewQuestion]:
+        """Async variant of process"""
         
-        base_questions = self._get_base_questions()
-        custom_questions = self._generate_custom_questions(profile_analysis)
+        base_questions = self._get_base_questions() + self._get_corpus_questions(profile_analysis)
+        custom_questions = self.lookup_stored_questions(profile_analysis, requisition_id)
+        if custom_questions is None:
+            custom_questions = await self._agenerate_custom_questions(profile_analysis)
+            self.store_questions(custom_questions, profile_analysis, requisition_id)
         
         all_questions = base_questions + custom_questions
-        return self._prioritize_questions(all_questions, profile_analysis)
+        return self._rank_questions(all_questions, profile_analysis)
+
+    def lookup_stored_questions(self, profile_analysis: Optional[ProfileAnalysis],
+                                requisition_id: Optional[str] = None) -> Optional[List[InterviewQuestion]]:
+        """Get pre-generated custom questions for the requisition or role, None on a miss"""
+        if self.store is None:
+            return None
+        with span("question_bank.lookup") as attributes:
+            questions = self.store.lookup(profile_analysis, requisition_id)
+            attributes["cache_hit"] = questions is not None
+        return questions
+
+    def store_questions(self, custom_questions: List[InterviewQuestion], profile_analysis: ProfileAnalysis,
+                        requisition_id: Optional[str] = None):
+        """Keep generated custom questions for later candidates in the same role"""
+        if self.store is not None and custom_questions:
+            self.store.store(custom_questions, profile_analysis, requisition_id)
 
     def _get_base_questions(self) -> List[InterviewQuestion]:
         """Get standard interview questions"""
@@ -45,88 +100,200 @@ class QuestionBankAgent(BaseAgent):
             },
         ]
 
+    def _get_corpus_questions(self, profile_analysis: ProfileAnalysis) -> List[InterviewQuestion]:
+        """Get the curated corpus questions that best match the profile"""
+        if self.corpus is None:
+            return []
+        with span("question_bank.corpus_search") as attributes:
+            questions = self.corpus.search(profile_analysis, CONFIG.interview.corpus_questions)
+            attributes["questions"] = len(questions)
+        return questions
+
+    def get_initial_questions(self, profile_analysis: ProfileAnalysis) -> List[InterviewQuestion]:
+        """Get a bank that can be served immediately, without waiting on the LLM"""
+        questions = self._get_base_questions() + self._get_corpus_questions(profile_analysis)
+        return self._rank_questions(questions, profile_analysis)
+
+    def build_bank(self, profile_analysis: ProfileAnalysis, custom_questions: List[InterviewQuestion]) -> List[InterviewQuestion]:
+        """Get a complete bank from custom questions that are already generated"""
+        questions = self._get_base_questions() + self._get_corpus_questions(profile_analysis) + custom_questions
+        return self._rank_questions(questions, profile_analysis)
+
+    @staticmethod
+    def validate_questions(items: Any, profile_analysis: ProfileAnalysis) -> Tuple[List[InterviewQuestion], List[str]]:
+        """Check generated question objects, normalizing them like parsed Question blocks"""
+        if not isinstance(items, list) or not items:
+            return [], ["questions must be a non-empty list"]
+
+        questions, problems = [], []
+        for position, item in enumerate(items, 1):
+            text = item.get("question") if isinstance(item, dict) else None
+            if not isinstance(text, str) or not text.strip():
+                problems.append(f"question {position} needs a question text")
+                continue
+            question_type = str(item.get("type") or "general").strip().lower()
+            difficulty = str(item.get("difficulty") or "medium").strip().lower()
+            questions.append({
+                "question": text.strip(),
+                "type": question_type,
+                "difficulty": difficulty if difficulty in QUESTION_DIFFICULTIES else "medium",
+                "category": "custom",
+                "domain": profile_analysis.get("domain", "General"),
+            })
+        return questions, problems
+
+    def start_background_generation(self, session_id: str, profile_analysis: ProfileAnalysis,
+                                    requisition_id: Optional[str] = None) -> BackgroundTask:
+        """Generate custom questions in the background for a session"""
+        return self.background_jobs.submit(session_id, self._generate_in_background, profile_analysis, requisition_id)
+
+    def collect_background_questions(self, session_id: str) -> List[InterviewQuestion]:
+        """Collect custom questions parsed since the last call for a session"""
+        task = self.background_jobs.get(session_id)
+        if task is None:
+            return []
+
+        new_questions = task.collect_new()
+        if task.is_drained():
+            self.background_jobs.discard(session_id)
+        return new_questions
+
+    def merge_questions(self, question_bank: List[InterviewQuestion], new_questions: List[InterviewQuestion],
+                        current_index: int, profile_analysis: ProfileAnalysis) -> List[InterviewQuestion]:
+        """Merge new questions into the part of the bank that has not been asked yet"""
+        asked = question_bank[:current_index + 1]
+        remaining = question_bank[current_index + 1:] + new_questions
+        return asked + self._rank_questions(remaining, profile_analysis, [q["question"] for q in asked])
+
+    def next_question_index(self, question_bank: List[InterviewQuestion], start: int,
+                            asked_signatures: Iterable[str], asked_texts: Iterable[str] = ()) -> Optional[int]:
+        """Index of the first question from start on that does not repeat what was already asked
+
+        Earlier turns come as signature blocks from NearDuplicateFilter.encode, so
+        only asked_texts (the current reply) are hashed here.
+        """
+        seen = NearDuplicateFilter(CONFIG.interview.duplicate_threshold)
+        seen.add_encoded(asked_signatures)
+        seen.add_all(asked_texts)
+        for index in range(start, len(question_bank)):
+            if not seen.is_duplicate(question_bank[index]["question"]):
+                return index
+        return None
+
+    def _rank_questions(self, questions: List[InterviewQuestion], profile_analysis: ProfileAnalysis,
+                        seen_texts: Iterable[str] = ()) -> List[InterviewQuestion]:
+        """Prioritize questions, keeping only the best-ranked of each group of near-duplicates"""
+        with span("question_bank.deduplicate", questions=len(questions)) as attributes:
+            seen = NearDuplicateFilter(CONFIG.interview.duplicate_threshold)
+            seen.add_all(seen_texts)
+            ranked = [
+                question for question in self._prioritize_questions(questions, profile_analysis)
+                if seen.add_if_new(question["question"])
+            ]
+            attributes["dropped"] = len(questions) - len(ranked)
+        return ranked
+
+    def _generate_in_background(self, task: BackgroundTask, profile_analysis: ProfileAnalysis,
+                                requisition_id: Optional[str] = None):
+        """Publish each custom question to the task as soon as it is parsed, then store the bank"""
+        questions = self.stream_custom_questions(profile_analysis, task.add_result)
+        self.store_questions(questions, profile_analysis, requisition_id)
+
+    def stream_custom_questions(self, profile_analysis: ProfileAnalysis,
+                                on_question: Callable[[InterviewQuestion], None]) -> List[InterviewQuestion]:
+        """Pass each custom question to on_question as soon as it is parsed, while the LLM is still generating
+
+        on_question runs while this call holds its scheduler slot, so it should be quick.
+        """
+        messages = build_custom_questions_messages(profile_analysis)
+        questions = []
+
+        try:
+            with span(f"llm.{self.trace_name}", prompt_chars=self._prompt_chars(messages)) as attributes, self._llm_slot():
+                chunks = self._iter_tokens(self.llm.stream(messages, config=self._llm_config()), attributes)
+                for question in self._iter_custom_questions(chunks, profile_analysis):
+                    questions.append(question)
+                    on_question(question)
+        except Exception as e:
+            raise AgentError(f"Custom question generation failed: {e}")
+        return questions
+
     def _generate_custom_questions(self, profile_analysis: ProfileAnalysis) -> List[InterviewQuestion]:
         """Generate questions customized to the candidate's profile"""
         
-        domain = profile_analysis.get("domain", "General")
-        skills = profile_analysis.get("skills", [])
-        experience_level = profile_analysis.get("experience_level", "Mid")
-
-        prompt = f"""
-        Generate 3-5 interview questions for a candidate with:
-        - Domain: {domain}
-        - Skills: {', '.join(skills)}
-        - Experience Level: {experience_level}
-        
-        Create questions that are:
-        1. Relevant to their domain and skills
-        2. Appropriate for their experience level
-        3. Mix of technical and behavioral questions
+        messages = build_custom_questions_messages(profile_analysis)
+
+        try:
+            response = self._invoke_llm(messages)
+            return self._parse_custom_questions(response, profile_analysis)
+        except Exception as e:
+            raise AgentError(f"Custom question generation failed: {e}")
+
+    async def _agenerate_custom_questions(self, profile_analysis: ProfileAnalysis) -> List[InterviewQuestion]:
+        """Async variant of _generate_custom_questions"""
         
-        Format each question as:
-        Question: [question text]
-        Type: [technical/behavioral/situational]
-        Difficulty: [easy/medium/hard]
-        """
+        messages = build_custom_questions_messages(profile_analysis)
 
         try:
-            response = self.llm.invoke(prompt)
+            response = await self._ainvoke_llm(messages)
             return self._parse_custom_questions(response, profile_analysis)
         except Exception as e:
             raise AgentError(f"Custom question generation failed: {e}")
 
     def _parse_custom_questions(self, response: str, profile_analysis: ProfileAnalysis) -> List[InterviewQuestion]:
         """Parse generated questions into structured format"""
-        questions = []
-        question_blocks = re.split(r"\n\s*Question:", response)
-
-        for block in question_blocks[1:]:
-            try:
-                lines = block.strip().split("\n")
-                if lines:
-                    question_text = lines[0].strip()
-                    
-                    type_match = re.search(r"Type:\s*(.+)", block, re.IGNORECASE)
-                    difficulty_match = re.search(r"Difficulty:\s*(.+)", block, re.IGNORECASE)
-
-                    questions.append({
-                        "question": question_text,
-                        "type": type_match.group(1).strip().lower() if type_match else "general",
-                        "difficulty": difficulty_match.group(1).strip().lower() if difficulty_match else "medium",
-                        "category": "custom",
-                        "domain": profile_analysis.get("domain", "General"),
-                    })
-            except Exception as e:
-                print(f"Error parsing question block: {e}")
-                continue
+        with span("parse.questions", chars=len(response)):
+            return list(self._iter_custom_questions([response], profile_analysis))
 
-        return questions
+    def _iter_custom_questions(self, chunks: Iterable[str], profile_analysis: ProfileAnalysis) -> Iterator[InterviewQuestion]:
+        """Incrementally parse streamed text, yielding each Question block once it is complete
+
+        A block is complete when the next "Question:" header arrives or the stream ends.
+        """
+        buffer = "\n"
+        for chunk in chunks:
+            buffer += chunk
+            blocks = QUESTION_HEADER.split(buffer)
+            if len(blocks) > 2:
+                for block in blocks[1:-1]:
+                    question = self._parse_question_block(block, profile_analysis)
+                    if question:
+                        yield question
+                buffer = "\nQuestion:" + blocks[-1]
+
+        for block in QUESTION_HEADER.split(buffer)[1:]:
+            question = self._parse_question_block(block, profile_analysis)
+            if question:
+                yield question
+
+    def _parse_question_block(self, block: str, profile_analysis: ProfileAnalysis) -> Optional[InterviewQuestion]:
+        """Parse a single Question block into structured format"""
+        try:
+            lines = block.strip().split("\n")
+            if lines:
+                question_text = lines[0].strip()
+                
+                type_match = re.search(r"Type:\s*(.+)", block, re.IGNORECASE)
+                difficulty_match = re.search(r"Difficulty:\s*(.+)", block, re.IGNORECASE)
+
+                return {
+                    "question": question_text,
+                    "type": type_match.group(1).strip().lower() if type_match else "general",
+                    "difficulty": difficulty_match.group(1).strip().lower() if difficulty_match else "medium",
+                    "category": "custom",
+                    "domain": profile_analysis.get("domain", "General"),
+                }
+        except Exception as e:
+            print(f"Error parsing question block: {e}")
+        return None
 
     def _prioritize_questions(self, questions: List[InterviewQuestion], profile_analysis: ProfileAnalysis) -> List[InterviewQuestion]:
-        """Sort questions by relevance to candidate profile"""
-        
-        def relevance_score(question):
-            score = 0
-            
-            # Prioritize questions matching candidate's domain
-            if question.get("domain") == profile_analysis.get("domain"):
-                score += 3
-
-            # Prioritize appropriate difficulty
-            exp_level = profile_analysis.get("experience_level", "Mid").lower()
-            q_difficulty = question.get("difficulty", "medium").lower()
-
-            if exp_level == "junior" and q_difficulty in ["easy", "medium"]:
-                score += 2
-            elif exp_level == "senior" and q_difficulty in ["medium", "hard"]:
-                score += 2
-            elif exp_level == "mid":
-                score += 1
-
-            # Prioritize custom questions
-            if question.get("category") == "custom":
-                score += 1
-
-            return score
-
-        return sorted(questions, key=relevance_score, reverse=True)
\ No newline at end of file
+        """Sort questions by relevance to candidate profile
+
+        Matching domain scores 3, a difficulty suited to the experience level up
+        to 2 and a custom question 1; equal scores keep their order.
+        """
+        if not questions:
+            return []
+        order = priority_order(QuestionFeatures.from_questions(questions), profile_analysis)
+        return [questions[i] for i in order]
\ No newline at end of file
@@ -0,0 +1,128 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from core.exceptions import TTSError
+
+# Layer III bitrates in kbps by header index, for MPEG-1 and for MPEG-2/2.5
+_MP3_BITRATES = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_BITRATES[0] = _MP3_BITRATES[2]
+
+def estimate_mp3_seconds(audio_bytes: bytes, default_kbps: int = 128) -> float:
+    """Estimate a constant-bitrate MP3 clip's duration from its first frame header"""
+    offset = 0
+    if audio_bytes[:3] == b"ID3" and len(audio_bytes) >= 10:
+        # Skip an ID3v2 tag; its size is four 7-bit bytes
+        offset = 10 + sum((audio_bytes[6 + i] & 0x7F) << (7 * (3 - i)) for i in range(4))
+    kbps = default_kbps
+    for index in range(offset, min(len(audio_bytes) - 2, offset + 4096)):
+        if audio_bytes[index] == 0xFF and audio_bytes[index + 1] & 0xE0 == 0xE0:
+            version, layer = (audio_bytes[index + 1] >> 3) & 3, (audio_bytes[index + 1] >> 1) & 3
+            bitrate_index = audio_bytes[index + 2] >> 4
+            if layer == 1 and version in _MP3_BITRATES and 0 < bitrate_index < 15:
+                kbps = _MP3_BITRATES[version][bitrate_index]
+                break
+    return max(len(audio_bytes) - offset, 0) * 8 / (kbps * 1000)
+
+class AudioSink(ABC):
+    """Destination for synthesized speech"""
+    
+    def begin_utterance(self):
+        """Called before the clips of one reply start arriving"""
+        pass
+    
+    def end_utterance(self):
+        """Called once every clip of a reply has been delivered"""
+        pass
+    
+    @abstractmethod
+    def play(self, audio_bytes: bytes):
+        """Deliver one synthesized clip; must not block on playback"""
+        pass
+
+class BrowserAudioSink(AudioSink):
+    """Queue each reply's clips for the browser as soon as they are synthesized
+
+    The player drains the queue in order, so a streamed reply starts playing with
+    its first sentence while later ones are still being generated.
+    """
+    
+    def __init__(self):
+        self.utterance_id = 0
+        self._clips: List[bytes] = []
+        self._open_utterances = 0
+        self._lock = threading.Lock()
+    
+    def snapshot(self) -> Tuple[int, List[bytes], bool]:
+        """The current utterance's id, its clips so far, and whether it has ended"""
+        with self._lock:
+            return self.utterance_id, list(self._clips), self._open_utterances == 0
+    
+    def begin_utterance(self):
+        with self._lock:
+            if self._open_utterances == 0:
+                # A new reply replaces the previous one's queue
+                self.utterance_id += 1
+                self._clips = []
+            self._open_utterances += 1
+    
+    def end_utterance(self):
+        with self._lock:
+            self._open_utterances = max(self._open_utterances - 1, 0)
+    
+    def play(self, audio_bytes: bytes):
+        with self._lock:
+            self._clips.append(audio_bytes)
+
+class NullAudioSink(AudioSink):
+    """Discard audio, e.g. for headless runs"""
+    
+    def play(self, audio_bytes: bytes):
+        pass
+
+class FileAudioSink(AudioSink):
+    """Write each clip to a numbered file, e.g. for tests"""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.paths: List[str] = []
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+    
+    def play(self, audio_bytes: bytes):
+        with self._lock:
+            path = os.path.join(self.directory, f"clip_{len(self.paths) + 1:04d}.mp3")
+            self.paths.append(path)
+        with open(path, "wb") as f:
+            f.write(audio_bytes)
+
+class LocalSpeakerSink(AudioSink):
+    """Play on the server's own speakers; only sensible for single-user local runs"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+    
+    def play(self, audio_bytes: bytes):
+        from elevenlabs import play
+        
+        # Clips arrive from worker threads; keep them from overlapping
+        with self._lock:
+            try:
+                play(audio_bytes)
+            except Exception as e:
+                raise TTSError(f"Audio playback error: {e}")
+
+def create_audio_sink(kind: str, directory: str = "") -> AudioSink:
+    """Create an audio sink by name: browser, null, file or local"""
+    if kind == "browser":
+        return BrowserAudioSink()
+    if kind == "null":
+        return NullAudioSink()
+    if kind == "file":
+        return FileAudioSink(directory)
+    if kind == "local":
+        return LocalSpeakerSink()
+    raise TTSError(f"Unknown audio sink: {kind}")
@@ -0,0 +1,163 @@
+import io
+import wave
+from dataclasses import dataclass
+from typing import List, Optional
+import numpy as np
+from config.audio_config import AudioConfig
+from core.exceptions import AudioError
+
+@dataclass
+class PreprocessReport:
+    """Size and duration of a recording before and after preprocessing"""
+    original_bytes: int
+    processed_bytes: int
+    original_ms: int
+    processed_ms: int
+    
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.processed_bytes
+    
+    @property
+    def savings_ratio(self) -> float:
+        return self.saved_bytes / self.original_bytes if self.original_bytes else 0.0
+    
+    def summary(self) -> str:
+        return (
+            f"Uploaded {self.processed_bytes / 1024:.0f} KB instead of {self.original_bytes / 1024:.0f} KB "
+            f"({self.savings_ratio:.0%} saved, {(self.original_ms - self.processed_ms) / 1000:.1f}s of silence trimmed)"
+        )
+
+class AudioPreprocessor:
+    """Trim silence, downmix to mono and resample recordings before STT upload"""
+    
+    def __init__(self, config: Optional[AudioConfig] = None):
+        self.config = config or AudioConfig()
+    
+    def prepare(self, segment) -> np.ndarray:
+        """Get mono, resampled and trimmed float samples at STT_SAMPLE_RATE"""
+        rate = self.config.STT_SAMPLE_RATE
+        samples = self.resample(self.to_mono(segment), segment.frame_rate, rate)
+        return self.trim_silence(samples, rate)
+    
+    def build_report(self, segment, samples: np.ndarray, wav_bytes: bytes) -> PreprocessReport:
+        """Compare the original recording with its prepared encoding"""
+        return PreprocessReport(
+            original_bytes=len(segment.raw_data) + 44,  # raw PCM plus the WAV header
+            processed_bytes=len(wav_bytes),
+            original_ms=len(segment),
+            processed_ms=int(len(samples) * 1000 / self.config.STT_SAMPLE_RATE),
+        )
+    
+    @staticmethod
+    def to_mono(segment) -> np.ndarray:
+        """Decode raw PCM into float32 samples in [-1, 1], averaging the channels"""
+        width = segment.sample_width
+        raw = np.frombuffer(segment.raw_data, dtype=np.uint8)
+        if width == 3:
+            # 24-bit PCM has no numpy dtype; shift each sample into the top of an int32
+            padded = np.zeros((len(raw) // 3, 4), dtype=np.uint8)
+            padded[:, 1:] = raw[:len(padded) * 3].reshape(-1, 3)
+            raw, width = padded.reshape(-1), 4
+        dtype = {1: np.int8, 2: np.int16, 4: np.int32}.get(width)
+        if dtype is None:
+            raise AudioError(f"Unsupported sample width: {segment.sample_width} bytes")
+        samples = raw.view(np.dtype(dtype).newbyteorder("<")).astype(np.float32)
+        samples /= float(np.iinfo(dtype).max)
+        if segment.channels > 1:
+            samples = samples.reshape(-1, segment.channels).mean(axis=1)
+        return samples
+    
+    @staticmethod
+    def resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+        """Resample with a windowed-sinc low-pass before decimation to avoid aliasing"""
+        if source_rate == target_rate or len(samples) == 0:
+            return samples
+        
+        if target_rate < source_rate:
+            cutoff = 0.5 * target_rate / source_rate
+            taps = np.arange(-32, 33)
+            kernel = 2 * cutoff * np.sinc(2 * cutoff * taps) * np.hamming(len(taps))
+            kernel /= kernel.sum()
+            samples = np.convolve(samples, kernel.astype(np.float32), mode="same")
+        
+        duration = len(samples) / source_rate
+        target_times = np.arange(int(duration * target_rate)) / target_rate
+        source_times = np.arange(len(samples)) / source_rate
+        return np.interp(target_times, source_times, samples).astype(np.float32)
+    
+    def frame_levels_db(self, samples: np.ndarray, rate: int) -> np.ndarray:
+        """RMS level of each analysis frame in dBFS"""
+        frame_length = max(int(rate * self.config.STT_VAD_FRAME_MS / 1000), 1)
+        frame_count = len(samples) // frame_length
+        if frame_count == 0:
+            return np.zeros(0, dtype=np.float32)
+        frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+        rms = np.sqrt(np.mean(frames ** 2, axis=1))
+        return 20 * np.log10(rms + 1e-10)
+    
+    def voiced_frames(self, levels_db: np.ndarray) -> np.ndarray:
+        """Mark frames loud enough to be speech, relative to the recording's peak"""
+        if len(levels_db) == 0:
+            return np.zeros(0, dtype=bool)
+        threshold = max(
+            levels_db.max() - self.config.STT_VAD_DYNAMIC_RANGE_DB,
+            self.config.STT_VAD_FLOOR_DBFS,
+        )
+        return levels_db > threshold
+    
+    def trim_silence(self, samples: np.ndarray, rate: int) -> np.ndarray:
+        """Cut leading and trailing silence, keeping a little padding around speech"""
+        voiced = np.flatnonzero(self.voiced_frames(self.frame_levels_db(samples, rate)))
+        if len(voiced) == 0:
+            return samples[:0]
+        
+        frame_length = max(int(rate * self.config.STT_VAD_FRAME_MS / 1000), 1)
+        padding = int(rate * self.config.STT_VAD_PADDING_MS / 1000)
+        start = max(voiced[0] * frame_length - padding, 0)
+        end = min((voiced[-1] + 1) * frame_length + padding, len(samples))
+        return samples[start:end]
+    
+    def split_on_silence(self, samples: np.ndarray, rate: int) -> List[np.ndarray]:
+        """Split long audio at pauses into segments of at least STT_SEGMENT_MIN_MS
+
+        Cuts fall in the middle of silent runs, so no word is split across segments.
+        """
+        frame_length = max(int(rate * self.config.STT_VAD_FRAME_MS / 1000), 1)
+        voiced = self.voiced_frames(self.frame_levels_db(samples, rate))
+        frame_count = len(voiced)
+        min_frames = self.config.STT_SEGMENT_MIN_MS // self.config.STT_VAD_FRAME_MS
+        min_silence_frames = max(self.config.STT_SEGMENT_MIN_SILENCE_MS // self.config.STT_VAD_FRAME_MS, 1)
+        
+        # Locate runs of silent frames long enough to be a pause
+        silent = np.concatenate(([0], (~voiced).astype(np.int8), [0]))
+        edges = np.flatnonzero(np.diff(silent))
+        run_starts, run_ends = edges[0::2], edges[1::2]
+        pauses = (run_ends - run_starts) >= min_silence_frames
+        midpoints = (run_starts[pauses] + run_ends[pauses]) // 2
+        
+        cuts = []
+        last_cut = 0
+        for midpoint in midpoints:
+            if midpoint - last_cut >= min_frames:
+                cuts.append(int(midpoint))
+                last_cut = midpoint
+        
+        # Fold a short tail into the previous segment
+        if cuts and frame_count - cuts[-1] < min_frames:
+            cuts.pop()
+        
+        bounds = [0] + [cut * frame_length for cut in cuts] + [len(samples)]
+        return [samples[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    
+    @staticmethod
+    def encode_wav(samples: np.ndarray, rate: int) -> bytes:
+        """Encode float samples as mono 16-bit PCM WAV"""
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+        wav_buffer = io.BytesIO()
+        with wave.open(wav_buffer, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(rate)
+            wav_file.writeframes(pcm.tobytes())
+        return wav_buffer.getvalue()
@@ -0,0 +1,39 @@
+import hashlib
+import io
+from typing import BinaryIO
+
+class RecordingBuffer:
+    """A recording encoded to WAV once, in memory, and shared by playback and STT"""
+    
+    def __init__(self, wav_bytes: bytes, fingerprint: str, duration_ms: int, report=None, segments=None):
+        self.wav_bytes = wav_bytes
+        self.fingerprint = fingerprint
+        self.duration_ms = duration_ms
+        # PreprocessReport when the audio was trimmed and resampled before encoding
+        self.report = report
+        # Silence-bounded sub-recordings of a long answer, transcribed in parallel
+        self.segments = segments or []
+    
+    def __len__(self) -> int:
+        return self.duration_ms
+    
+    @classmethod
+    def from_segment(cls, segment) -> "RecordingBuffer":
+        """Encode a pydub AudioSegment to WAV exactly once"""
+        wav_buffer = io.BytesIO()
+        segment.export(wav_buffer, format="wav")
+        return cls(wav_buffer.getvalue(), cls.fingerprint_segment(segment), len(segment))
+    
+    @staticmethod
+    def fingerprint_segment(segment) -> str:
+        """Identify a recording from its raw samples, without re-encoding it"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{segment.frame_rate}:{segment.channels}:{segment.sample_width}:".encode())
+        digest.update(segment.raw_data)
+        return digest.hexdigest()
+    
+    def as_file(self, name: str = "recording.wav") -> BinaryIO:
+        """Get a fresh file-like view for upload clients that read and close it"""
+        audio_file = io.BytesIO(self.wav_bytes)
+        audio_file.name = name
+        return audio_file
@@ -1,13 +1,21 @@
 import os
-import tempfile
-import io
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from elevenlabs.client import ElevenLabs
+from audio.preprocessing import AudioPreprocessor
+from audio.recording import RecordingBuffer
+from audio.stt_providers import ElevenLabsSTTProvider, FailoverSTTChain, create_whisper_provider
+from config.audio_config import AudioConfig
 from core.exceptions import STTError
+from utils.tracing import span
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Bounded pool for transcribing the segments of long answers concurrently
+_segment_executor = ThreadPoolExecutor(max_workers=AudioConfig().STT_SEGMENT_WORKERS, thread_name_prefix="stt-segment")
+
 class STTManager:
     """Speech-to-Text management with ElevenLabs API"""
     
@@ -18,80 +26,89 @@ class STTManager:
             if not api_key:
                 raise STTError("ElevenLabs API key not found. Please set ELEVENLABS_API_KEY environment variable.")
             
-            self.client = ElevenLabs(api_key=api_key)
+            self.audio_config = AudioConfig()
+            self.client = ElevenLabs(api_key=api_key, base_url=self.audio_config.ELEVENLABS_BASE_URL)
+            self.preprocessor = AudioPreprocessor(self.audio_config)
+            
+            # ElevenLabs first, Whisper as backup when an OpenAI key is configured
+            providers = [ElevenLabsSTTProvider(self.client)]
+            whisper = create_whisper_provider()
+            if whisper:
+                providers.append(whisper)
+            self.stt_chain = FailoverSTTChain(providers, self.audio_config)
             
         except Exception as e:
             raise STTError(f"Failed to initialize STT: {e}")
     
+    def prepare_recording(self, segment) -> RecordingBuffer:
+        """Encode a recording once for upload, trimming silence and resampling it first if enabled"""
+        if not self.audio_config.STT_PREPROCESS:
+            return RecordingBuffer.from_segment(segment)
+        
+        rate = self.audio_config.STT_SAMPLE_RATE
+        with span("stt.preprocess") as attributes:
+            samples = self.preprocessor.prepare(segment)
+            wav_bytes = self.preprocessor.encode_wav(samples, rate)
+            report = self.preprocessor.build_report(segment, samples, wav_bytes)
+            attributes["bytes"] = len(wav_bytes)
+            attributes["saved_bytes"] = report.saved_bytes
+        print(f"🎤 STT preprocessing: {report.summary()}")
+        
+        segments = []
+        if self.audio_config.STT_SEGMENTED and report.processed_ms > self.audio_config.STT_SEGMENT_THRESHOLD_MS:
+            for part in self.preprocessor.split_on_silence(samples, rate):
+                part_bytes = self.preprocessor.encode_wav(part, rate)
+                segments.append(RecordingBuffer(part_bytes, "", int(len(part) * 1000 / rate)))
+        
+        return RecordingBuffer(
+            wav_bytes, RecordingBuffer.fingerprint_segment(segment), report.processed_ms, report, segments
+        )
+    
     def record_audio_streamlit(self, audio_data) -> Optional[str]:
-        """Process audio from Streamlit audiorecorder using ElevenLabs STT"""
+        """Process audio from Streamlit audiorecorder using ElevenLabs STT
+
+        Accepts a RecordingBuffer, or a pydub AudioSegment which is prepared once in memory.
+        """
         try:
             if audio_data is None or len(audio_data) == 0:
                 return None
 
-            # Save audio to temporary file for ElevenLabs STT
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-                tmp_path = tmp_file.name
-            
-            audio_data.export(tmp_path, format="wav")
+            recording = audio_data if isinstance(audio_data, RecordingBuffer) else self.prepare_recording(audio_data)
+            if len(recording) == 0:
+                # Nothing but silence; skip the upload entirely
+                return None
 
-            try:
-                # Use ElevenLabs speech-to-text
-                with open(tmp_path, "rb") as audio_file:
-                    transcript = self.client.speech_to_text.convert_as_stream(
-                        audio_file,
-                        model_id="eleven_multilingual_v2"
-                    )
-                
-                # Collect all chunks from the stream
-                transcript_text = ""
-                for chunk in transcript:
-                    if hasattr(chunk, 'text'):
-                        transcript_text += chunk.text
-                
-                os.unlink(tmp_path)
-                return transcript_text.strip() if transcript_text else None
-                
-            except Exception as e:
-                os.unlink(tmp_path)
-                # Fallback to OpenAI Whisper if ElevenLabs STT fails
-                return self._fallback_whisper_stt(audio_data)
+            started = time.perf_counter()
+            with span("stt.transcribe", bytes=len(recording.wav_bytes), audio_ms=recording.duration_ms,
+                      segments=max(len(recording.segments), 1)) as attributes:
+                if len(recording.segments) > 1:
+                    transcript_text = self._transcribe_segments(recording)
+                else:
+                    transcript_text = self.stt_chain.transcribe(recording)
+                attributes["chars"] = len(transcript_text or "")
+            print(
+                f"🎤 STT: {recording.duration_ms / 1000:.1f}s of audio in "
+                f"{max(len(recording.segments), 1)} segment(s) took {time.perf_counter() - started:.2f}s"
+            )
+            return transcript_text
 
         except Exception as e:
             raise STTError(f"Audio processing error: {e}")
     
-    def _fallback_whisper_stt(self, audio_data) -> Optional[str]:
-        """Fallback to OpenAI Whisper API for STT"""
-        try:
-            import openai
-            
-            # Check for OpenAI API key
-            openai_key = os.getenv("OPENAI_API_KEY")
-            if not openai_key:
-                raise STTError("No fallback STT available. Please set OPENAI_API_KEY for Whisper fallback.")
-            
-            client = openai.OpenAI(api_key=openai_key)
-            
-            # Save audio to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-                tmp_path = tmp_file.name
-            
-            audio_data.export(tmp_path, format="wav")
-            
-            try:
-                with open(tmp_path, "rb") as audio_file:
-                    transcript = client.audio.transcriptions.create(
-                        model="whisper-1",
-                        file=audio_file,
-                        language="en"
-                    )
-                return transcript.text.strip() if transcript.text else None
-                
-            finally:
-                os.unlink(tmp_path)
-                
-        except Exception as e:
-            raise STTError(f"Fallback Whisper STT error: {e}")
+    def _transcribe_segments(self, recording: RecordingBuffer) -> Optional[str]:
+        """Transcribe segments concurrently and stitch the text back in order
+
+        Each segment goes through the failover chain on its own, so a segment the
+        primary provider fails on falls back to Whisper without re-sending the others.
+        A segment that every provider fails on fails the whole transcription.
+        """
+        texts = list(_segment_executor.map(self.stt_chain.transcribe, recording.segments))
+        transcript_text = " ".join(text for text in texts if text)
+        return transcript_text or None
+    
+    def provider_health(self):
+        """Health snapshots of the STT providers"""
+        return self.stt_chain.health()
     
     def transcribe_file(self, file_path: str) -> Optional[str]:
         """Transcribe audio file using ElevenLabs STT"""
@@ -111,4 +128,4 @@ class STTManager:
             return transcript_text.strip() if transcript_text else None
             
         except Exception as e:
-            raise STTError(f"File transcription error: {e}")
\ No newline at end of file
+            raise STTError(f"File transcription error: {e}")
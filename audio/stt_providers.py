@@ -0,0 +1,235 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+from audio.recording import RecordingBuffer
+from config.audio_config import AudioConfig
+from core.exceptions import STTError
+
+class ProviderHealth:
+    """Latency samples and a circuit breaker for one STT provider"""
+    
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown_seconds: float = 30.0, window: int = 50):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._latencies = deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def is_available(self) -> bool:
+        """Closed circuits are available; open ones again once the cooldown has passed"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            return time.monotonic() - self._opened_at >= self.cooldown_seconds
+    
+    def record_success(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+            self._consecutive_failures = 0
+            self._opened_at = None
+    
+    def record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self.failure_threshold:
+                # Opening (or re-opening after a failed trial call) restarts the cooldown
+                self._opened_at = time.monotonic()
+    
+    def p95_latency(self) -> Optional[float]:
+        """95th percentile of recent successful call latencies"""
+        with self._lock:
+            if not self._latencies:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+    
+    def snapshot(self) -> Dict[str, Any]:
+        p95 = self.p95_latency()
+        with self._lock:
+            return {
+                "name": self.name,
+                "circuit_open": self._opened_at is not None,
+                "consecutive_failures": self._consecutive_failures,
+                "samples": len(self._latencies),
+                "p95_latency": p95,
+            }
+
+_health = {}
+_health_lock = threading.Lock()
+
+def get_provider_health(name: str) -> ProviderHealth:
+    """Get the process-wide health record for a provider"""
+    with _health_lock:
+        if name not in _health:
+            config = AudioConfig()
+            _health[name] = ProviderHealth(name, config.STT_BREAKER_FAILURES, config.STT_BREAKER_COOLDOWN_S)
+        return _health[name]
+
+class STTProvider(ABC):
+    """A speech-to-text backend"""
+    
+    name = "provider"
+    
+    @abstractmethod
+    def transcribe(self, recording: RecordingBuffer) -> Optional[str]:
+        """Transcribe an in-memory recording; None means no speech was recognized"""
+        pass
+
+class ElevenLabsSTTProvider(STTProvider):
+    """ElevenLabs speech-to-text"""
+    
+    name = "elevenlabs"
+    
+    def __init__(self, client, model_id: str = "eleven_multilingual_v2"):
+        self.client = client
+        self.model_id = model_id
+    
+    def transcribe(self, recording: RecordingBuffer) -> Optional[str]:
+        transcript = self.client.speech_to_text.convert_as_stream(
+            recording.as_file(),
+            model_id=self.model_id
+        )
+        
+        # Collect all chunks from the stream
+        transcript_text = ""
+        for chunk in transcript:
+            if hasattr(chunk, 'text'):
+                transcript_text += chunk.text
+        
+        return transcript_text.strip() if transcript_text else None
+
+class WhisperSTTProvider(STTProvider):
+    """OpenAI Whisper speech-to-text, with one client reused for every call"""
+    
+    name = "whisper"
+    
+    def __init__(self, api_key: str, language: str = "en"):
+        import openai
+        
+        self.client = openai.OpenAI(api_key=api_key)
+        self.language = language
+    
+    def transcribe(self, recording: RecordingBuffer) -> Optional[str]:
+        transcript = self.client.audio.transcriptions.create(
+            model="whisper-1",
+            file=recording.as_file(),
+            language=self.language
+        )
+        return transcript.text.strip() if transcript.text else None
+
+def create_whisper_provider() -> Optional[WhisperSTTProvider]:
+    """Create the Whisper provider if an OpenAI key is configured"""
+    openai_key = os.getenv("OPENAI_API_KEY")
+    if not openai_key:
+        return None
+    try:
+        return WhisperSTTProvider(openai_key)
+    except Exception as e:
+        print(f"Whisper STT unavailable: {e}")
+        return None
+
+# Provider calls run here so a hung primary can be raced by a hedged secondary
+_provider_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="stt-provider")
+
+# How often to check whether a queued provider call has started running
+HEDGE_START_POLL_S = 0.05
+
+class _ProviderCall:
+    """When a submitted provider call actually started running on the executor"""
+    
+    def __init__(self):
+        self.started_at: Optional[float] = None
+    
+    def mark_started(self):
+        self.started_at = time.perf_counter()
+
+class FailoverSTTChain:
+    """Try STT providers in order, skipping open circuits and optionally hedging slow calls"""
+    
+    def __init__(self, providers: List[STTProvider], config: Optional[AudioConfig] = None):
+        self.providers = providers
+        self.config = config or AudioConfig()
+    
+    def transcribe(self, recording: RecordingBuffer) -> Optional[str]:
+        """Return the first successful transcript from the chain"""
+        candidates = [p for p in self.providers if get_provider_health(p.name).is_available()]
+        if not candidates:
+            # Every circuit is open; trying anyway beats failing the turn outright
+            candidates = list(self.providers)
+        if not candidates:
+            raise STTError("No STT provider configured")
+        
+        running = {}
+        errors = []
+        next_index = 0
+        last_call = None
+        
+        def launch():
+            nonlocal next_index, last_call
+            provider = candidates[next_index]
+            next_index += 1
+            last_call = _ProviderCall()
+            running[_provider_executor.submit(self._call, provider, recording, last_call)] = provider
+        
+        launch()
+        while running:
+            # While a backup remains, only wait as long as the hedge deadline allows. The
+            # deadline runs from when the call started, so time queued behind other
+            # sessions' calls on the shared executor is not mistaken for a slow provider
+            timeout = None
+            hedge_due = False
+            if self.config.STT_HEDGE and next_index < len(candidates):
+                if last_call.started_at is None:
+                    timeout = HEDGE_START_POLL_S
+                else:
+                    deadline = last_call.started_at + self._hedge_delay(candidates[next_index - 1])
+                    timeout = max(deadline - time.perf_counter(), 0)
+                    hedge_due = True
+            
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                if hedge_due:
+                    launch()
+                continue
+            
+            for future in done:
+                provider = running.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    errors.append(f"{provider.name}: {e}")
+            
+            if not running and next_index < len(candidates):
+                launch()
+        
+        raise STTError(f"All STT providers failed ({'; '.join(errors)})")
+    
+    def health(self) -> List[Dict[str, Any]]:
+        """Health snapshots for every provider in the chain"""
+        return [get_provider_health(p.name).snapshot() for p in self.providers]
+    
+    def _call(self, provider: STTProvider, recording: RecordingBuffer, call: _ProviderCall) -> Optional[str]:
+        """Call one provider, recording its latency or failure"""
+        health = get_provider_health(provider.name)
+        call.mark_started()
+        started = time.perf_counter()
+        try:
+            text = provider.transcribe(recording)
+        except Exception:
+            health.record_failure()
+            raise
+        health.record_success(time.perf_counter() - started)
+        return text
+    
+    def _hedge_delay(self, provider: STTProvider) -> float:
+        """How long to give a provider before firing the next one, based on its p95"""
+        p95 = get_provider_health(provider.name).p95_latency()
+        if p95 is None:
+            return self.config.STT_HEDGE_DEFAULT_DELAY_S
+        return min(max(p95, self.config.STT_HEDGE_MIN_DELAY_S), self.config.STT_HEDGE_MAX_DELAY_S)
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from config.audio_config import AudioConfig
+
+class TTSCache:
+    """Two-tier cache of synthesized audio: an in-memory LRU over a size-bounded disk store"""
+    
+    def __init__(self, cache_dir: str, memory_entries: int = 128, disk_max_bytes: int = 200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        self._disk_bytes = sum(os.path.getsize(path) for path in self._disk_entries())
+    
+    @staticmethod
+    def make_key(text: str, voice_id: str, voice_settings: Dict[str, float], model_id: str = "") -> str:
+        """Content address for an utterance: cleaned text plus everything that shapes the audio"""
+        payload = json.dumps(
+            {"text": text, "voice_id": voice_id, "settings": voice_settings, "model_id": model_id},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Look up audio in memory, then on disk"""
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return audio
+        
+        path = self._path_for(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)  # Keep recently used files away from eviction
+        except OSError:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        
+        with self._lock:
+            self._stats["disk_hits"] += 1
+            self._remember(key, audio)
+        return audio
+    
+    def put(self, key: str, audio: bytes):
+        """Store audio in both tiers"""
+        if not audio:
+            return
+        
+        with self._lock:
+            self._remember(key, audio)
+        
+        path = self._path_for(key)
+        if os.path.exists(path):
+            return
+        
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            # Only one concurrent writer of a key moves its file in and counts its size
+            with self._lock:
+                if os.path.exists(path):
+                    os.remove(tmp_path)
+                    return
+                os.replace(tmp_path, path)
+                self._disk_bytes += len(audio)
+                if self._disk_bytes > self.disk_max_bytes:
+                    self._evict_disk()
+        except OSError as e:
+            print(f"TTS cache write failed: {e}")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_bytes"] = self._disk_bytes
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+    
+    def _remember(self, key: str, audio: bytes):
+        """Insert into the memory LRU; caller holds the lock"""
+        self._memory[key] = audio
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+    
+    def _evict_disk(self):
+        """Delete least recently used files until under the size limit; caller holds the lock"""
+        entries = sorted(self._disk_entries(), key=lambda path: os.path.getmtime(path))
+        # Evict down to 90% so we don't rescan the directory on every write
+        target = self.disk_max_bytes * 0.9
+        for path in entries:
+            if self._disk_bytes <= target:
+                break
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                continue
+            self._disk_bytes -= size
+            self._stats["evictions"] += 1
+    
+    def _disk_entries(self):
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name.endswith(".mp3")
+        ]
+    
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_shared_tts_cache() -> TTSCache:
+    """Get the process-wide TTS cache, creating it on first use"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            config = AudioConfig()
+            _shared_cache = TTSCache(
+                config.TTS_CACHE_DIR,
+                memory_entries=config.TTS_CACHE_MEMORY_ENTRIES,
+                disk_max_bytes=config.TTS_CACHE_DISK_MAX_MB * 1024 * 1024,
+            )
+        return _shared_cache
@@ -1,39 +1,46 @@
 import os
-import tempfile
-import asyncio
-import pygame
 import streamlit as st
-from elevenlabs import stream
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from elevenlabs import VoiceSettings
 from elevenlabs.client import ElevenLabs
 from config.audio_config import AudioConfig
+from audio.audio_sinks import AudioSink, create_audio_sink
+from audio.tts_pipeline import SentenceTTSPipeline
+from audio.tts_cache import get_shared_tts_cache
 from utils.text_processing import TextProcessor
 from core.exceptions import TTSError
+from utils.tracing import span
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Whole-utterance synthesis jobs run here so the Streamlit script thread never waits on them
+_tts_worker = ThreadPoolExecutor(max_workers=AudioConfig().TTS_SYNTHESIS_WORKERS, thread_name_prefix="tts-worker")
+
 class TTSManager:
     """Text-to-Speech management with ElevenLabs API"""
     
-    def __init__(self):
+    def __init__(self, sink: Optional[AudioSink] = None):
         try:
-            pygame.mixer.init()
             self.audio_config = AudioConfig()
             self.text_processor = TextProcessor()
+            self.sink = sink or create_audio_sink(self.audio_config.AUDIO_SINK, self.audio_config.AUDIO_SINK_DIR)
             
             # Initialize ElevenLabs client
             api_key = "ELEVENLABS_API_KEY"
             if not api_key:
                 raise TTSError("ElevenLabs API key not found. Please set ELEVENLABS_API_KEY environment variable.")
             
-            self.client = ElevenLabs(api_key=api_key)
+            self.client = ElevenLabs(api_key=api_key, base_url=self.audio_config.ELEVENLABS_BASE_URL)
+            self.cache = get_shared_tts_cache()
             self._available_voices = None
             
         except Exception as e:
             raise TTSError(f"Failed to initialize TTS: {e}")
     
     def speak_text_sync(self, text: str, voice: str = "rachel", speed: float = 1.0) -> bool:
-        """Convert text to speech synchronously"""
+        """Convert text to speech synchronously and hand the audio to the sink"""
         try:
             clean_text = self.text_processor.clean_text_for_speech(text)
             return self._elevenlabs_tts(clean_text, voice, speed)
@@ -41,56 +48,90 @@ class TTSManager:
             st.error(f"TTS Error: {e}")
             return False
     
-    def _elevenlabs_tts(self, text: str, voice: str, speed: float) -> bool:
-        """ElevenLabs TTS implementation"""
+    def speak_async(self, text: str, voice: str = "rachel", speed: float = 1.0) -> Future:
+        """Queue text for synthesis on the worker pool and return immediately"""
+        clean_text = self.text_processor.clean_text_for_speech(text)
+        voice_id, voice_settings = self._resolve_voice(voice)
+        self.sink.begin_utterance()
+        return _tts_worker.submit(self._speak_job, clean_text, voice_id, voice_settings)
+    
+    def _speak_job(self, text: str, voice_id: str, voice_settings: Dict[str, float]) -> bool:
+        """Synthesize one utterance and deliver it to the sink"""
         try:
-            voice_id = self.audio_config.get_elevenlabs_voice_id(voice)
-            
-            # Get voice settings from config
-            voice_settings = self.audio_config.get_voice_settings(voice)
-            
-            # Get custom settings from session state if available
-            stability = getattr(st.session_state, 'voice_stability', voice_settings['stability'])
-            similarity = getattr(st.session_state, 'voice_similarity', voice_settings['similarity_boost'])
-            style = getattr(st.session_state, 'voice_style', voice_settings['style'])
-            
-            # Generate audio using the client
-            audio_generator = self.client.text_to_speech.stream(
-                text=text,
-                voice_id=voice_id
-            )
-
-            stream(audio_generator)
-            
-            # # Convert generator to bytes
-            # audio_bytes = b"".join(audio_generator)
-            
-            # # Save to temporary file and play
-            # with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_file:
-            #     tmp_file.write(audio_bytes)
-            #     tmp_path = tmp_file.name
-            
-            # self._play_audio_file(tmp_path)
-            # os.unlink(tmp_path)
-            
+            self.sink.play(self.synthesize(text, voice_id, voice_settings))
             return True
-            
         except Exception as e:
-            raise TTSError(f"ElevenLabs TTS error: {e}")
+            print(f"TTS Error: {e}")
+            return False
+        finally:
+            self.sink.end_utterance()
     
-    def _play_audio_file(self, file_path: str):
-        """Play audio file using pygame"""
-        try:
-            pygame.mixer.music.load(file_path)
-            pygame.mixer.music.play()
-            
-            while pygame.mixer.music.get_busy():
-                pygame.time.wait(100)  # Use pygame.time.wait instead of asyncio.sleep
+    def create_sentence_pipeline(self, voice: str = "rachel", speed: float = 1.0) -> SentenceTTSPipeline:
+        """Create a pipeline that speaks a streamed reply sentence by sentence"""
+        # Session settings are resolved here, on the script thread, not in the workers
+        voice_id, voice_settings = self._resolve_voice(voice)
+        return SentenceTTSPipeline(
+            synthesize=lambda text: self.synthesize(text, voice_id, voice_settings),
+            sink=self.sink,
+            clean_text=self.text_processor.clean_text_for_speech,
+            min_chars=self.audio_config.TTS_MIN_SENTENCE_CHARS,
+        )
+    
+    def synthesize(self, text: str, voice_id: str, voice_settings: Dict[str, float]) -> bytes:
+        """Synthesize cleaned text to audio bytes without playing it"""
+        with span("tts.synthesize", chars=len(text)) as attributes:
+            cache_key = self.cache.make_key(text, voice_id, voice_settings)
+            cached_audio = self.cache.get(cache_key)
+            attributes["cache_hit"] = cached_audio is not None
+            if cached_audio is not None:
+                attributes["bytes"] = len(cached_audio)
+                return cached_audio
             
-            pygame.mixer.music.unload()
+            try:
+                audio_generator = self.client.text_to_speech.stream(
+                    text=text,
+                    voice_id=voice_id,
+                    voice_settings=VoiceSettings(**voice_settings)
+                )
+                audio_bytes = b"".join(audio_generator)
+            except Exception as e:
+                raise TTSError(f"ElevenLabs TTS error: {e}")
             
-        except Exception as e:
-            raise TTSError(f"Audio playback error: {e}")
+            attributes["bytes"] = len(audio_bytes)
+            self.cache.put(cache_key, audio_bytes)
+            return audio_bytes
+    
+    def play_audio(self, audio_bytes: bytes):
+        """Deliver already synthesized audio to the sink as one utterance"""
+        self.sink.begin_utterance()
+        try:
+            self.sink.play(audio_bytes)
+        finally:
+            self.sink.end_utterance()
+    
+    def cache_stats(self) -> Dict[str, float]:
+        """Get TTS cache hit/miss counters"""
+        return self.cache.stats()
+    
+    def _resolve_voice(self, voice: str) -> Tuple[str, Dict[str, float]]:
+        """Get the voice id and effective voice settings for a voice name"""
+        voice_id = self.audio_config.get_elevenlabs_voice_id(voice)
+        
+        # Get voice settings from config
+        voice_settings = self.audio_config.get_voice_settings(voice)
+        
+        # Get custom settings from session state if available
+        return voice_id, {
+            "stability": getattr(st.session_state, 'voice_stability', voice_settings['stability']),
+            "similarity_boost": getattr(st.session_state, 'voice_similarity', voice_settings['similarity_boost']),
+            "style": getattr(st.session_state, 'voice_style', voice_settings['style']),
+        }
+    
+    def _elevenlabs_tts(self, text: str, voice: str, speed: float) -> bool:
+        """ElevenLabs TTS implementation"""
+        voice_id, voice_settings = self._resolve_voice(voice)
+        self.play_audio(self.synthesize(text, voice_id, voice_settings))
+        return True
     
     def get_available_voices(self):
         """Get available ElevenLabs voices"""
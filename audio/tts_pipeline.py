@@ -0,0 +1,108 @@
+import contextvars
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+from config.audio_config import AudioConfig
+from audio.audio_sinks import AudioSink
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+
+_audio_config = AudioConfig()
+_synthesis_executor = ThreadPoolExecutor(
+    max_workers=_audio_config.TTS_SYNTHESIS_WORKERS, thread_name_prefix="tts-synth"
+)
+
+class SentenceSplitter:
+    """Split streamed LLM tokens into sentences as soon as each one is complete"""
+
+    def __init__(self, min_chars: int = 20):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, token: str) -> List[str]:
+        """Add a token and return any sentences it completed"""
+        self._buffer += token
+        sentences = []
+        start = 0
+        for match in SENTENCE_END.finditer(self._buffer):
+            sentence = self._buffer[start:match.start()].strip()
+            # Very short fragments are merged with the next sentence
+            if len(sentence) >= self.min_chars:
+                sentences.append(sentence)
+                start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return whatever text is left once the stream has ended"""
+        sentence = self._buffer.strip()
+        self._buffer = ""
+        return sentence or None
+
+class SentenceTTSPipeline:
+    """Synthesize a streamed reply sentence by sentence, delivering clips in order
+
+    Sentences are synthesized concurrently while the LLM keeps generating, so the
+    first one can start playing before the rest of the reply exists.
+    """
+
+    _DONE = object()
+
+    def __init__(self, synthesize: Callable[[str], bytes], sink: AudioSink,
+                 clean_text: Callable[[str], str], min_chars: int = 20):
+        self._synthesize = synthesize
+        self._sink = sink
+        self._clean_text = clean_text
+        self._splitter = SentenceSplitter(min_chars)
+        self._pending = []
+        self._condition = threading.Condition()
+        self._sink.begin_utterance()
+        self._player = threading.Thread(target=self._play_in_order, daemon=True)
+        self._player.start()
+
+    def feed(self, token: str):
+        """Feed one LLM token, starting synthesis for every sentence it completes"""
+        for sentence in self._splitter.feed(token):
+            self._submit(sentence)
+
+    def close(self):
+        """Mark the reply complete; queued sentences keep synthesizing in the background"""
+        remainder = self._splitter.flush()
+        if remainder:
+            self._submit(remainder)
+        with self._condition:
+            self._pending.append(self._DONE)
+            self._condition.notify()
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until every queued sentence has been delivered to the sink"""
+        self._player.join(timeout)
+
+    def _submit(self, sentence: str):
+        """Start synthesis of one sentence and queue it for ordered playback"""
+        text = self._clean_text(sentence)
+        if not text:
+            return
+        # Run in the caller's context so synthesis spans land in the current turn's trace
+        future = _synthesis_executor.submit(contextvars.copy_context().run, self._synthesize, text)
+        with self._condition:
+            self._pending.append(future)
+            self._condition.notify()
+
+    def _play_in_order(self):
+        """Deliver synthesized sentences in the order they were generated"""
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                future = self._pending.pop(0)
+
+            if future is self._DONE:
+                self._sink.end_utterance()
+                return
+
+            try:
+                self._sink.play(future.result())
+            except Exception as e:
+                print(f"Sentence TTS error: {e}")
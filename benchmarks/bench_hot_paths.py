@@ -0,0 +1,207 @@
+"""Micro-benchmarks for the interview hot paths, run offline against a fake LLM
+
+    python -m benchmarks.bench_hot_paths [--sizes 10 100 1000] [--output FILE]
+
+Results are written as JSON (benchmarks/results/<commit>.json by default) so two
+commits can be compared with benchmarks/compare.py.
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.fake_llm import (
+    FOLLOW_UP_RESPONSE,
+    PROFILE_JSON_RESPONSE,
+    PROFILE_RESPONSE,
+    QUESTIONS_RESPONSE,
+    FakeChatLLM,
+)
+from agents.chat_agent import EnhancedChatAgent
+from agents.profile_analyzer import ProfileAnalyzerAgent
+from agents.question_bank import QuestionBankAgent
+from engine.interview_engine import new_chat_state
+from langchain.schema import AIMessage, HumanMessage
+from utils.llm_cache import MemoryLLMCache
+from utils.question_bank_store import QuestionBankStore
+from utils.text_processing import TextProcessor
+from workflow.graph_builder import create_enhanced_chat_graph
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_SIZES = (10, 100, 1000)
+SESSION_ID = "bench"
+
+ANSWER = ("In my last role I led the migration of our churn model to a streaming pipeline. "
+          "We cut scoring latency from hours to seconds, and I mentored two juniors through it. ")
+
+PROFILE_ANALYSIS = TextProcessor.parse_profile_response(PROFILE_RESPONSE)
+
+# Private question bank databases, removed when the process exits
+_store_dir = tempfile.TemporaryDirectory(prefix="bench-question-banks-")
+
+def isolate(agent):
+    """Give an agent private state instead of the process-wide pools
+
+    Each agent gets its own question bank database and in-memory response cache,
+    and no scheduler, so results do not depend on earlier runs or other groups.
+    """
+    agent.scheduler = None
+    if agent.response_cache is not None:
+        agent.response_cache = MemoryLLMCache()
+    if isinstance(agent, QuestionBankAgent):
+        # QuestionBankStore creates the file, so each agent gets the next free name
+        path = os.path.join(_store_dir.name, f"{len(os.listdir(_store_dir.name))}.db")
+        agent.store = QuestionBankStore(path)
+    if isinstance(agent, EnhancedChatAgent):
+        for sub_agent in (agent.profile_analyzer, agent.question_bank_agent, agent.memory):
+            isolate(sub_agent)
+    return agent
+
+def settle(agent: EnhancedChatAgent):
+    """Wait for background question and summary jobs, then forget them
+
+    Run before each timed call so no job from an earlier run competes for the CPU
+    or is collected into the next run's state.
+    """
+    for registry in (agent.question_bank_agent.background_jobs, agent.memory.background_jobs):
+        registry.join()
+        registry.discard(SESSION_ID)
+
+def measure(fn: Callable[[], Any], setup: Optional[Callable[[], Any]] = None,
+            repeat: int = 20, min_time: float = 0.2) -> Dict[str, float]:
+    """Time fn, calling setup (untimed) before each run; returns per-call microseconds"""
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < repeat or time.perf_counter() - started < min_time:
+        arg = setup() if setup else None
+        t0 = time.perf_counter()
+        fn(arg) if setup else fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+        if len(samples) >= 10000:
+            break
+    samples.sort()
+    return {
+        "runs": len(samples),
+        "median_us": statistics.median(samples),
+        "p95_us": samples[int(0.95 * (len(samples) - 1))],
+        "min_us": samples[0],
+    }
+
+def build_state(turns: int) -> Dict[str, Any]:
+    """Build an interview-stage state with the given number of completed turns"""
+    state = new_chat_state(SESSION_ID)
+    state["interview_stage"] = "interview"
+    state["interview_start_time"] = datetime.now()
+    state["interview_duration"] = 120
+    state["profile_analysis"] = PROFILE_ANALYSIS
+    state["question_bank"] = isolate(QuestionBankAgent(llm=FakeChatLLM())).get_initial_questions(PROFILE_ANALYSIS)
+    for i in range(turns):
+        user, assistant = f"{ANSWER}(turn {i})", FOLLOW_UP_RESPONSE
+        state["messages"] += [HumanMessage(content=user), AIMessage(content=assistant)]
+        state["conversation_history"].append({"user": user, "assistant": assistant, "timestamp": datetime.now().isoformat()})
+    return state
+
+def bench_text_processing(sizes: List[int]) -> Dict[str, Any]:
+    analyzer = isolate(ProfileAnalyzerAgent(llm=FakeChatLLM()))
+    results = {
+        "parse_profile_response": measure(lambda: TextProcessor.parse_profile_response(PROFILE_RESPONSE)),
+        "parse_profile_json": measure(lambda: analyzer._parse_json_response(PROFILE_JSON_RESPONSE)),
+    }
+    for size in sizes:
+        # Reply length grows with the size so long spoken answers are covered too
+        text = "**Great answer!** ⏰ Let's move on. How did you test it? " * max(size // 10, 1)
+        results[f"clean_text_for_speech[{size}]"] = measure(lambda: TextProcessor.clean_text_for_speech(text))
+    return results
+
+def bench_question_bank(sizes: List[int]) -> Dict[str, Any]:
+    agent = isolate(QuestionBankAgent(llm=FakeChatLLM()))
+    results = {"parse_custom_questions": measure(lambda: agent._parse_custom_questions(QUESTIONS_RESPONSE, PROFILE_ANALYSIS))}
+    parsed = agent._parse_custom_questions(QUESTIONS_RESPONSE, PROFILE_ANALYSIS)
+    pool = agent._get_base_questions() + parsed
+    for size in sizes:
+        bank = [dict(pool[i % len(pool)], question=f"{pool[i % len(pool)]['question']} ({i})") for i in range(size)]
+        results[f"prioritize_questions[{size}]"] = measure(lambda: agent._prioritize_questions(bank, PROFILE_ANALYSIS))
+    if agent.corpus is not None:
+        results[f"search_question_corpus[{len(agent.corpus)}]"] = measure(lambda: agent.corpus.search(PROFILE_ANALYSIS))
+    return results
+
+def bench_interview_context(sizes: List[int]) -> Dict[str, Any]:
+    agent = isolate(EnhancedChatAgent(llm=FakeChatLLM()))
+    results = {}
+    for size in sizes:
+        state = build_state(size)
+        results[f"build_interview_messages[{size}]"] = measure(
+            lambda: agent._build_interview_messages(ANSWER, state)
+        )
+    return results
+
+def bench_graph_turn(sizes: List[int]) -> Dict[str, Any]:
+    agent = isolate(EnhancedChatAgent(llm=FakeChatLLM()))
+    graph = create_enhanced_chat_graph(chat_agent=agent)
+    results = {}
+    for size in sizes:
+        base = build_state(size)
+
+        def setup():
+            settle(agent)
+            state = copy.deepcopy(base)
+            state["messages"].append(HumanMessage(content=ANSWER))
+            return state
+
+        results[f"graph_invoke_turn[{size}]"] = measure(graph.invoke, setup, repeat=10)
+    settle(agent)
+    return results
+
+BENCHMARKS = {
+    "text_processing": bench_text_processing,
+    "question_bank": bench_question_bank,
+    "interview_context": bench_interview_context,
+    "graph_turn": bench_graph_turn,
+}
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the interview hot paths offline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="history sizes in turns")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run a subset of groups")
+    parser.add_argument("--output", help="JSON results file (default: benchmarks/results/<commit>.json)")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "sizes": args.sizes,
+        "results": {},
+    }
+    for name, bench in BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        print(f"Running {name}...")
+        for key, stats in bench(args.sizes).items():
+            report["results"][key] = stats
+            print(f"  {key:<40} median {stats['median_us']:>12.1f} us   p95 {stats['p95_us']:>12.1f} us")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Compare two benchmark result files
+
+    python -m benchmarks.compare BASELINE.json CANDIDATE.json [--threshold 10]
+
+Exits with status 1 when any benchmark's median got slower by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark results between commits")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    print(f"{'benchmark':<40} {baseline['commit']:>12} {candidate['commit']:>12} {'change':>9}")
+    regressions = []
+    for key, stats in candidate["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            print(f"{key:<40} {'-':>12} {stats['median_us']:>12.1f} {'new':>9}")
+            continue
+        change = (stats["median_us"] - before["median_us"]) / before["median_us"] * 100
+        flag = " !" if change > args.threshold else ""
+        print(f"{key:<40} {before['median_us']:>12.1f} {stats['median_us']:>12.1f} {change:>+8.1f}%{flag}")
+        if change > args.threshold:
+            regressions.append(key)
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the {args.threshold:.0f}% threshold: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import time
+from typing import Iterator, List
+
+from agents.prompts import (
+    NOTE_TAKER_INSTRUCTIONS,
+    PROFILE_ANALYST_INSTRUCTIONS,
+    PROFILE_JSON_INSTRUCTIONS,
+    PROFILE_QUESTIONS_JSON_INSTRUCTIONS,
+    QUESTION_WRITER_INSTRUCTIONS,
+)
+
+PROFILE_RESPONSE = """Experience Level: Senior
+Primary Skills: Python, Machine Learning, SQL, Docker, Kubernetes
+Domain: Data Science
+Years of Experience: 8
+Key Strengths: Problem solving, Mentoring
+Interview Focus: Model deployment, System design, Team leadership"""
+
+PROFILE_JSON_RESPONSE = json.dumps({
+    "experience_level": "Senior",
+    "skills": ["Python", "Machine Learning", "SQL", "Docker", "Kubernetes"],
+    "domain": "Data Science",
+    "years_experience": 8,
+    "strengths": ["Problem solving", "Mentoring"],
+    "focus_areas": ["Model deployment", "System design", "Team leadership"],
+})
+
+PROFILE_QUESTIONS_JSON_RESPONSE = json.dumps({
+    "profile": json.loads(PROFILE_JSON_RESPONSE),
+    "questions": [
+        {"question": "How have you deployed a machine learning model to production?",
+         "type": "technical", "difficulty": "hard"},
+        {"question": "Describe a time you disagreed with a stakeholder about a model's results.",
+         "type": "behavioral", "difficulty": "medium"},
+        {"question": "How would you design a feature store for a growing data team?",
+         "type": "situational", "difficulty": "hard"},
+    ],
+})
+
+QUESTIONS_RESPONSE = """Question: How have you deployed a machine learning model to production?
+Type: technical
+Difficulty: hard
+
+Question: Describe a time you disagreed with a stakeholder about a model's results.
+Type: behavioral
+Difficulty: medium
+
+Question: How would you design a feature store for a growing data team?
+Type: situational
+Difficulty: hard
+
+Question: Which SQL optimizations do you reach for first on slow queries?
+Type: technical
+Difficulty: medium
+
+Question: How do you mentor junior data scientists?
+Type: behavioral
+Difficulty: easy"""
+
+SUMMARY_RESPONSE = ("The candidate is a senior data scientist with eight years of experience. They described "
+                    "deploying models with Docker and Kubernetes and mentoring two junior colleagues.")
+
+FOLLOW_UP_RESPONSE = ("That's a great example of balancing accuracy with latency. How did you decide which "
+                      "metrics to monitor once the model was live? And who owned the alerts?")
+
+def canned_response(system_prompt: str) -> str:
+    """Pick the canned reply for a prompt by the instructions it starts with"""
+    if PROFILE_QUESTIONS_JSON_INSTRUCTIONS in system_prompt:
+        return PROFILE_QUESTIONS_JSON_RESPONSE
+    if PROFILE_JSON_INSTRUCTIONS in system_prompt:
+        return PROFILE_JSON_RESPONSE
+    if PROFILE_ANALYST_INSTRUCTIONS in system_prompt:
+        return PROFILE_RESPONSE
+    if QUESTION_WRITER_INSTRUCTIONS in system_prompt:
+        return QUESTIONS_RESPONSE
+    if NOTE_TAKER_INSTRUCTIONS in system_prompt:
+        return SUMMARY_RESPONSE
+    return FOLLOW_UP_RESPONSE
+
+class FakeChatLLM:
+    """Offline stand-in for the shared ChatOllama client with canned, prompt-aware replies"""
+    
+    def __init__(self, token_delay: float = 0.0):
+        self.token_delay = token_delay
+        self.calls = 0
+    
+    def invoke(self, messages, config=None, **kwargs) -> str:
+        self.calls += 1
+        return self._respond(messages)
+    
+    async def ainvoke(self, messages, config=None, **kwargs) -> str:
+        self.calls += 1
+        return self._respond(messages)
+    
+    def stream(self, messages, config=None, **kwargs) -> Iterator[str]:
+        self.calls += 1
+        for token in self._tokens(self._respond(messages)):
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            yield token
+    
+    async def astream(self, messages, config=None, **kwargs):
+        self.calls += 1
+        for token in self._tokens(self._respond(messages)):
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            yield token
+    
+    def _respond(self, messages) -> str:
+        prompt = messages if isinstance(messages, str) else getattr(messages[0], "content", "")
+        return canned_response(prompt)
+    
+    @staticmethod
+    def _tokens(text: str) -> List[str]:
+        words = text.split(" ")
+        return [words[0]] + [" " + word for word in words[1:]]
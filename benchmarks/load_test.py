@@ -0,0 +1,268 @@
+"""Concurrent end-to-end load test: N simulated candidates against local service stand-ins
+
+    python -m benchmarks.load_test --candidates 20 [--qa-turns 6] [--voice-turns 2] [--output FILE]
+
+Each candidate runs a full interview through the InterviewEngine (greeting,
+profile, Q&A turns and voice turns), with STTManager and TTSManager handling
+synthetic audio. Ollama and ElevenLabs are replaced by the stub servers in
+benchmarks/stub_servers.py, so only this process's own overhead and the
+configured service latency are measured.
+"""
+import argparse
+import io
+import json
+import os
+import pickle
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import wave
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.stub_servers import StubElevenLabsHandler, StubLatency, StubOllamaHandler, start_stub_server
+
+PROFILE_TEXT = ("I'm a senior data scientist with 8 years of experience. I work with Python, SQL, "
+                "Docker and Kubernetes, deploy ML models to production and mentor junior colleagues. "
+                "I'm looking for a lead data science role.")
+ANSWER_TEXT = ("In my last role I moved our churn model to a streaming pipeline. Scoring latency dropped "
+               "from hours to seconds, and I set up drift monitoring with weekly reviews.")
+
+def synthetic_answer(seconds: float, rate: int = 44100) -> bytes:
+    """Stereo WAV of noise bursts separated by pauses, roughly shaped like speech"""
+    rng = np.random.default_rng()
+    samples = np.zeros(int(seconds * rate), dtype=np.float32)
+    position = int(0.5 * rate)
+    while position < len(samples):
+        burst = int(rng.uniform(0.4, 1.5) * rate)
+        samples[position:position + burst] = rng.normal(0, 0.2, len(samples[position:position + burst]))
+        position += burst + int(rng.uniform(0.2, 0.8) * rate)
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2")
+    stereo = np.repeat(pcm[:, None], 2, axis=1)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(stereo.tobytes())
+    return buffer.getvalue()
+
+def rss_bytes() -> int:
+    """Resident set size of this process"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+    return {
+        "count": len(ordered),
+        "p50_ms": pick(0.50) * 1000,
+        "p95_ms": pick(0.95) * 1000,
+        "p99_ms": pick(0.99) * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+    }
+
+class LoadTest:
+    """Drive simulated interviews concurrently and collect per-turn timings"""
+
+    def __init__(self, args):
+        self.args = args
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.first_token: List[float] = []
+        self.errors: List[str] = []
+        self.memory: Dict[str, float] = {}
+        self.session_ids: List[str] = []
+        self._lock = threading.Lock()
+        self._all_started = threading.Barrier(args.candidates, action=self._measure_memory)
+
+    def setup(self):
+        # Imported after the stubs' URLs are in the environment, which the config reads at import
+        from audio.audio_sinks import NullAudioSink
+        from audio.stt_manager import STTManager
+        from audio.tts_manager import TTSManager
+        from engine.interview_engine import InterviewEngine
+        from pydub import AudioSegment
+
+        self.engine = InterviewEngine()
+        self.tts = TTSManager(sink=NullAudioSink())
+        self.stt = STTManager()
+        self.voice_id = self.tts.audio_config.get_elevenlabs_voice_id("rachel")
+        self.voice_settings = self.tts.audio_config.get_voice_settings("rachel")
+        self.answer_audio = AudioSegment.from_wav(io.BytesIO(synthetic_answer(self.args.answer_seconds)))
+        self.baseline_rss = rss_bytes()
+
+    def run(self) -> Dict:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.args.candidates) as pool:
+            for i in range(self.args.candidates):
+                pool.submit(self._run_candidate, i)
+                if self.args.ramp_s:
+                    time.sleep(self.args.ramp_s / self.args.candidates)
+        elapsed = time.perf_counter() - started
+
+        turns = sum(len(v) for k, v in self.timings.items() if k in ("greeting", "profile", "qa", "voice"))
+        return {
+            "elapsed_s": elapsed,
+            "turns": turns,
+            "throughput_turns_per_s": turns / elapsed if elapsed else 0.0,
+            "errors": len(self.errors),
+            "error_samples": self.errors[:5],
+            "latency": {kind: percentiles(samples) for kind, samples in self.timings.items()},
+            "time_to_first_token": percentiles(self.first_token),
+            "memory": self.memory,
+        }
+
+    def _run_candidate(self, index: int):
+        session_id = None
+        try:
+            state = self._timed("greeting", lambda: self.engine.start_session(settings={"interview_duration": 120}))
+            session_id = state["session_id"]
+            with self._lock:
+                self.session_ids.append(session_id)
+            self._speak(state)
+
+            state = self._turn(session_id, "profile", PROFILE_TEXT)
+            self._speak(state)
+            for _ in range(self.args.qa_turns):
+                state = self._turn(session_id, "qa", ANSWER_TEXT)
+                self._speak(state)
+
+            for _ in range(self.args.voice_turns):
+                turn_started = time.perf_counter()
+                text = self._timed("stt", lambda: self.stt.record_audio_streamlit(self.answer_audio))
+                state = self._turn(session_id, "qa_after_stt", text or ANSWER_TEXT)
+                self._speak(state)
+                self._record("voice", time.perf_counter() - turn_started)
+        except Exception as e:
+            with self._lock:
+                self.errors.append(f"candidate {index}: {e}")
+        finally:
+            try:
+                self._all_started.wait(timeout=600)
+            except threading.BrokenBarrierError:
+                pass
+            if session_id:
+                self.engine.end_session(session_id)
+
+    def _turn(self, session_id: str, kind: str, text: str):
+        started = time.perf_counter()
+        first = []
+
+        def on_token(token: str):
+            if not first:
+                first.append(time.perf_counter() - started)
+
+        state = self._timed(kind, lambda: self.engine.run_turn(session_id, text, on_token))
+        if first:
+            with self._lock:
+                self.first_token.append(first[0])
+        return state
+
+    def _speak(self, state):
+        reply = state["messages"][-1].content
+        clean = self.tts.text_processor.clean_text_for_speech(reply)
+        self._timed("tts", lambda: self.tts.synthesize(clean, self.voice_id, self.voice_settings))
+
+    def _timed(self, kind: str, fn):
+        started = time.perf_counter()
+        result = fn()
+        self._record(kind, time.perf_counter() - started)
+        return result
+
+    def _record(self, kind: str, seconds: float):
+        with self._lock:
+            self.timings[kind].append(seconds)
+
+    def _measure_memory(self):
+        """Runs once, when every candidate has finished its turns but not yet ended its session"""
+        sessions = self.engine.session_count()
+        state_sizes = [len(pickle.dumps(self.engine.get_state(session_id))) for session_id in self.session_ids]
+        rss_delta = rss_bytes() - self.baseline_rss
+        self.memory = {
+            "sessions_in_memory": sessions,
+            "rss_delta_mb": rss_delta / 2**20,
+            "rss_per_session_kb": rss_delta / max(sessions, 1) / 1024,
+            "state_bytes_per_session": statistics.fmean(state_sizes) if state_sizes else 0,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent interviews against local service stubs")
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--qa-turns", type=int, default=6)
+    parser.add_argument("--voice-turns", type=int, default=2)
+    parser.add_argument("--answer-seconds", type=float, default=20.0, help="length of each synthetic spoken answer")
+    parser.add_argument("--ramp-s", type=float, default=0.0, help="spread candidate start times over this many seconds")
+    parser.add_argument("--llm-first-token-ms", type=float, default=StubLatency.llm_first_token_ms)
+    parser.add_argument("--llm-token-ms", type=float, default=StubLatency.llm_token_ms)
+    parser.add_argument("--tts-ms", type=float, default=StubLatency.tts_ms)
+    parser.add_argument("--stt-ms", type=float, default=StubLatency.stt_ms)
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args()
+
+    latency = StubLatency(
+        llm_first_token_ms=args.llm_first_token_ms,
+        llm_token_ms=args.llm_token_ms,
+        tts_ms=args.tts_ms,
+        stt_ms=args.stt_ms,
+    )
+    _, ollama_url = start_stub_server(StubOllamaHandler, latency)
+    _, elevenlabs_url = start_stub_server(StubElevenLabsHandler, latency)
+
+    workdir = tempfile.mkdtemp(prefix="interview-load-")
+    os.environ.update({
+        "OLLAMA_BASE_URL": ollama_url,
+        "ELEVENLABS_BASE_URL": elevenlabs_url,
+        "ELEVENLABS_API_KEY": os.environ.get("ELEVENLABS_API_KEY", "stub-key"),
+        "ENGINE_CHECKPOINT_DB": os.path.join(workdir, "checkpoints.sqlite"),
+        "TTS_CACHE_DIR": os.path.join(workdir, "tts"),
+        "AUDIO_SINK": "null",
+    })
+    os.environ.pop("OPENAI_API_KEY", None)
+
+    test = LoadTest(args)
+    test.setup()
+    print(f"Running {args.candidates} candidates against {ollama_url} and {elevenlabs_url}...")
+    report = test.run()
+    report.update({
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "config": vars(args),
+    })
+
+    print(f"\n{report['turns']} turns in {report['elapsed_s']:.1f}s "
+          f"({report['throughput_turns_per_s']:.2f} turns/s), {report['errors']} error(s)")
+    for kind, stats in sorted(report["latency"].items()):
+        print(f"  {kind:<14} n={stats['count']:<5} p50 {stats['p50_ms']:>8.0f} ms  "
+              f"p95 {stats['p95_ms']:>8.0f} ms  p99 {stats['p99_ms']:>8.0f} ms")
+    if report["time_to_first_token"]:
+        ttft = report["time_to_first_token"]
+        print(f"  {'first token':<14} n={ttft['count']:<5} p50 {ttft['p50_ms']:>8.0f} ms  "
+              f"p95 {ttft['p95_ms']:>8.0f} ms  p99 {ttft['p99_ms']:>8.0f} ms")
+    memory = report["memory"]
+    if memory:
+        print(f"  memory: {memory['rss_per_session_kb']:.0f} KB RSS and "
+              f"{memory['state_bytes_per_session'] / 1024:.1f} KB of state per session")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Local stand-ins for the Ollama and ElevenLabs HTTP APIs with configurable latency
+
+    python -m benchmarks.stub_servers [--ollama-port 11434] [--elevenlabs-port 8766]
+
+Point the app at them with OLLAMA_BASE_URL and ELEVENLABS_BASE_URL.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+from benchmarks.fake_llm import FOLLOW_UP_RESPONSE, canned_response
+
+@dataclass
+class StubLatency:
+    """Simulated service timings, in milliseconds"""
+    llm_first_token_ms: float = 250.0
+    llm_token_ms: float = 20.0
+    llm_prompt_ms_per_1k_chars: float = 40.0
+    tts_ms: float = 300.0
+    tts_ms_per_100_chars: float = 60.0
+    stt_ms: float = 400.0
+    stt_ms_per_100kb: float = 150.0
+    jitter: float = 0.2  # +/- fraction applied to every delay
+
+    def sleep(self, ms: float):
+        if ms > 0:
+            time.sleep(ms * random.uniform(1 - self.jitter, 1 + self.jitter) / 1000)
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def latency(self) -> StubLatency:
+        return self.server.latency
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_chunked(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_chunked(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+class StubOllamaHandler(_StubHandler):
+    """Emulates /api/chat and /api/generate, streaming NDJSON like Ollama"""
+
+    _reply_counter = itertools.count(1)
+
+    def do_GET(self):
+        if self.path in ("/", "/api/tags"):
+            self._send(200, json.dumps({"models": [{"name": "llama3.2"}]}).encode(), "application/json")
+        else:
+            self._send(404, b"{}", "application/json")
+
+    def do_POST(self):
+        payload = json.loads(self._read_body() or b"{}")
+        if self.path == "/api/chat":
+            messages = payload.get("messages", [])
+            prompt_chars = sum(len(m.get("content", "")) for m in messages)
+            reply = canned_response(messages[0].get("content", "") if messages else "")
+            self._reply(payload, reply, prompt_chars, chat=True)
+        elif self.path == "/api/generate":
+            prompt = payload.get("prompt", "")
+            self._reply(payload, canned_response(prompt), len(prompt), chat=False)
+        else:
+            self._send(404, b"{}", "application/json")
+
+    def _reply(self, payload, reply: str, prompt_chars: int, chat: bool):
+        if reply == FOLLOW_UP_RESPONSE:
+            # Vary follow-ups so downstream caches see realistic miss rates
+            reply = f"{reply} (#{next(self._reply_counter)})"
+
+        prompt_ms = self.latency.llm_prompt_ms_per_1k_chars * prompt_chars / 1000
+        started = time.perf_counter()
+        self.latency.sleep(self.latency.llm_first_token_ms + prompt_ms)
+        words = reply.split(" ")
+        tokens = [words[0]] + [" " + word for word in words[1:]]
+        stats = {
+            "done": True,
+            "total_duration": 0,
+            "load_duration": 0,
+            "prompt_eval_count": prompt_chars // 4,
+            "prompt_eval_duration": int(prompt_ms * 1e6),
+            "eval_count": len(tokens),
+        }
+
+        if payload.get("stream", True) is False:
+            for _ in tokens:
+                self.latency.sleep(self.latency.llm_token_ms)
+            stats["total_duration"] = int((time.perf_counter() - started) * 1e9)
+            body = dict(stats, **self._piece(reply, chat, payload))
+            self._send(200, json.dumps(body).encode(), "application/json")
+            return
+
+        self._start_chunked("application/x-ndjson")
+        for token in tokens:
+            self.latency.sleep(self.latency.llm_token_ms)
+            line = dict(self._piece(token, chat, payload), done=False)
+            self._write_chunk(json.dumps(line).encode() + b"\n")
+        stats["eval_duration"] = int(len(tokens) * self.latency.llm_token_ms * 1e6)
+        stats["total_duration"] = int((time.perf_counter() - started) * 1e9)
+        self._write_chunk(json.dumps(dict(stats, **self._piece("", chat, payload))).encode() + b"\n")
+        self._end_chunked()
+
+    @staticmethod
+    def _piece(text: str, chat: bool, payload) -> dict:
+        base = {"model": payload.get("model", "llama3.2"), "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ")}
+        if chat:
+            base["message"] = {"role": "assistant", "content": text}
+        else:
+            base["response"] = text
+        return base
+
+class StubElevenLabsHandler(_StubHandler):
+    """Emulates ElevenLabs text-to-speech streaming and speech-to-text"""
+
+    TRANSCRIPT = ("I have eight years of experience in data science, mostly deploying machine learning "
+                  "models with Docker and Kubernetes.")
+
+    def do_GET(self):
+        if self.path.startswith("/v1/voices"):
+            body = {"voices": [{"voice_id": "21m00Tcm4TlvDq8ikWAM", "name": "Rachel"}]}
+            self._send(200, json.dumps(body).encode(), "application/json")
+        else:
+            self._send(404, b"{}", "application/json")
+
+    def do_POST(self):
+        body = self._read_body()
+        if self.path.startswith("/v1/text-to-speech/"):
+            text = json.loads(body or b"{}").get("text", "")
+            self.latency.sleep(self.latency.tts_ms + self.latency.tts_ms_per_100_chars * len(text) / 100)
+            # Roughly 1 KB of MP3 per 10 characters of speech
+            audio = b"ID3" + os.urandom(max(len(text) * 100, 256))
+            self._start_chunked("audio/mpeg")
+            for start in range(0, len(audio), 16384):
+                self._write_chunk(audio[start:start + 16384])
+            self._end_chunked()
+        elif self.path.startswith("/v1/speech-to-text"):
+            self.latency.sleep(self.latency.stt_ms + self.latency.stt_ms_per_100kb * len(body) / 100000)
+            # A single JSON line parses both as a plain response and as an NDJSON stream
+            result = {"language_code": "en", "language_probability": 1.0, "text": self.TRANSCRIPT, "words": []}
+            self._send(200, json.dumps(result).encode() + b"\n", "application/json")
+        else:
+            self._send(404, b"{}", "application/json")
+
+def start_stub_server(handler_class, latency: StubLatency, host: str = "127.0.0.1",
+                      port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve a stub on a background thread; port 0 picks a free one. Returns the server and its base URL"""
+    server = ThreadingHTTPServer((host, port), handler_class)
+    server.daemon_threads = True
+    server.latency = latency
+    threading.Thread(target=server.serve_forever, name=f"stub-{handler_class.__name__}", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Run local Ollama and ElevenLabs stand-ins")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--ollama-port", type=int, default=11434)
+    parser.add_argument("--elevenlabs-port", type=int, default=8766)
+    args = parser.parse_args()
+
+    latency = StubLatency()
+    _, ollama_url = start_stub_server(StubOllamaHandler, latency, args.host, args.ollama_port)
+    _, elevenlabs_url = start_stub_server(StubElevenLabsHandler, latency, args.host, args.elevenlabs_port)
+    print(f"Stub Ollama at {ollama_url} (OLLAMA_BASE_URL), stub ElevenLabs at {elevenlabs_url} (ELEVENLABS_BASE_URL)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
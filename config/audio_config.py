@@ -1,5 +1,6 @@
+import os
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Optional
 
 @dataclass
 class AudioConfig:
@@ -10,6 +11,31 @@ class AudioConfig:
     DEFAULT_SPEED: float = 1.0
     MIN_SPEED: float = 0.5
     MAX_SPEED: float = 2.0
+    ELEVENLABS_BASE_URL: Optional[str] = os.getenv("ELEVENLABS_BASE_URL")  # None uses the public API
+    TTS_SYNTHESIS_WORKERS: int = 4  # concurrent sentence synthesis requests
+    TTS_MIN_SENTENCE_CHARS: int = 20  # shorter fragments are merged with the next sentence
+    TTS_CACHE_DIR: str = os.getenv("TTS_CACHE_DIR", ".cache/tts")
+    TTS_CACHE_MEMORY_ENTRIES: int = 128
+    TTS_CACHE_DISK_MAX_MB: int = 200
+    AUDIO_SINK: str = os.getenv("AUDIO_SINK", "browser")  # browser, null, file or local
+    AUDIO_SINK_DIR: str = os.getenv("AUDIO_SINK_DIR", ".cache/audio_out")
+    STT_PREPROCESS: bool = True  # trim silence, downmix and resample before upload
+    STT_SAMPLE_RATE: int = 16000
+    STT_VAD_FRAME_MS: int = 30
+    STT_VAD_DYNAMIC_RANGE_DB: float = 35.0  # frames this far below the peak count as silence
+    STT_VAD_FLOOR_DBFS: float = -55.0
+    STT_VAD_PADDING_MS: int = 250
+    STT_SEGMENTED: bool = True  # transcribe long answers as parallel segments
+    STT_SEGMENT_THRESHOLD_MS: int = 60000  # only recordings longer than this are split
+    STT_SEGMENT_MIN_MS: int = 15000
+    STT_SEGMENT_MIN_SILENCE_MS: int = 400
+    STT_SEGMENT_WORKERS: int = 4
+    STT_HEDGE: bool = True  # race the next provider when the current one is slower than its p95
+    STT_HEDGE_DEFAULT_DELAY_S: float = 3.0  # used until a provider has latency samples
+    STT_HEDGE_MIN_DELAY_S: float = 1.0
+    STT_HEDGE_MAX_DELAY_S: float = 8.0
+    STT_BREAKER_FAILURES: int = 3  # consecutive failures that open a provider's circuit
+    STT_BREAKER_COOLDOWN_S: float = 30.0
     
     def __post_init__(self):
         if self.VOICE_OPTIONS is None:
@@ -5,9 +5,27 @@ import os
 class ModelConfig:
     """Model configuration settings"""
     model_name: str = "llama3.2"
+    base_url: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     temperature: float = 0.7
     num_ctx: int = 4096
     num_predict: int = 512
+    keep_alive: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")  # keeps the model and its KV cache loaded
+    background_workers: int = 2  # threads for off-request-path generation
+    profile_json_output: bool = True  # Ollama JSON mode for profile analysis, regex text parsing otherwise
+    profile_num_predict: int = 200  # a compact profile object needs far fewer tokens than prose
+    # Extract the profile and write the custom questions in one generation
+    profile_with_questions: bool = True
+    profile_with_questions_num_predict: int = 700
+    # Responses of agents that opt in are reused for identical prompts: memory, sqlite or off
+    llm_cache_backend: str = os.getenv("LLM_CACHE", "memory")
+    llm_cache_path: str = os.getenv("LLM_CACHE_DB", ".cache/llm_responses.sqlite")
+    llm_cache_entries: int = 512
+    llm_cache_ttl: int = 3600  # seconds
+    # Concurrent LLM calls across all sessions; set it to the server's OLLAMA_NUM_PARALLEL
+    # (4 by default) so calls queue here by priority instead of FIFO inside Ollama; 0 disables gating
+    llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+    # Slots only interview replies may use; extraction and background work share the rest
+    llm_reserved_interactive: int = int(os.getenv("LLM_RESERVED_INTERACTIVE", "1"))
 
 class InterviewConfig:
     """Interview configuration settings"""
@@ -15,6 +33,42 @@ class InterviewConfig:
     min_duration: int = 5
     max_duration: int = 120
     warning_threshold: int = 300  # 5 minutes in seconds
+    # Custom question banks shared by candidates for the same role; empty disables them
+    question_bank_path: str = os.getenv("QUESTION_BANK_DB", ".cache/question_banks.sqlite")
+    question_bank_key_skills: int = 3  # primary skills that identify a role
+    # Curated questions retrieved for the profile without an LLM call; built by scripts/build_question_corpus.py
+    question_corpus_path: str = os.getenv("QUESTION_CORPUS", "data/question_corpus.jsonl")
+    corpus_questions: int = 8
+    # Estimated word overlap (Jaccard) at which a question repeats one already in the bank or asked.
+    # Conservative: it catches rephrasings that keep their content words and avoids false positives,
+    # but misses rewordings with different vocabulary (see tests/test_near_duplicates.py)
+    duplicate_threshold: float = 0.7
+
+class MemoryConfig:
+    """Conversation memory settings for the interview prompt"""
+    # Tokens for the summary plus verbatim turns; the rest of num_ctx holds the
+    # fixed prompt and the num_predict reply
+    context_tokens: int = 1200
+    chars_per_token: int = 4  # rough estimate for English text
+    recent_turns: int = 4  # newest turns kept verbatim and out of the summary
+    summary_batch_turns: int = 3  # summarize once this many turns have aged out
+    live_turns: int = 12  # uncompressed turns kept in conversation_history
+    max_messages: int = 20
+
+class TracingConfig:
+    """Per-turn latency tracing settings"""
+    enabled: bool = os.getenv("TRACING", "True").lower() == "true"
+    jsonl_path: str = os.getenv("TRACE_JSONL", ".cache/traces.jsonl")  # empty disables the export
+
+class EngineConfig:
+    """Interview engine service settings"""
+    url: str = os.getenv("ENGINE_URL", "")  # empty runs the engine inside the Streamlit process
+    host: str = os.getenv("ENGINE_HOST", "127.0.0.1")
+    port: int = int(os.getenv("ENGINE_PORT", "8765"))
+    request_timeout: int = 300
+    # Per-session ChatState is checkpointed here after every turn; empty disables it
+    checkpoint_path: str = os.getenv("ENGINE_CHECKPOINT_DB", ".cache/checkpoints.sqlite")
+    session_idle_seconds: int = int(os.getenv("ENGINE_SESSION_IDLE_SECONDS", "900"))
 
 class AppConfig:
     """Main application configuration"""
@@ -30,6 +84,15 @@ class AppConfig:
     
     # Interview settings
     interview: InterviewConfig = InterviewConfig()
+    
+    # Conversation memory settings
+    memory: MemoryConfig = MemoryConfig()
+    
+    # Tracing settings
+    tracing: TracingConfig = TracingConfig()
+    
+    # Engine service settings
+    engine: EngineConfig = EngineConfig()
 
 # Global configuration instance
 CONFIG = AppConfig()
\ No newline at end of file
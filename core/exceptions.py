@@ -20,4 +20,8 @@ class ModelError(InterviewSystemError):
 
 class AgentError(InterviewSystemError):
     """Agent-related errors"""
+    pass
+
+class SessionNotFoundError(InterviewSystemError):
+    """Unknown or expired interview session"""
     pass
\ No newline at end of file
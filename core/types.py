@@ -3,11 +3,18 @@ from datetime import datetime
 from langchain.schema import BaseMessage
 
 class ChatState(TypedDict):
+    session_id: str
     messages: List[BaseMessage]
     current_question: str
+    current_question_index: int
     interview_stage: str
     candidate_info: Dict[str, Any]
     conversation_history: List[Dict[str, str]]
+    conversation_summary: str
+    summarized_turns: int
+    archived_turns: int
+    conversation_archive: List[str]
+    asked_signatures: List[str]
     profile_analysis: Dict[str, Any]
     question_bank: List[Dict[str, Any]]
     interview_start_time: Optional[datetime]
@@ -15,6 +22,10 @@ class ChatState(TypedDict):
     is_interview_ended: bool
     voice_enabled: bool
     selected_voice: str
+    requisition_id: str
+    auto_initialized: bool
+    prompt_stats: Dict[str, Any]
+    turn_trace: List[Dict[str, Any]]
 
 class ProfileAnalysis(TypedDict):
     experience_level: str
@@ -0,0 +1,81 @@
+import json
+import urllib.error
+import urllib.request
+from typing import Any, Callable, Dict, Optional
+from config.settings import CONFIG
+from core.exceptions import InterviewSystemError, SessionNotFoundError
+from core.types import ChatState
+from engine.interview_engine import get_shared_engine, state_from_dict
+
+class EngineClient:
+    """HTTP client for a remote InterviewEngine, with the same start/turn/end API"""
+    
+    def __init__(self, base_url: str, timeout: int = 300):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+    
+    def start_session(self, session_id: Optional[str] = None, settings: Optional[Dict[str, Any]] = None,
+                      on_token: Optional[Callable[[str], None]] = None) -> ChatState:
+        """Create a session and run the greeting turn"""
+        response = self._request("POST", "/sessions", {"session_id": session_id, "settings": settings})
+        state = state_from_dict(response["state"])
+        if on_token and state["messages"]:
+            on_token(state["messages"][-1].content)
+        return state
+    
+    def run_turn(self, session_id: str, text: str, on_token: Optional[Callable[[str], None]] = None,
+                 settings: Optional[Dict[str, Any]] = None) -> ChatState:
+        """Run one candidate turn, streaming tokens to on_token when given"""
+        path = f"/sessions/{session_id}/turns"
+        if not on_token:
+            return state_from_dict(self._request("POST", path, {"text": text, "settings": settings})["state"])
+        
+        request = self._build_request("POST", path, {"text": text, "settings": settings, "stream": True})
+        with self._open(request) as response:
+            for line in response:
+                if not line.strip():
+                    continue
+                payload = json.loads(line)
+                if "token" in payload:
+                    on_token(payload["token"])
+                elif "state" in payload:
+                    return state_from_dict(payload["state"])
+                elif "error" in payload:
+                    raise InterviewSystemError(f"Engine turn failed: {payload['error']}")
+        raise InterviewSystemError("Engine closed the stream without a final state")
+    
+    def end_session(self, session_id: str) -> ChatState:
+        """End an interview and release its resources"""
+        return state_from_dict(self._request("DELETE", f"/sessions/{session_id}")["state"])
+    
+    def get_state(self, session_id: str) -> ChatState:
+        """Get the current state of a session"""
+        return state_from_dict(self._request("GET", f"/sessions/{session_id}")["state"])
+    
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        with self._open(self._build_request(method, path, body)) as response:
+            return json.loads(response.read())
+    
+    def _build_request(self, method: str, path: str, body: Optional[Dict[str, Any]]) -> urllib.request.Request:
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        return urllib.request.Request(
+            self.base_url + path, data=data, method=method, headers={"Content-Type": "application/json"}
+        )
+    
+    def _open(self, request: urllib.request.Request):
+        try:
+            return urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            message = e.read().decode("utf-8", "replace")
+            if e.code == 404:
+                raise SessionNotFoundError(message)
+            raise InterviewSystemError(f"Engine request failed ({e.code}): {message}")
+        except urllib.error.URLError as e:
+            raise InterviewSystemError(f"Engine unreachable at {self.base_url}: {e.reason}")
+
+def connect_engine(url: Optional[str] = None):
+    """Get a remote engine client when a URL is configured, otherwise the in-process engine"""
+    url = CONFIG.engine.url if url is None else url
+    if url:
+        return EngineClient(url, CONFIG.engine.request_timeout)
+    return get_shared_engine()
@@ -0,0 +1,133 @@
+import argparse
+import json
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from config.settings import CONFIG
+from core.exceptions import SessionNotFoundError
+from engine.interview_engine import InterviewEngine, get_shared_engine, state_to_dict
+from utils.llm_scheduler import get_shared_llm_scheduler
+from utils.tracing import METRICS
+
+SESSION_PATH = re.compile(r"^/sessions/(?P<session_id>[\w-]+)$")
+TURN_PATH = re.compile(r"^/sessions/(?P<session_id>[\w-]+)/turns$")
+
+class EngineRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over an InterviewEngine
+
+    POST   /sessions                 start a session (greeting turn included)
+    GET    /metrics                  stage latency and LLM queue metrics in Prometheus text format
+    GET    /sessions/<id>            current state
+    POST   /sessions/<id>/turns      run a turn; {"stream": true} returns NDJSON tokens then the state
+    DELETE /sessions/<id>            end a session
+    """
+    
+    engine: InterviewEngine = None
+    
+    def do_GET(self):
+        if self.path == "/health":
+            return self._send_json(200, {"status": "ok", "sessions": self.engine.session_count()})
+        if self.path == "/metrics":
+            text = METRICS.render_prometheus()
+            scheduler = get_shared_llm_scheduler()
+            if scheduler is not None:
+                text += scheduler.render_prometheus()
+            return self._send_text(200, text, "text/plain; version=0.0.4")
+        match = SESSION_PATH.match(self.path)
+        if not match:
+            return self._send_json(404, {"error": "Not found"})
+        self._handle(lambda: {"state": state_to_dict(self.engine.get_state(match["session_id"]))})
+    
+    def do_POST(self):
+        body = self._read_json()
+        if self.path == "/sessions":
+            return self._handle(lambda: {
+                "state": state_to_dict(self.engine.start_session(body.get("session_id"), body.get("settings")))
+            })
+        match = TURN_PATH.match(self.path)
+        if not match:
+            return self._send_json(404, {"error": "Not found"})
+        if body.get("stream"):
+            return self._stream_turn(match["session_id"], body)
+        self._handle(lambda: {
+            "state": state_to_dict(self.engine.run_turn(match["session_id"], body["text"], settings=body.get("settings")))
+        })
+    
+    def do_DELETE(self):
+        match = SESSION_PATH.match(self.path)
+        if not match:
+            return self._send_json(404, {"error": "Not found"})
+        self._handle(lambda: {"state": state_to_dict(self.engine.end_session(match["session_id"]))})
+    
+    def _stream_turn(self, session_id: str, body: Dict[str, Any]):
+        """Write one NDJSON line per token, then a final line with the state"""
+        try:
+            self.engine.get_state(session_id)
+        except SessionNotFoundError as e:
+            return self._send_json(404, {"error": str(e)})
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        
+        def write_line(payload: Dict[str, Any]):
+            self.wfile.write(json.dumps(payload).encode("utf-8") + b"\n")
+            self.wfile.flush()
+        
+        try:
+            state = self.engine.run_turn(
+                session_id, body["text"], lambda token: write_line({"token": token}), body.get("settings")
+            )
+            write_line({"state": state_to_dict(state)})
+        except Exception as e:
+            write_line({"error": str(e)})
+    
+    def _handle(self, action):
+        try:
+            self._send_json(200, action())
+        except SessionNotFoundError as e:
+            self._send_json(404, {"error": str(e)})
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {"error": f"Bad request: {e}"})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+    
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+    
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        self._send_text(status, json.dumps(payload), "application/json")
+    
+    def _send_text(self, status: int, text: str, content_type: str):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def create_server(host: str, port: int, engine: Optional[InterviewEngine] = None) -> ThreadingHTTPServer:
+    """Create a threaded HTTP server bound to an engine"""
+    handler = type("BoundEngineRequestHandler", (EngineRequestHandler,), {"engine": engine or get_shared_engine()})
+    return ThreadingHTTPServer((host, port), handler)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the headless interview engine")
+    parser.add_argument("--host", default=CONFIG.engine.host)
+    parser.add_argument("--port", type=int, default=CONFIG.engine.port)
+    args = parser.parse_args()
+    
+    server = create_server(args.host, args.port)
+    print(f"✅ Interview engine listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from langchain.schema import AIMessage, HumanMessage
+from config.settings import CONFIG
+from core.exceptions import SessionNotFoundError
+from core.types import ChatState
+from utils.tracing import span, start_trace
+from workflow.graph_builder import get_shared_chat_graph
+
+TokenCallback = Callable[[str], None]
+
+# Settings a client may change between turns
+MUTABLE_SETTINGS = ("interview_duration", "voice_enabled", "selected_voice", "requisition_id")
+
+def new_chat_state(session_id: Optional[str] = None) -> ChatState:
+    """Create the state of an interview that has not started yet"""
+    return {
+        "session_id": session_id or uuid.uuid4().hex,
+        "messages": [],
+        "current_question": "",
+        "current_question_index": 0,
+        "interview_stage": "greeting",
+        "candidate_info": {},
+        "conversation_history": [],
+        "conversation_summary": "",
+        "summarized_turns": 0,
+        "archived_turns": 0,
+        "conversation_archive": [],
+        "asked_signatures": [],
+        "profile_analysis": {},
+        "question_bank": [],
+        "interview_start_time": None,
+        "interview_duration": CONFIG.interview.default_duration,
+        "is_interview_ended": False,
+        "voice_enabled": True,
+        "selected_voice": "aria",
+        "requisition_id": "",
+        "auto_initialized": False,
+        "prompt_stats": {},
+        "turn_trace": [],
+    }
+
+def state_to_dict(state: ChatState) -> Dict[str, Any]:
+    """Convert a ChatState to plain JSON-safe data"""
+    data = dict(state)
+    data["messages"] = [
+        {"type": "human" if isinstance(m, HumanMessage) else "ai", "content": m.content}
+        for m in state.get("messages", [])
+    ]
+    start_time = state.get("interview_start_time")
+    data["interview_start_time"] = start_time.isoformat() if start_time else None
+    return data
+
+def state_from_dict(data: Dict[str, Any]) -> ChatState:
+    """Rebuild a ChatState from state_to_dict output"""
+    state = dict(data)
+    state["messages"] = [
+        HumanMessage(content=m["content"]) if m["type"] == "human" else AIMessage(content=m["content"])
+        for m in data.get("messages", [])
+    ]
+    start_time = data.get("interview_start_time")
+    state["interview_start_time"] = datetime.fromisoformat(start_time) if start_time else None
+    return state
+
+class InterviewEngine:
+    """Headless interview service: start, turn and end around the shared graph
+
+    Holds active sessions' ChatState, so UI processes only render and relay input.
+    When the graph has a checkpointer, idle sessions are dropped from memory and
+    rehydrated from their checkpoint on the next request.
+    """
+    
+    def __init__(self, graph=None, idle_seconds: Optional[int] = None):
+        self.graph = graph or get_shared_chat_graph(CONFIG.model.model_name)
+        self.idle_seconds = CONFIG.engine.session_idle_seconds if idle_seconds is None else idle_seconds
+        self._sessions: Dict[str, ChatState] = {}
+        self._session_locks: Dict[str, threading.Lock] = {}
+        self._last_active: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def start_session(self, session_id: Optional[str] = None, settings: Optional[Dict[str, Any]] = None,
+                      on_token: Optional[TokenCallback] = None) -> ChatState:
+        """Create a session and run the greeting turn"""
+        self.evict_idle()
+        state = new_chat_state(session_id)
+        self._apply_settings(state, settings)
+        
+        with self._lock:
+            self._register(state["session_id"], state)
+        
+        # The greeting is triggered by a hidden hello that is not kept in the transcript
+        state = self.run_turn(state["session_id"], "Hello", on_token)
+        state["messages"] = [m for m in state["messages"] if isinstance(m, AIMessage)][-1:]
+        state["auto_initialized"] = True
+        self._persist(state["session_id"], state)
+        return state
+    
+    def run_turn(self, session_id: str, text: str, on_token: Optional[TokenCallback] = None,
+                 settings: Optional[Dict[str, Any]] = None) -> ChatState:
+        """Run one candidate turn and return the updated state"""
+        self.evict_idle()
+        with self._get_session_lock(session_id):
+            state = self._next_turn_state(session_id, text, settings)
+            with start_trace("engine.turn", session_id) as trace:
+                with span("graph.turn"):
+                    result = self.graph.invoke(state, config=self._graph_config(session_id, on_token))
+            result["turn_trace"] = trace.breakdown()
+            self._store(session_id, result)
+            return result
+    
+    async def arun_turn(self, session_id: str, text: str, on_token: Optional[TokenCallback] = None,
+                        settings: Optional[Dict[str, Any]] = None) -> ChatState:
+        """Async variant of run_turn, serialized with sync and async turns of the same session"""
+        self.evict_idle()
+        lock = self._get_session_lock(session_id)
+        await self._acquire(lock)
+        try:
+            state = self._next_turn_state(session_id, text, settings)
+            with start_trace("engine.turn", session_id) as trace:
+                with span("graph.turn"):
+                    result = await self.graph.ainvoke(state, config=self._graph_config(session_id, on_token))
+            result["turn_trace"] = trace.breakdown()
+            self._store(session_id, result)
+            return result
+        finally:
+            lock.release()
+    
+    def end_session(self, session_id: str) -> ChatState:
+        """End an interview and release its resources"""
+        with self._get_session_lock(session_id):
+            state = self.get_state(session_id)
+            state["is_interview_ended"] = True
+            state["interview_stage"] = "ended"
+            self._persist(session_id, state)
+            self._forget(session_id)
+            return state
+    
+    def get_state(self, session_id: str) -> ChatState:
+        """Get the current state of a session, rehydrating it from its checkpoint if evicted"""
+        with self._lock:
+            state = self._sessions.get(session_id)
+        if state is None:
+            state = self._load_checkpoint(session_id)
+            if state is None:
+                raise SessionNotFoundError(f"Unknown interview session: {session_id}")
+        
+        with self._lock:
+            if session_id not in self._sessions:
+                self._register(session_id, state)
+            self._last_active[session_id] = time.monotonic()
+            return self._sessions[session_id]
+    
+    def session_count(self) -> int:
+        """Number of sessions currently held in memory"""
+        with self._lock:
+            return len(self._sessions)
+    
+    def evict_idle(self) -> int:
+        """Drop sessions idle for longer than idle_seconds from memory; returns how many"""
+        if not self.graph.checkpointer or self.idle_seconds <= 0:
+            return 0
+        
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            idle = [
+                session_id for session_id, last_active in self._last_active.items()
+                if last_active < cutoff and not self._session_locks[session_id].locked()
+            ]
+            for session_id in idle:
+                self._sessions.pop(session_id, None)
+                self._session_locks.pop(session_id, None)
+                self._last_active.pop(session_id, None)
+        
+        if idle:
+            print(f"Evicted {len(idle)} idle interview session(s)")
+        return len(idle)
+    
+    def _load_checkpoint(self, session_id: str) -> Optional[ChatState]:
+        """Read a session's last checkpointed state, if there is one"""
+        if not self.graph.checkpointer:
+            return None
+        snapshot = self.graph.get_state({"configurable": {"thread_id": session_id}})
+        return dict(snapshot.values) if snapshot.values else None
+    
+    def _persist(self, session_id: str, state: ChatState):
+        """Checkpoint changes made to a session outside a graph turn"""
+        if self.graph.checkpointer:
+            self.graph.update_state({"configurable": {"thread_id": session_id}}, state)
+    
+    def _store(self, session_id: str, state: ChatState):
+        with self._lock:
+            self._register(session_id, state)
+    
+    def _forget(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._session_locks.pop(session_id, None)
+            self._last_active.pop(session_id, None)
+    
+    def _register(self, session_id: str, state: ChatState):
+        """Hold a new or rehydrated session in memory; call with self._lock held"""
+        self._sessions[session_id] = state
+        self._session_locks.setdefault(session_id, threading.Lock())
+        self._last_active[session_id] = time.monotonic()
+    
+    def _get_session_lock(self, session_id: str) -> threading.Lock:
+        # get_state rehydrates an evicted session or raises for an unknown one
+        self.get_state(session_id)
+        with self._lock:
+            return self._session_locks.setdefault(session_id, threading.Lock())
+    
+    @staticmethod
+    async def _acquire(lock: threading.Lock):
+        """Wait for a session lock without blocking the event loop"""
+        if lock.acquire(blocking=False):
+            return
+        acquiring = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # The worker thread still takes the lock; hand it back once it does
+            acquiring.add_done_callback(lambda future: future.cancelled() or lock.release())
+            raise
+    
+    def _next_turn_state(self, session_id: str, text: str, settings: Optional[Dict[str, Any]]) -> ChatState:
+        """Copy of the session's state with the candidate's message added
+
+        The stored state only changes once the turn succeeds, so a failed turn
+        can be retried without recording the answer twice.
+        """
+        state = dict(self.get_state(session_id))
+        self._apply_settings(state, settings)
+        state["messages"] = state["messages"] + [HumanMessage(content=text)]
+        return state
+    
+    def _apply_settings(self, state: ChatState, settings: Optional[Dict[str, Any]]):
+        """Copy client-controlled settings into the state"""
+        for key in MUTABLE_SETTINGS:
+            if settings and key in settings:
+                state[key] = settings[key]
+    
+    @staticmethod
+    def _graph_config(session_id: str, on_token: Optional[TokenCallback]) -> Dict[str, Any]:
+        configurable = {"thread_id": session_id}
+        if on_token:
+            configurable["on_token"] = on_token
+        return {"configurable": configurable}
+
+_shared_engine = None
+_shared_engine_lock = threading.Lock()
+
+def get_shared_engine() -> InterviewEngine:
+    """Get the process-wide engine, creating it on first use"""
+    global _shared_engine
+    with _shared_engine_lock:
+        if _shared_engine is None:
+            _shared_engine = InterviewEngine()
+        return _shared_engine
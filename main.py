@@ -1,7 +1,7 @@
 import streamlit as st
 from config.settings import CONFIG
 from utils.session_manager import SessionManager
-from workflow.graph_builder import create_enhanced_chat_graph
+from engine.client import connect_engine
 from audio.tts_manager import TTSManager
 from audio.stt_manager import STTManager
 from ui.app import StreamlitApp
@@ -9,11 +9,12 @@ from core.exceptions import InterviewSystemError
 
 def initialize_system():
     """Initialize the complete system"""
-    if "graph" not in st.session_state:
+    if "engine" not in st.session_state:
         try:
             with st.spinner("🚀 Initializing HR Interview System..."):
-                # Initialize components
-                st.session_state.graph = create_enhanced_chat_graph("llama3.2")
+                # Initialize components (the engine is remote when ENGINE_URL is set,
+                # otherwise shared process-wide with its graph and LLM client)
+                st.session_state.engine = connect_engine()
                 st.session_state.tts_manager = TTSManager()
                 st.session_state.stt_manager = STTManager()
                 
@@ -0,0 +1,139 @@
+"""Build the curated interview question corpus from role and question templates
+
+Writes one tagged question per line (domain, skills, type, difficulty):
+
+    python -m scripts.build_question_corpus --output data/question_corpus.jsonl
+"""
+import argparse
+import json
+import os
+from typing import Any, Dict, Iterator, List
+
+DOMAIN_SKILLS = {
+    "Software Engineering": [
+        "Python", "Java", "JavaScript", "TypeScript", "Go", "C++", "REST APIs", "Microservices",
+        "Distributed Systems", "System Design", "Testing", "Databases",
+    ],
+    "Frontend Development": [
+        "React", "Vue", "Angular", "CSS", "Accessibility", "Web Performance", "State Management", "TypeScript",
+    ],
+    "Data Science": [
+        "Python", "Machine Learning", "Statistics", "SQL", "Deep Learning", "NLP", "A/B Testing",
+        "Feature Engineering", "Data Visualization", "Pandas",
+    ],
+    "Data Engineering": [
+        "SQL", "Spark", "Airflow", "Kafka", "Data Modeling", "ETL", "Data Warehousing", "dbt",
+    ],
+    "DevOps": [
+        "Kubernetes", "Docker", "Terraform", "CI/CD", "AWS", "Monitoring", "Linux", "Incident Response",
+    ],
+    "Cybersecurity": [
+        "Threat Modeling", "Penetration Testing", "Network Security", "Identity and Access Management",
+        "Incident Response", "Cloud Security", "Security Compliance",
+    ],
+    "Quality Assurance": [
+        "Test Automation", "Selenium", "Performance Testing", "Test Planning", "API Testing", "Regression Testing",
+    ],
+    "Product Management": [
+        "Roadmapping", "Stakeholder Management", "User Research", "Prioritization", "Analytics",
+        "Go-to-Market", "Agile",
+    ],
+    "Design": [
+        "UX Research", "Interaction Design", "Prototyping", "Figma", "Design Systems", "Usability Testing",
+    ],
+    "Marketing": [
+        "SEO", "Content Strategy", "Campaign Management", "Marketing Analytics", "Brand Strategy",
+        "Social Media", "Email Marketing",
+    ],
+    "Sales": [
+        "Prospecting", "Negotiation", "CRM", "Account Management", "Pipeline Management", "Enterprise Sales",
+    ],
+    "Finance": [
+        "Financial Modeling", "Budgeting", "Forecasting", "Excel", "Accounting", "Risk Management",
+    ],
+    "Human Resources": [
+        "Recruiting", "Employee Relations", "Compensation", "Performance Management", "Onboarding",
+        "Labor Law",
+    ],
+    "Customer Support": [
+        "Customer Communication", "Ticketing Systems", "Escalation Handling", "Knowledge Base", "Customer Success",
+    ],
+}
+
+# (type, difficulty, template) for questions about one skill
+SKILL_TEMPLATES = [
+    ("technical", "easy", "How would you explain {skill} to someone new to {domain}?"),
+    ("technical", "easy", "Which {skill} tools or practices do you use most often, and why?"),
+    ("technical", "medium", "Walk me through how you applied {skill} in a recent {domain} project."),
+    ("technical", "medium", "What common mistakes do people make with {skill}, and how do you avoid them?"),
+    ("technical", "medium", "How do you measure whether your {skill} work is successful?"),
+    ("technical", "hard", "Describe the hardest {skill} problem you have solved and the trade-offs you weighed."),
+    ("technical", "hard", "How would you design a {skill} approach for a team that has to scale tenfold?"),
+    ("technical", "hard", "Where do you think {skill} is heading in {domain}, and how are you preparing for it?"),
+    ("experience", "easy", "How did you first learn {skill}?"),
+    ("experience", "medium", "Tell me about a time {skill} made a measurable difference to a result."),
+    ("experience", "hard", "Tell me about a {skill} decision you made that turned out to be wrong. What did you change?"),
+    ("situational", "medium", "A deadline is close and an issue with {skill} appears. How do you decide what to do?"),
+    ("situational", "hard", "How would you introduce {skill} to a team that is resistant to it?"),
+    ("behavioral", "medium", "Describe how you helped a colleague improve their {skill}."),
+    ("behavioral", "hard", "Tell me about a disagreement over a {skill} approach and how you resolved it."),
+]
+
+# (type, difficulty, template) for questions about the role as a whole
+DOMAIN_TEMPLATES = [
+    ("motivation", "easy", "What drew you to a career in {domain}?"),
+    ("motivation", "easy", "What kind of {domain} work energizes you the most?"),
+    ("experience", "easy", "Which {domain} project are you most proud of?"),
+    ("experience", "medium", "How has your approach to {domain} work changed over your career?"),
+    ("experience", "medium", "What does a typical week in your {domain} role look like?"),
+    ("behavioral", "medium", "Tell me about a time you had to deliver {domain} work with unclear requirements."),
+    ("behavioral", "medium", "How do you keep your {domain} skills current?"),
+    ("behavioral", "hard", "Describe a time you had to push back on a stakeholder in a {domain} context."),
+    ("situational", "medium", "How would you plan your first ninety days in a new {domain} role?"),
+    ("situational", "hard", "If two critical {domain} priorities conflicted, how would you choose between them?"),
+    ("leadership", "hard", "How have you mentored or led others in {domain}?"),
+    ("leadership", "hard", "How would you build a {domain} team's practices from scratch?"),
+]
+
+def build_corpus() -> Iterator[Dict[str, Any]]:
+    """Yield every corpus question with its tags"""
+    for domain, skills in DOMAIN_SKILLS.items():
+        for question_type, difficulty, template in DOMAIN_TEMPLATES:
+            yield {
+                "question": template.format(domain=domain),
+                "type": question_type,
+                "difficulty": difficulty,
+                "category": "corpus",
+                "domain": domain,
+                "skills": [],
+            }
+        for skill in skills:
+            for question_type, difficulty, template in SKILL_TEMPLATES:
+                yield {
+                    "question": template.format(skill=skill, domain=domain),
+                    "type": question_type,
+                    "difficulty": difficulty,
+                    "category": "corpus",
+                    "domain": domain,
+                    "skills": [skill],
+                }
+
+def write_corpus(path: str, questions: List[Dict[str, Any]]):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for question in questions:
+            f.write(json.dumps(question) + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the curated interview question corpus")
+    parser.add_argument("--output", default="data/question_corpus.jsonl")
+    args = parser.parse_args()
+    
+    questions = list(build_corpus())
+    write_corpus(args.output, questions)
+    print(f"✅ Wrote {len(questions)} questions for {len(DOMAIN_SKILLS)} domains to {args.output}")
+
+if __name__ == "__main__":
+    main()
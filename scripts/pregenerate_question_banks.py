@@ -0,0 +1,89 @@
+"""Pre-generate custom question banks for many roles, in parallel
+
+Roles come from a JSON list or a JSONL file; each role has a domain, an
+experience_level, skills and optionally a requisition_id:
+
+    python -m scripts.pregenerate_question_banks scripts/roles.example.jsonl --workers 4
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List
+from agents.question_bank import QuestionBankAgent
+from config.settings import CONFIG
+from core.types import ProfileAnalysis
+from utils.llm_scheduler import LLMScheduler
+from utils.question_bank_store import QuestionBankStore
+
+def load_roles(path: str) -> List[Dict[str, Any]]:
+    """Read roles from a JSON list or one JSON object per line"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read().strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+def role_to_profile(role: Dict[str, Any]) -> ProfileAnalysis:
+    """Build the profile a candidate for this role would be analyzed into"""
+    skills = role.get("skills", [])
+    if isinstance(skills, str):
+        skills = [skill.strip() for skill in skills.split(",") if skill.strip()]
+    return {
+        "experience_level": str(role.get("experience_level", "Mid")).strip().capitalize(),
+        "skills": skills[:5],
+        "domain": role.get("domain", "General"),
+        "years_experience": int(role.get("years_experience", 3)),
+        "strengths": role.get("strengths", []),
+        "focus_areas": role.get("focus_areas", skills[:3]),
+    }
+
+def generate_bank(agent: QuestionBankAgent, role: Dict[str, Any], force: bool) -> str:
+    """Generate and store one role's bank; returns a status line"""
+    profile = role_to_profile(role)
+    requisition_id = role.get("requisition_id")
+    keys = agent.store.keys_for(profile, requisition_id)
+    if not force and all(agent.store.contains(key) for key in keys):
+        return f"skipped {keys[0]} (already stored)"
+    
+    started = time.perf_counter()
+    questions = agent._generate_custom_questions(profile)
+    if not questions:
+        return f"failed {keys[0]} (no questions parsed)"
+    agent.store.store(questions, profile, requisition_id, replace=force)
+    return f"stored {keys[0]}: {len(questions)} questions in {time.perf_counter() - started:.1f}s"
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate custom question banks for many roles")
+    parser.add_argument("roles", help="JSON or JSONL file of roles")
+    parser.add_argument("--db", default=CONFIG.interview.question_bank_path, help="question bank database")
+    parser.add_argument("--workers", type=int, default=4, help="roles generated in parallel")
+    parser.add_argument("--model", default=CONFIG.model.model_name)
+    parser.add_argument("--force", action="store_true", help="regenerate banks that are already stored")
+    args = parser.parse_args()
+    
+    if not args.db:
+        parser.error("no question bank database configured (set QUESTION_BANK_DB or pass --db)")
+    
+    roles = load_roles(args.roles)
+    store = QuestionBankStore(args.db, CONFIG.interview.question_bank_key_skills)
+    agent = QuestionBankAgent(args.model, store=store)
+    # No interview traffic here, so every worker gets a slot instead of the shared background share
+    agent.scheduler = LLMScheduler(args.workers, reserved_interactive=0)
+    
+    print(f"Generating banks for {len(roles)} roles with {args.workers} workers into {args.db}")
+    failures = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(generate_bank, agent, role, args.force): role for role in roles}
+        for future in as_completed(futures):
+            try:
+                print(f"  {future.result()}")
+            except Exception as e:
+                failures += 1
+                print(f"  ❌ {futures[future].get('domain', '?')}: {e}")
+    
+    stats = store.stats()
+    print(f"✅ {stats['banks']} banks stored, {failures} roles failed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import pytest
+from audio.audio_sinks import BrowserAudioSink, estimate_mp3_seconds
+
+def mp3(kbps_index: int, payload_bytes: int, header: int = 0xFB) -> bytes:
+    """An MPEG-1 Layer III frame header followed by filler"""
+    return bytes([0xFF, header, kbps_index << 4, 0x00]) + b"\x00" * (payload_bytes - 4)
+
+def test_browser_sink_publishes_each_clip_as_it_arrives():
+    sink = BrowserAudioSink()
+    sink.begin_utterance()
+    sink.play(b"first")
+    assert sink.snapshot() == (1, [b"first"], False)
+
+    sink.play(b"second")
+    sink.end_utterance()
+    assert sink.snapshot() == (1, [b"first", b"second"], True)
+
+def test_browser_sink_starts_a_new_queue_per_reply():
+    sink = BrowserAudioSink()
+    sink.begin_utterance()
+    sink.play(b"old reply")
+    sink.end_utterance()
+
+    sink.begin_utterance()
+    assert sink.snapshot() == (2, [], False)
+
+def test_browser_sink_nested_utterances_share_one_queue():
+    sink = BrowserAudioSink()
+    sink.begin_utterance()
+    sink.begin_utterance()
+    sink.play(b"clip")
+    sink.end_utterance()
+    assert sink.snapshot() == (1, [b"clip"], False)
+    sink.end_utterance()
+    assert sink.snapshot()[2]
+
+def test_mp3_duration_uses_the_frame_bitrate():
+    assert estimate_mp3_seconds(mp3(9, 16000)) == pytest.approx(1.0)  # 128 kbps
+    assert estimate_mp3_seconds(mp3(5, 16000)) == pytest.approx(2.0)  # 64 kbps
+
+def test_mp3_duration_skips_an_id3_tag():
+    tag = b"ID3\x04\x00\x00" + bytes([0, 0, 1, 0]) + b"\x00" * 128
+    assert estimate_mp3_seconds(tag + mp3(9, 16000)) == pytest.approx(1.0)
+
+def test_mp3_duration_falls_back_to_the_default_bitrate():
+    assert estimate_mp3_seconds(b"\x00" * 16000) == pytest.approx(1.0)
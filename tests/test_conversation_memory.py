@@ -0,0 +1,88 @@
+from agents.conversation_memory import ConversationMemoryAgent, compress_turns, expand_turns, full_history
+from config.settings import MemoryConfig
+
+class SummaryLLM:
+    """Answers every summary request with the number of calls so far"""
+
+    model = "summary"
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages, config=None, **options):
+        self.calls += 1
+        return f"summary {self.calls}"
+
+class SmallMemoryConfig(MemoryConfig):
+    context_tokens = 100
+    chars_per_token = 4
+    recent_turns = 2
+    summary_batch_turns = 2
+    live_turns = 3
+    max_messages = 4
+
+def turns(count: int, start: int = 0):
+    return [{"user": f"answer {i}", "assistant": f"question {i}"} for i in range(start, start + count)]
+
+def make_agent():
+    agent = ConversationMemoryAgent(llm=SummaryLLM())
+    agent.config = SmallMemoryConfig()
+    agent.scheduler = None
+    return agent
+
+def make_state(history):
+    return {"session_id": "test", "messages": [], "conversation_history": list(history),
+            "conversation_summary": "", "summarized_turns": 0, "archived_turns": 0}
+
+def test_compressed_turns_round_trip():
+    history = turns(3) + [{"user": "naïve ☕ answer", "assistant": "ok"}]
+    block = compress_turns(history)
+    assert isinstance(block, str)
+    assert expand_turns(block) == history
+
+def test_full_history_puts_archived_turns_first():
+    state = make_state(turns(2, start=4))
+    state["conversation_archive"] = [compress_turns(turns(2)), compress_turns(turns(2, start=2))]
+    assert full_history(state) == turns(6)
+
+def test_select_context_keeps_the_newest_turns_that_fit():
+    agent = make_agent()
+    state = make_state(turns(3))
+    state["conversation_summary"] = "s" * 380  # 95 of the 100 tokens, room for one 5-token turn
+    summary, recent = agent.select_context(state)
+    assert summary == state["conversation_summary"]
+    assert recent == turns(1, start=2)
+
+def test_select_context_trims_an_oversized_newest_answer_from_the_start():
+    agent = make_agent()
+    long_answer = "x" * 300 + "the end"
+    state = make_state([{"user": long_answer, "assistant": "next?"}])
+    _, recent = agent.select_context(state)
+    assert len(recent) == 1
+    assert recent[0]["user"].endswith("the end")
+    kept_tokens = agent.estimate_tokens(recent[0]["user"]) + agent.estimate_tokens("next?")
+    assert kept_tokens <= agent.config.context_tokens
+
+def test_after_turn_summarizes_aged_turns_then_archives_them():
+    agent = make_agent()
+    state = make_state(turns(6))
+
+    agent.after_turn(state)
+    agent.background_jobs.join()
+    assert state["summarized_turns"] == 0
+
+    agent.after_turn(state)
+    assert state["conversation_summary"] == "summary 1"
+    assert state["summarized_turns"] == 4  # everything but the recent turns
+    assert state["archived_turns"] == 3  # only down to the live window
+    assert len(state["conversation_history"]) == 3
+    assert agent.turn_count(state) == 6
+    assert full_history(state) == turns(6)
+
+def test_select_context_skips_turns_the_summary_covers():
+    agent = make_agent()
+    state = make_state(turns(6))
+    state["conversation_summary"] = "summary"
+    state["summarized_turns"] = 4
+    _, recent = agent.select_context(state)
+    assert recent == turns(2, start=4)
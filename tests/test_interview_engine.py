@@ -0,0 +1,104 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+from langchain.schema import AIMessage, HumanMessage
+from engine.interview_engine import InterviewEngine
+
+class FakeGraph:
+    """Compiled-graph stand-in that replies to every turn and checkpoints per thread"""
+
+    def __init__(self, delay: float = 0.0):
+        self.checkpointer = object()
+        self.checkpoints = {}
+        self.delay = delay
+        self.fail = False
+
+    def invoke(self, state, config):
+        if self.fail:
+            raise RuntimeError("LLM timed out")
+        result = dict(state)
+        result["messages"] = state["messages"] + [AIMessage(content=f"reply {len(state['messages'])}")]
+        self.checkpoints[config["configurable"]["thread_id"]] = dict(result)
+        return result
+
+    async def ainvoke(self, state, config):
+        await asyncio.sleep(self.delay)
+        return self.invoke(state, config)
+
+    def get_state(self, config):
+        return SimpleNamespace(values=self.checkpoints.get(config["configurable"]["thread_id"], {}))
+
+    def update_state(self, config, state):
+        self.checkpoints[config["configurable"]["thread_id"]] = dict(state)
+
+def human_texts(state):
+    return [m.content for m in state["messages"] if isinstance(m, HumanMessage)]
+
+def make_engine(**kwargs):
+    return InterviewEngine(graph=FakeGraph(**kwargs), idle_seconds=60)
+
+def expire(engine: InterviewEngine, session_id: str):
+    engine._last_active[session_id] -= engine.idle_seconds + 1
+
+def test_rehydrated_session_can_be_evicted_again():
+    engine = make_engine()
+    session_id = engine.start_session()["session_id"]
+    engine.run_turn(session_id, "first answer")
+
+    expire(engine, session_id)
+    assert engine.evict_idle() == 1
+    assert human_texts(engine.get_state(session_id)) == ["first answer"]
+
+    expire(engine, session_id)
+    assert engine.evict_idle() == 1
+    engine.start_session()
+    assert human_texts(engine.run_turn(session_id, "second answer")) == ["first answer", "second answer"]
+
+def test_failed_turn_leaves_the_session_unchanged():
+    engine = make_engine()
+    session_id = engine.start_session()["session_id"]
+    engine.run_turn(session_id, "first answer")
+
+    engine.graph.fail = True
+    with pytest.raises(RuntimeError):
+        engine.run_turn(session_id, "second answer", settings={"interview_duration": 5})
+    state = engine.get_state(session_id)
+    assert human_texts(state) == ["first answer"]
+    assert state["interview_duration"] != 5
+
+    engine.graph.fail = False
+    assert human_texts(engine.run_turn(session_id, "second answer")) == ["first answer", "second answer"]
+
+def test_concurrent_async_turns_of_one_session_are_serialized():
+    engine = make_engine(delay=0.05)
+    session_id = engine.start_session()["session_id"]
+
+    async def run():
+        await asyncio.gather(*(engine.arun_turn(session_id, f"answer {i}") for i in range(3)))
+
+    asyncio.run(run())
+    assert sorted(human_texts(engine.get_state(session_id))) == ["answer 0", "answer 1", "answer 2"]
+
+def test_sync_and_async_turns_share_the_session_lock():
+    engine = make_engine(delay=0.05)
+    session_id = engine.start_session()["session_id"]
+
+    async def run():
+        turn = asyncio.ensure_future(engine.arun_turn(session_id, "async answer"))
+        await asyncio.sleep(0.01)
+        await asyncio.to_thread(engine.run_turn, session_id, "sync answer")
+        await turn
+
+    asyncio.run(run())
+    assert human_texts(engine.get_state(session_id)) == ["async answer", "sync answer"]
+
+def test_async_turns_evict_idle_sessions():
+    engine = make_engine()
+    idle_id = engine.start_session()["session_id"]
+    active_id = engine.start_session()["session_id"]
+    expire(engine, idle_id)
+
+    asyncio.run(engine.arun_turn(active_id, "answer"))
+    assert engine.session_count() == 1
+    assert human_texts(engine.get_state(idle_id)) == []
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from agents.base_agent import BaseAgent
+from utils import tracing
+from utils.llm_cache import MemoryLLMCache, SQLiteLLMCache, make_cache_key
+
+class SlowLLM:
+    """Counts calls and takes a while to answer, so concurrent calls overlap"""
+
+    model = "slow"
+
+    def __init__(self, delay: float = 0.1):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _count(self):
+        with self._lock:
+            self.calls += 1
+
+    def invoke(self, messages, config=None, **options):
+        self._count()
+        time.sleep(self.delay)
+        return f"answer to {messages}"
+
+    async def ainvoke(self, messages, config=None, **options):
+        self._count()
+        await asyncio.sleep(self.delay)
+        return f"answer to {messages}"
+
+class CachingAgent(BaseAgent):
+    cache_responses = True
+
+    def __init__(self, llm):
+        super().__init__(llm=llm)
+        self.response_cache = MemoryLLMCache()
+        self.scheduler = None
+
+    def process(self, prompt):
+        return self._invoke_llm(prompt)
+
+    async def aprocess(self, prompt):
+        return await self._ainvoke_llm(prompt)
+
+def test_cache_key_ignores_whitespace_but_not_options():
+    assert make_cache_key("m", {"temperature": 0}, "a  b\n c") == make_cache_key("m", {"temperature": 0}, "a b c")
+    assert make_cache_key("m", {"temperature": 0}, "a b c") != make_cache_key("m", {"temperature": 1}, "a b c")
+
+def test_memory_cache_evicts_least_recently_used_and_expires():
+    cache = MemoryLLMCache(max_entries=2, ttl_seconds=3600)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+
+    cache.ttl_seconds = 1e-9
+    time.sleep(0.01)
+    assert cache.get("a") is None
+
+def test_sqlite_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    SQLiteLLMCache(path).set("key", "text")
+    assert SQLiteLLMCache(path).get("key") == "text"
+
+def test_identical_concurrent_calls_reach_the_llm_once():
+    llm = SlowLLM()
+    agent = CachingAgent(llm)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        answers = list(pool.map(agent.process, ["same prompt"] * 8))
+    assert llm.calls == 1
+    assert set(answers) == {"answer to same prompt"}
+
+def test_different_concurrent_calls_are_not_coalesced():
+    llm = SlowLLM()
+    agent = CachingAgent(llm)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(agent.process, [f"prompt {i}" for i in range(4)]))
+    assert llm.calls == 4
+
+def test_identical_concurrent_async_calls_reach_the_llm_once():
+    llm = SlowLLM()
+    agent = CachingAgent(llm)
+
+    async def run():
+        return await asyncio.gather(*(agent.aprocess("same prompt") for _ in range(5)))
+
+    assert set(asyncio.run(run())) == {"answer to same prompt"}
+    assert llm.calls == 1
+
+def test_waiters_retry_when_the_first_call_fails():
+    class FlakyLLM(SlowLLM):
+        def invoke(self, messages, config=None, **options):
+            self._count()
+            time.sleep(self.delay)
+            if self.calls == 1:
+                raise RuntimeError("model unavailable")
+            return "recovered"
+
+    llm = FlakyLLM()
+    agent = CachingAgent(llm)
+
+    def call(_):
+        try:
+            return agent.process("same prompt")
+        except RuntimeError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        answers = list(pool.map(call, range(4)))
+    assert answers.count(None) == 1
+    assert answers.count("recovered") == 3
+    assert llm.calls == 2
+
+def test_interrupted_async_stream_reports_the_tokens_it_produced(monkeypatch):
+    class BrokenStreamLLM(SlowLLM):
+        async def astream(self, messages, config=None):
+            for token in ["Tell ", "", "me "]:
+                yield token
+            raise RuntimeError("connection reset")
+
+    spans = []
+    monkeypatch.setattr(tracing, "record_span", lambda name, seconds, **attributes: spans.append(attributes))
+    agent = CachingAgent(BrokenStreamLLM())
+    received = []
+    try:
+        asyncio.run(agent._astream_llm("prompt", received.append))
+    except RuntimeError:
+        pass
+    assert received == ["Tell ", "me "]
+    assert spans[-1]["tokens"] == 2 and spans[-1]["chars"] == 8
+    assert spans[-1]["error"] == "RuntimeError"
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+import pytest
+from utils.llm_scheduler import LLMScheduler
+
+def wait_until(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+def queued(scheduler: LLMScheduler) -> int:
+    return sum(stats["queued"] for stats in scheduler.stats().values())
+
+class Holder:
+    """Holds scheduler slots in background threads until released"""
+
+    def __init__(self, scheduler: LLMScheduler):
+        self.scheduler = scheduler
+        self.release = threading.Event()
+        self.threads = []
+
+    def hold(self, priority: str, session_id: str = "holder"):
+        entered = threading.Event()
+
+        def run():
+            with self.scheduler.slot(priority, session_id):
+                entered.set()
+                self.release.wait()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.threads.append(thread)
+        return entered
+
+    def done(self):
+        self.release.set()
+        for thread in self.threads:
+            thread.join()
+
+def grant_order(scheduler: LLMScheduler, requests):
+    """Queue (label, priority, session) requests behind one busy slot and return the order they ran in"""
+    holder = Holder(scheduler)
+    assert holder.hold("interactive").wait(1)
+
+    order, threads = [], []
+    for label, priority, session_id in requests:
+        def run(label=label, priority=priority, session_id=session_id):
+            with scheduler.slot(priority, session_id):
+                order.append(label)
+
+        before = queued(scheduler)
+        thread = threading.Thread(target=run)
+        thread.start()
+        threads.append(thread)
+        wait_until(lambda: queued(scheduler) == before + 1)
+
+    holder.done()
+    for thread in threads:
+        thread.join()
+    return order
+
+def test_waiting_calls_run_by_priority():
+    scheduler = LLMScheduler(max_concurrency=1, reserved_interactive=0)
+    order = grant_order(scheduler, [
+        ("background", "background", "a"),
+        ("extraction", "extraction", "a"),
+        ("interactive", "interactive", "a"),
+    ])
+    assert order == ["interactive", "extraction", "background"]
+
+def test_sessions_take_turns_within_a_priority():
+    scheduler = LLMScheduler(max_concurrency=1, reserved_interactive=0)
+    order = grant_order(scheduler, [
+        ("a1", "background", "a"),
+        ("a2", "background", "a"),
+        ("a3", "background", "a"),
+        ("b1", "background", "b"),
+    ])
+    assert order == ["a1", "b1", "a2", "a3"]
+
+def test_reserved_slots_are_kept_for_interactive_calls():
+    scheduler = LLMScheduler(max_concurrency=2, reserved_interactive=1)
+    holder = Holder(scheduler)
+    assert holder.hold("background").wait(1)
+
+    blocked = holder.hold("background", "other")
+    wait_until(lambda: scheduler.stats()["background"]["queued"] == 1)
+    assert not blocked.is_set()
+
+    assert holder.hold("interactive").wait(1)
+    holder.done()
+    assert blocked.is_set()
+
+def test_without_reserve_every_slot_is_shared():
+    scheduler = LLMScheduler(max_concurrency=2, reserved_interactive=0)
+    holder = Holder(scheduler)
+    assert holder.hold("background", "a").wait(1)
+    assert holder.hold("background", "b").wait(1)
+    holder.done()
+
+def test_cancelled_async_waiter_leaves_the_queue():
+    scheduler = LLMScheduler(max_concurrency=1, reserved_interactive=0)
+
+    async def run():
+        async with scheduler.aslot("interactive", "a"):
+            waiter = asyncio.ensure_future(scheduler.aslot("extraction", "b").__aenter__())
+            await asyncio.sleep(0.01)
+            assert scheduler.stats()["extraction"]["queued"] == 1
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            assert scheduler.stats()["extraction"]["queued"] == 0
+        async with scheduler.aslot("extraction", "c"):
+            pass
+
+    asyncio.run(run())
+    stats = scheduler.stats()
+    assert sum(priority["running"] for priority in stats.values()) == 0
+    assert stats["extraction"]["granted"] == 1
+
+def test_unknown_priority_is_rejected():
+    scheduler = LLMScheduler()
+    with pytest.raises(ValueError):
+        with scheduler.slot("urgent"):
+            pass
+
+def test_prometheus_output_lists_every_priority():
+    scheduler = LLMScheduler(max_concurrency=3)
+    with scheduler.slot("interactive", "a"):
+        text = scheduler.render_prometheus()
+    assert "llm_scheduler_slots 3" in text
+    assert 'llm_scheduler_running{priority="interactive"} 1' in text
+    assert 'llm_scheduler_queue_depth{priority="background"} 0' in text
@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+from config.settings import CONFIG
+from utils.near_duplicates import MERSENNE_PRIME, NearDuplicateFilter, shingles, split_sentences
+
+# Pairs InterviewConfig.duplicate_threshold was tuned on; the held-out pairs below were not used
+PARAPHRASES = [
+    ("Tell me about a challenging project you worked on.", "Can you tell me about a challenging project you have worked on recently?"),
+    ("Tell me about a challenging project you worked on.", "What was the hardest project you have worked on?"),
+    ("Tell me about a challenging project you worked on.", "Describe the most difficult project you've been part of."),
+    ("How do you handle tight deadlines?", "How do you deal with tight deadlines?"),
+    ("How do you handle working under pressure?", "How do you cope with pressure at work?"),
+    ("What are your greatest strengths?", "What would you say are your biggest strengths?"),
+    ("What is your greatest weakness?", "What would you consider your main weakness?"),
+    ("Can you tell me about yourself and your background?", "Tell me a bit about yourself and your background."),
+    ("What interests you about this role?", "What interests you most about this position?"),
+    ("Why do you want to work here?", "Why would you like to work for us?"),
+    ("Where do you see yourself in five years?", "Where do you see yourself five years from now?"),
+    ("How do you handle conflict with a coworker?", "How do you deal with conflicts with colleagues?"),
+    ("Tell me about a time you failed.", "Describe a time when you failed at something."),
+    ("How do you prioritize your work?", "How do you prioritize tasks when everything is urgent?"),
+    ("What motivates you?", "What motivates you at work?"),
+    ("Tell me about a time you showed leadership.", "Describe a situation where you demonstrated leadership."),
+]
+
+DISTINCT = [
+    ("How would you explain Python to someone new to Data Science?", "How would you explain SQL to someone new to Data Science?"),
+    ("How did you first learn Machine Learning?", "How did you first learn Deep Learning?"),
+    ("Walk me through how you applied SQL in a recent Data Science project.", "Walk me through how you applied Spark in a recent Data Engineering project."),
+    ("What are your greatest strengths?", "What is your greatest weakness?"),
+    ("Tell me about a challenging project you worked on.", "Tell me about a project you are proud of."),
+    ("How do you handle tight deadlines?", "How do you handle disagreements with your manager?"),
+    ("What interests you about this role?", "What would you change about your current role?"),
+    ("Tell me about a time you failed.", "Tell me about a time you succeeded against the odds."),
+    ("How do you test your Python code?", "How do you deploy your Python code?"),
+    ("Why do you want to work here?", "Why are you leaving your current job?"),
+    ("Where do you see yourself in five years?", "What did you learn in the last five years?"),
+    ("How do you prioritize your work?", "How do you measure the quality of your work?"),
+    ("Describe how you helped a colleague improve their Testing.", "Tell me about a disagreement over a Testing approach and how you resolved it."),
+    ("What drew you to a career in DevOps?", "How have you mentored or led others in DevOps?"),
+]
+
+# Rewordings that share almost no content words. Matching is lexical, so these score far
+# below the threshold: it is a conservative setting that avoids false positives, not a
+# paraphrase detector
+HELD_OUT_PARAPHRASES = [
+    ("What are you most proud of in your career?", "Which career achievement makes you proudest?"),
+    ("How do you keep your technical skills current?", "How do you stay up to date with new technology?"),
+    ("Describe your ideal work environment.", "What kind of workplace do you do your best work in?"),
+    ("What do you do when you disagree with your manager?", "How do you handle disagreements with your manager?"),
+    ("How do you handle feedback?", "How do you deal with criticism of your work?"),
+]
+
+HELD_OUT_DISTINCT = [
+    ("How do you keep your technical skills current?", "How do you keep your team motivated?"),
+    ("Describe your ideal work environment.", "Describe your ideal manager."),
+    ("How do you test a data pipeline?", "How do you monitor a data pipeline?"),
+    ("Tell me about your experience with Kubernetes.", "Tell me about your experience with Terraform."),
+    ("How would you design a URL shortener?", "How would you design a rate limiter?"),
+    ("What is your greatest professional achievement?", "What is your greatest professional regret?"),
+    ("Why are you interested in machine learning?", "Why are you interested in leaving machine learning?"),
+]
+
+def similarity(first: str, second: str) -> float:
+    seen = NearDuplicateFilter(CONFIG.interview.duplicate_threshold)
+    seen.add(first)
+    return seen.similarity(second)
+
+def test_threshold_separates_the_calibration_pairs():
+    caught = [similarity(a, b) >= CONFIG.interview.duplicate_threshold for a, b in PARAPHRASES]
+    false_positives = [(a, b) for a, b in DISTINCT if similarity(a, b) >= CONFIG.interview.duplicate_threshold]
+    # Lexical matching misses rewordings that share few content words ("under pressure" / "pressure at work")
+    assert sum(caught) >= 14
+    assert false_positives == []
+
+def test_threshold_has_no_false_positives_on_held_out_pairs():
+    assert [(a, b) for a, b in HELD_OUT_DISTINCT if similarity(a, b) >= CONFIG.interview.duplicate_threshold] == []
+
+def test_estimate_tracks_exact_jaccard():
+    for first, second in PARAPHRASES + DISTINCT + HELD_OUT_PARAPHRASES + HELD_OUT_DISTINCT:
+        a, b = set(shingles(first)), set(shingles(second))
+        exact = len(a & b) / len(a | b)
+        assert abs(similarity(first, second) - exact) < 0.15
+
+def test_signature_stays_in_the_hash_field():
+    seen = NearDuplicateFilter()
+    signature = seen.signature("How would you design a distributed cache?")
+    assert signature.dtype == np.uint64
+    assert (signature < MERSENNE_PRIME).all()
+
+def test_field_multiplication_matches_exact_arithmetic():
+    seen = NearDuplicateFilter(num_perm=16)
+    hashes = np.array(shingles("How would you design a distributed cache?"), dtype=np.uint64)
+    expected = [[int(a) * int(x) % ((1 << 61) - 1) for x in hashes] for a in seen._a]
+    assert seen._multiply(hashes).tolist() == expected
+
+def test_add_if_new_keeps_first_of_each_group():
+    seen = NearDuplicateFilter()
+    questions = [
+        "Tell me about a challenging project you worked on.",
+        "What was the hardest project you have worked on?",
+        "How do you handle tight deadlines?",
+    ]
+    assert [q for q in questions if seen.add_if_new(q)] == [questions[0], questions[2]]
+    assert len(seen) == 2
+
+def test_texts_without_content_words_are_never_duplicates():
+    seen = NearDuplicateFilter()
+    seen.add("Can you tell me about it?")
+    assert len(seen) == 0
+    assert not seen.is_duplicate("Tell me about it.")
+    assert seen.add_if_new("Could you tell me?")
+
+def test_encoded_signatures_match_hashing_the_texts_again():
+    asked = ["Tell me about a challenging project you worked on.", "How do you handle tight deadlines?"]
+    hashed, decoded = NearDuplicateFilter(), NearDuplicateFilter()
+    hashed.add_all(asked)
+    decoded.add_encoded([decoded.encode(asked[:1]), decoded.encode(asked[1:])])
+    for text in [q for pair in PARAPHRASES for q in pair]:
+        assert decoded.similarity(text) == hashed.similarity(text)
+    assert NearDuplicateFilter().encode(["Can you tell me?"]) is None
+
+def test_split_sentences():
+    assert split_sentences("Great answer. How did you test it? Thanks!") == [
+        "Great answer.", "How did you test it?", "Thanks!",
+    ]
+
+def test_chat_agent_keeps_asked_signatures_incrementally(monkeypatch):
+    from agents import chat_agent
+    from agents.chat_agent import EnhancedChatAgent
+    from agents.conversation_memory import compress_turns
+
+    agent = EnhancedChatAgent.__new__(EnhancedChatAgent)
+    archived = [{"user": "hi", "assistant": "Tell me about a challenging project you worked on."}]
+    state = {"question_bank": [], "current_question_index": 0, "conversation_history": [],
+             "conversation_archive": [compress_turns(archived)]}
+
+    # A checkpoint without signatures is seeded once from the full history
+    assert len(agent._asked_signatures(state)) == 1
+    monkeypatch.setattr(chat_agent, "full_history", lambda state: pytest.fail("history unpacked again"))
+
+    agent._update_conversation_history(state, "It was hard.", "Great. How do you handle tight deadlines?")
+    assert len(state["asked_signatures"]) == 2
+
+    seen = NearDuplicateFilter(CONFIG.interview.duplicate_threshold)
+    seen.add_encoded(state["asked_signatures"])
+    assert seen.is_duplicate("What was the hardest project you have worked on?")
+    assert seen.is_duplicate("How do you deal with tight deadlines?")
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from audio.preprocessing import AudioPreprocessor
+from core.exceptions import AudioError
+
+class FakeSegment:
+    """The parts of a pydub AudioSegment the preprocessor reads"""
+
+    def __init__(self, raw_data: bytes, sample_width: int, channels: int = 1, frame_rate: int = 16000):
+        self.raw_data = raw_data
+        self.sample_width = sample_width
+        self.channels = channels
+        self.frame_rate = frame_rate
+
+def pcm24(values) -> bytes:
+    """Little-endian 24-bit PCM for the given integer samples"""
+    return b"".join(int(v).to_bytes(3, "little", signed=True) for v in values)
+
+def test_to_mono_decodes_16_bit():
+    raw = np.array([0, 16384, -32768, 32767], dtype="<i2").tobytes()
+    samples = AudioPreprocessor.to_mono(FakeSegment(raw, 2))
+    np.testing.assert_allclose(samples, [0.0, 0.5, -1.0, 1.0], atol=1e-4)
+
+def test_to_mono_decodes_24_bit():
+    samples = AudioPreprocessor.to_mono(FakeSegment(pcm24([0, 4194304, -8388608, 8388607]), 3))
+    np.testing.assert_allclose(samples, [0.0, 0.5, -1.0, 1.0], atol=1e-4)
+
+def test_to_mono_averages_channels():
+    raw = np.array([16384, -16384, 32767, 32767], dtype="<i2").tobytes()
+    samples = AudioPreprocessor.to_mono(FakeSegment(raw, 2, channels=2))
+    np.testing.assert_allclose(samples, [0.0, 1.0], atol=1e-4)
+
+def test_to_mono_rejects_unsupported_width():
+    with pytest.raises(AudioError):
+        AudioPreprocessor.to_mono(FakeSegment(b"\x00" * 10, 5))
+
+def test_resample_keeps_duration_and_tone():
+    rate, target = 48000, 16000
+    t = np.arange(rate) / rate
+    tone = np.sin(2 * np.pi * 440 * t).astype(np.float32)
+    resampled = AudioPreprocessor.resample(tone, rate, target)
+    assert len(resampled) == target
+    expected = np.sin(2 * np.pi * 440 * np.arange(target) / target)
+    np.testing.assert_allclose(resampled[100:-100], expected[100:-100], atol=0.05)
+
+def test_resample_filters_above_nyquist():
+    rate, target = 48000, 16000
+    t = np.arange(rate) / rate
+    # 12 kHz is above the 8 kHz target Nyquist and would alias to 4 kHz without the low-pass
+    tone = np.sin(2 * np.pi * 12000 * t).astype(np.float32)
+    resampled = AudioPreprocessor.resample(tone, rate, target)
+    assert np.sqrt(np.mean(resampled[100:-100] ** 2)) < 0.1
@@ -0,0 +1,56 @@
+import pytest
+from utils.question_bank_store import QuestionBankStore
+
+PROFILE = {"domain": "Data Science", "experience_level": "Senior", "skills": ["Python", "SQL", "Spark", "Airflow"]}
+
+def bank(name: str):
+    return [{"question": f"{name} question", "type": "technical", "difficulty": "medium"}]
+
+@pytest.fixture
+def store(tmp_path):
+    return QuestionBankStore(str(tmp_path / "banks.db"), key_skills=3)
+
+def test_role_key_normalizes_case_spacing_and_skill_order(store):
+    variant = {"domain": "  data   science ", "experience_level": "SENIOR", "skills": ["spark", "python", "sql"]}
+    assert store.role_key(variant) == store.role_key(PROFILE)
+
+def test_role_key_uses_only_the_first_skills(store):
+    assert store.role_key(PROFILE) == store.role_key({**PROFILE, "skills": ["Python", "SQL", "Spark", "Go"]})
+    assert store.role_key(PROFILE) != store.role_key({**PROFILE, "skills": ["Python", "SQL", "Go"]})
+
+def test_lookup_prefers_the_requisition_bank(store):
+    store.put(store.role_key(PROFILE), bank("role"))
+    store.put(store.requisition_key("REQ-7"), bank("requisition"))
+    assert store.lookup(PROFILE, "REQ-7") == bank("requisition")
+    assert store.lookup(PROFILE, "REQ-8") == bank("role")
+    assert store.lookup(PROFILE) == bank("role")
+    assert store.lookup({**PROFILE, "domain": "Design"}) is None
+
+def test_store_keeps_existing_banks_unless_replacing(store):
+    store.store(bank("pregenerated"), PROFILE)
+    store.store(bank("live"), PROFILE)
+    assert store.lookup(PROFILE) == bank("pregenerated")
+
+    store.store(bank("regenerated"), PROFILE, replace=True)
+    assert store.lookup(PROFILE) == bank("regenerated")
+
+def test_store_fills_missing_keys_without_touching_present_ones(store):
+    store.store(bank("role"), PROFILE)
+    store.store(bank("new"), PROFILE, "REQ-7")
+    assert store.get(store.requisition_key("REQ-7")) == bank("new")
+    assert store.get(store.role_key(PROFILE)) == bank("role")
+
+def test_replacing_a_bank_keeps_its_hit_count(store):
+    key = store.role_key(PROFILE)
+    store.put(key, bank("old"))
+    store.get(key)
+    store.get(key)
+    store.put(key, bank("new"))
+    assert store.stats() == {"banks": 1, "hits": 2}
+
+def test_banks_persist_across_instances(tmp_path):
+    path = str(tmp_path / "nested" / "banks.db")
+    QuestionBankStore(path).store(bank("saved"), PROFILE)
+    reopened = QuestionBankStore(path)
+    assert reopened.contains(reopened.role_key(PROFILE))
+    assert reopened.lookup(PROFILE) == bank("saved")
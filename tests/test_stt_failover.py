@@ -0,0 +1,79 @@
+import threading
+import time
+import uuid
+import pytest
+from audio import stt_providers
+from audio.recording import RecordingBuffer
+from audio.stt_providers import FailoverSTTChain, STTProvider, get_provider_health
+from config.audio_config import AudioConfig
+from core.exceptions import STTError
+
+RECORDING = RecordingBuffer(b"RIFF", "fingerprint", 1000)
+
+def fast_hedge_config() -> AudioConfig:
+    return AudioConfig(STT_HEDGE=True, STT_HEDGE_DEFAULT_DELAY_S=0.1, STT_HEDGE_MIN_DELAY_S=0.1, STT_HEDGE_MAX_DELAY_S=0.1)
+
+class FakeProvider(STTProvider):
+    """Returns a fixed transcript after a delay, or raises"""
+
+    def __init__(self, text=None, delay: float = 0.0, error: Exception = None):
+        # Health records are process-wide, so every fake gets a fresh name
+        self.name = f"fake-{uuid.uuid4().hex[:8]}"
+        self.text = text
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def transcribe(self, recording):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.text
+
+def test_first_healthy_provider_answers():
+    primary, backup = FakeProvider("hello"), FakeProvider("backup")
+    assert FailoverSTTChain([primary, backup], fast_hedge_config()).transcribe(RECORDING) == "hello"
+    assert backup.calls == 0
+
+def test_failure_falls_through_to_the_next_provider():
+    primary, backup = FakeProvider(error=RuntimeError("down")), FakeProvider("backup")
+    assert FailoverSTTChain([primary, backup], fast_hedge_config()).transcribe(RECORDING) == "backup"
+
+def test_all_failures_raise_with_every_provider_named():
+    providers = [FakeProvider(error=RuntimeError("down")), FakeProvider(error=RuntimeError("also down"))]
+    with pytest.raises(STTError) as error:
+        FailoverSTTChain(providers, fast_hedge_config()).transcribe(RECORDING)
+    assert providers[0].name in str(error.value) and providers[1].name in str(error.value)
+
+def test_slow_provider_is_hedged():
+    primary, backup = FakeProvider("slow", delay=1.0), FakeProvider("fast")
+    started = time.perf_counter()
+    assert FailoverSTTChain([primary, backup], fast_hedge_config()).transcribe(RECORDING) == "fast"
+    assert time.perf_counter() - started < 0.5
+
+def test_open_circuit_is_skipped():
+    broken, backup = FakeProvider(error=RuntimeError("down")), FakeProvider("backup")
+    health = get_provider_health(broken.name)
+    for _ in range(health.failure_threshold):
+        health.record_failure()
+    assert FailoverSTTChain([broken, backup], fast_hedge_config()).transcribe(RECORDING) == "backup"
+    assert broken.calls == 0
+
+def test_time_queued_on_the_executor_does_not_trigger_the_hedge():
+    primary, backup = FakeProvider("primary"), FakeProvider("backup")
+    release = threading.Event()
+    blockers = [stt_providers._provider_executor.submit(release.wait)
+                for _ in range(stt_providers._provider_executor._max_workers)]
+    result = {}
+    caller = threading.Thread(
+        target=lambda: result.update(text=FailoverSTTChain([primary, backup], fast_hedge_config()).transcribe(RECORDING))
+    )
+    caller.start()
+    time.sleep(0.3)  # three hedge delays spent waiting for a worker
+    release.set()
+    for blocker in blockers:
+        blocker.result()
+    caller.join()
+    assert result["text"] == "primary"
+    assert backup.calls == 0
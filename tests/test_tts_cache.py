@@ -0,0 +1,32 @@
+import os
+import threading
+from audio.tts_cache import TTSCache
+
+def disk_size(cache: TTSCache) -> int:
+    return sum(os.path.getsize(path) for path in cache._disk_entries())
+
+def test_concurrent_puts_of_one_key_count_its_size_once(tmp_path):
+    cache = TTSCache(str(tmp_path), disk_max_bytes=1024 * 1024)
+    audio = b"\xff\xfb" * 1000
+    for round_ in range(20):
+        key = f"clip-{round_}"
+        barrier = threading.Barrier(8)
+
+        def put():
+            barrier.wait()
+            cache.put(key, audio)
+
+        threads = [threading.Thread(target=put) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert cache.stats()["disk_bytes"] == disk_size(cache) == 20 * len(audio)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+def test_disk_tier_evicts_down_to_the_limit(tmp_path):
+    cache = TTSCache(str(tmp_path), memory_entries=1, disk_max_bytes=10_000)
+    for i in range(8):
+        cache.put(f"clip-{i}", bytes([i]) * 2000)
+    assert cache.stats()["disk_bytes"] == disk_size(cache) <= 10_000
+    assert cache.get("clip-7") == bytes([7]) * 2000
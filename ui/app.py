@@ -1,7 +1,7 @@
 import streamlit as st
 from datetime import datetime
-from langchain.schema import HumanMessage
 
+from ui.components.audio_player import AudioPlayer
 from ui.components.audio_sidebar import AudioSidebar
 from ui.components.chat_interface import ChatInterface
 from ui.components.voice_input import VoiceInput
@@ -9,6 +9,7 @@ from ui.components.status_display import StatusDisplay
 from ui.components.profile_analysis import ProfileAnalysisDisplay
 from utils.session_manager import SessionManager
 from utils.timer import TimerUtils
+from utils.tracing import start_trace
 
 class StreamlitApp:
     """Main Streamlit application with auto-initialize"""
@@ -16,7 +17,8 @@ class StreamlitApp:
     def __init__(self):
         self.audio_sidebar = AudioSidebar()
         self.chat_interface = ChatInterface()
-        self.voice_input = VoiceInput()
+        self.audio_player = AudioPlayer()
+        self.voice_input = VoiceInput(self.audio_player)
         self.status_display = StatusDisplay()
         self.profile_display = ProfileAnalysisDisplay()
     
@@ -34,6 +36,12 @@ class StreamlitApp:
         # Auto-initialize the interview with hidden hello
         self._auto_initialize_interview()
         
+        # Handle pending TTS
+        self._handle_pending_tts()
+        
+        # Play synthesized speech in the browser, ahead of the chat so streamed turns can start it
+        self.audio_player.render()
+        
         # Render main interface
         self.status_display.render()
         self.profile_display.render()
@@ -42,13 +50,10 @@ class StreamlitApp:
         
         # Handle text input
         self._handle_text_input()
-        
-        # Handle pending TTS
-        self._handle_pending_tts()
     
     def _auto_initialize_interview(self):
         """Auto-initialize the interview if not already done"""
-        if hasattr(st.session_state, 'graph'):
+        if hasattr(st.session_state, 'engine'):
             # Check if we need to auto-initialize
             auto_initialized = SessionManager.auto_initialize_interview()
             
@@ -99,10 +104,20 @@ class StreamlitApp:
                 state = st.session_state.state
                 st.write(f"**Stage:** {state['interview_stage']}")
                 st.write(f"**Messages:** {len(state['messages'])}")
+                st.write(f"**Summarized turns:** {state.get('summarized_turns', 0)} "
+                         f"(archived {state.get('archived_turns', 0)})")
                 st.write(f"**Questions:** {len(state.get('question_bank', []))}")
                 st.write(f"**Ended:** {state.get('is_interview_ended', False)}")
                 st.write(f"**Auto-Init:** {state.get('auto_initialized', False)}")
                 
+                prompt_stats = state.get("prompt_stats")
+                if prompt_stats:
+                    st.write(f"**Prompt eval (last turn):** {prompt_stats['prompt_tokens_evaluated']} of "
+                             f"~{prompt_stats['prompt_tokens_estimated']} tokens in "
+                             f"{prompt_stats['prompt_eval_ms']:.0f} ms")
+                
+                self._render_turn_breakdown(state)
+                
                 if state.get("interview_start_time"):
                     elapsed = datetime.now() - state["interview_start_time"]
                     st.write(f"**Elapsed:** {TimerUtils.format_time(elapsed)}")
@@ -119,50 +134,58 @@ class StreamlitApp:
         st.session_state.state["interview_duration"] = getattr(st.session_state, 'interview_duration', 30)
         st.session_state.state["voice_enabled"] = getattr(st.session_state, 'voice_enabled', False)
     
+    def _render_turn_breakdown(self, state):
+        """Show where the last turn's time went, UI stages first and then the engine's"""
+        spans = list(state.get("turn_trace", []))
+        trace = st.session_state.get("last_trace")
+        if trace is not None:
+            spans = trace.breakdown() + spans
+        if not spans:
+            return
+        
+        st.write("**Last turn breakdown:**")
+        for span in spans:
+            details = ", ".join(
+                f"{key}={span[key]}" for key in ("tokens", "chars", "bytes", "first_token_ms", "cache_hit")
+                if key in span
+            )
+            st.caption(f"{span['name']}: {span['duration_ms']:.0f} ms" + (f" ({details})" if details else ""))
+    
     def _handle_text_input(self):
         """Handle text input for non-ended interviews"""
         if not st.session_state.state.get("is_interview_ended", False):
             user_input = st.chat_input("Type your message here...")
 
             if user_input:
-                st.session_state.state["messages"].append(HumanMessage(content=user_input))
+                with st.chat_message("user"):
+                    st.write(user_input)
 
-                with st.spinner("🤖 Thinking..."):
+                with start_trace("ui.text_turn", st.session_state.state["session_id"]) as trace:
+                    st.session_state.last_trace = trace
+                    tts_pipeline = SessionManager.start_tts_pipeline()
                     try:
-                        result = st.session_state.graph.invoke(st.session_state.state)
-                        st.session_state.state = result
-                        self._mark_tts_response()
+                        # Show the reply token by token instead of waiting for the full generation,
+                        # speaking each sentence as soon as it is complete
+                        turn = SessionManager.stream_turn(user_input)
+                        st.session_state.state = self.chat_interface.render_streaming_reply(
+                            turn, self.audio_player.stream_callback(tts_pipeline)
+                        )
                         
                     except Exception as e:
                         st.error(f"Error processing message: {e}")
+                    finally:
+                        if tts_pipeline:
+                            tts_pipeline.close()
 
                 st.rerun()
         else:
             st.info("💬 Interview has ended. Thank you for participating!")
     
-    def _mark_tts_response(self):
-        """Mark message for TTS but defer playback"""
-        from langchain.schema import AIMessage
-        
-        if (getattr(st.session_state, 'tts_enabled', False) and
-            hasattr(st.session_state, 'tts_manager') and
-            st.session_state.tts_manager and
-            st.session_state.state["messages"]):
-
-            latest_message = st.session_state.state["messages"][-1]
-            if isinstance(latest_message, AIMessage):
-                st.session_state.pending_tts = {
-                    "text": latest_message.content,
-                    "voice": getattr(st.session_state, 'selected_voice', 'rachel'),
-                    "speed": getattr(st.session_state, 'speech_speed', 1.0),
-                }
-    
     def _handle_pending_tts(self):
-        """Handle pending TTS playback"""
+        """Queue pending TTS on the worker pool without blocking the script"""
         if hasattr(st.session_state, "pending_tts"):
             pending = st.session_state.pending_tts
-            with st.spinner("🔊 AI is speaking..."):
-                success = st.session_state.tts_manager.speak_text_sync(
-                    pending["text"], pending["voice"], pending["speed"]
-                )
+            st.session_state.tts_manager.speak_async(
+                pending["text"], pending["voice"], pending["speed"]
+            )
             del st.session_state.pending_tts  # Clear after use
\ No newline at end of file
@@ -0,0 +1,122 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import streamlit as st
+from audio.audio_sinks import BrowserAudioSink, estimate_mp3_seconds
+
+# How often the player checks for the next clip while a reply is playing
+POLL_SECONDS = 0.25
+
+# Extra time a clip is given before the next replaces it, for browser start-up latency
+CLIP_GAP_SECONDS = 0.15
+
+class AudioPlayer:
+    """Browser-side playback of synthesized speech
+
+    The current reply's clips play one after another in a fixed slot, each starting
+    once it is synthesized and the previous clip has had time to finish.
+    """
+
+    def __init__(self):
+        self._slot = None
+        self._rendering = False
+
+    def render(self):
+        """Render the reply's audio, polling only while clips are still to be played
+
+        Called before the chat, so the slot keeps its position when a streamed
+        turn starts clips and the app then reruns.
+        """
+        sink = self._get_sink()
+        if sink is None:
+            return
+
+        self._slot = st.empty()
+        self._rendering = True
+        try:
+            if hasattr(st, "fragment") and not self._is_complete(sink):
+                # Re-run only this fragment until the queue is drained
+                st.fragment(run_every=POLL_SECONDS)(self._refresh)(sink)
+            else:
+                self._refresh(sink)
+        finally:
+            self._rendering = False
+
+    def stream_callback(self, tts_pipeline) -> Optional[Callable[[str], None]]:
+        """Token callback for a streamed reply: feed sentence TTS and start clips as they are ready"""
+        if tts_pipeline is None:
+            return None
+
+        def on_token(token: str):
+            tts_pipeline.feed(token)
+            self.play_due()
+
+        return on_token
+
+    def play_due(self):
+        """Start the next queued clip if it is due; for use while the script is streaming a reply"""
+        sink = self._get_sink()
+        if sink is None or self._slot is None:
+            return
+        clips, playback, advanced = self._advance(sink)
+        if advanced:
+            self._draw(clips, playback)
+
+    def _refresh(self, sink: BrowserAudioSink):
+        """Start the next clip when it is due and redraw the slot"""
+        clips, playback, _ = self._advance(sink)
+        self._draw(clips, playback)
+        if playback["complete"] and not self._rendering:
+            # One full rerun leaves the polling fragment once the reply has played
+            st.rerun()
+
+    @staticmethod
+    def _get_sink() -> Optional[BrowserAudioSink]:
+        tts_manager = getattr(st.session_state, 'tts_manager', None)
+        sink = getattr(tts_manager, 'sink', None)
+        return sink if isinstance(sink, BrowserAudioSink) else None
+
+    def _is_complete(self, sink: BrowserAudioSink) -> bool:
+        _, playback, _ = self._advance(sink, start_next=False)
+        return playback["complete"]
+
+    @staticmethod
+    def _advance(sink: BrowserAudioSink, start_next: bool = True) -> Tuple[List[bytes], Dict[str, Any], bool]:
+        """Move the session's playback cursor to the next clip once the current one is over"""
+        utterance_id, clips, ended = sink.snapshot()
+        playback = st.session_state.get("audio_playback")
+        if playback is None or playback["utterance"] != utterance_id:
+            playback = {"utterance": utterance_id, "started": 0, "due": 0.0}
+            st.session_state.audio_playback = playback
+
+        now = time.monotonic()
+        advanced = start_next and playback["started"] < len(clips) and now >= playback["due"]
+        if advanced:
+            playback["due"] = now + estimate_mp3_seconds(clips[playback["started"]]) + CLIP_GAP_SECONDS
+            playback["started"] += 1
+        playback["complete"] = ended and playback["started"] == len(clips) and now >= playback["due"]
+        return clips, playback, advanced
+
+    def _draw(self, clips: List[bytes], playback: Dict[str, Any]):
+        """Show the clip being played, or the whole reply without autoplay once it has played"""
+        if not playback["started"]:
+            self._slot.empty()
+            return
+
+        if playback["complete"]:
+            # MP3 frames concatenate cleanly, so one element replays the whole reply
+            with self._container(f"reply_audio_{playback['utterance']}"):
+                st.audio(b"".join(clips), format="audio/mpeg")
+            return
+
+        index = playback["started"] - 1
+        # A container keyed by the clip makes each new clip a new element that autoplays,
+        # while redraws of the same clip keep the playing element
+        with self._container(f"reply_clip_{playback['utterance']}_{index}"):
+            st.audio(clips[index], format="audio/mpeg", autoplay=True)
+
+    def _container(self, key: str):
+        try:
+            return self._slot.container(key=key)
+        except TypeError:
+            # Streamlit versions without container keys
+            return self._slot.container()
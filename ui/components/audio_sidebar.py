@@ -91,6 +91,14 @@ class AudioSidebar:
             index=0
         )
         st.session_state.stt_language = stt_language
+        
+        # Provider circuit state and latency
+        stt_manager = getattr(st.session_state, 'stt_manager', None)
+        if stt_manager:
+            for health in stt_manager.provider_health():
+                status = "🔴 circuit open" if health["circuit_open"] else "🟢 healthy"
+                p95 = f"{health['p95_latency']:.1f}s" if health["p95_latency"] is not None else "n/a"
+                st.caption(f"{health['name']}: {status}, p95 {p95}")
     
     def _render_api_status(self):
         """Render API status information"""
@@ -106,6 +114,14 @@ class AudioSidebar:
             st.success(f"✅ Connected to ElevenLabs")
             st.info(f"🎭 {len(available_voices)} voices available")
             
+            # Show audio cache effectiveness
+            cache_stats = st.session_state.tts_manager.cache_stats()
+            st.caption(
+                f"💾 Audio cache: {cache_stats['hit_rate']:.0%} hit rate "
+                f"({cache_stats['memory_hits']} memory, {cache_stats['disk_hits']} disk, "
+                f"{cache_stats['misses']} misses, {cache_stats['disk_bytes'] / 1024 / 1024:.1f} MB on disk)"
+            )
+            
             # Show usage info
             with st.expander("💡 Usage Information"):
                 st.markdown("""
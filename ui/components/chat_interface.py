@@ -1,5 +1,8 @@
 import streamlit as st
 from langchain.schema import HumanMessage, AIMessage
+from agents.conversation_memory import full_history
+from core.types import ChatState
+from utils.tracing import span
 
 class ChatInterface:
     """Chat interface component with selective message display"""
@@ -8,8 +11,9 @@ class ChatInterface:
         """Render the main chat interface"""
         st.subheader("💬 Interview Chat")
         
-        # Display chat history from conversation_history for better control
-        conversation_history = st.session_state.state.get("conversation_history", [])
+        # Display chat history from conversation_history for better control,
+        # including turns the memory has moved to the compressed archive
+        conversation_history = full_history(st.session_state.state)
         
         if conversation_history:
             for exchange in conversation_history:
@@ -39,6 +43,26 @@ class ChatInterface:
         elif stage == "ended":
             st.success("✅ Interview completed!")
     
+    @staticmethod
+    def render_streaming_reply(turn, on_token=None) -> ChatState:
+        """Stream an in-flight turn's reply tokens into an assistant bubble
+
+        on_token also receives every token, e.g. to feed sentence-level TTS.
+        """
+        with span("ui.reply_stream") as attributes:
+            attributes["tokens"] = 0
+
+            def tokens():
+                for token in turn:
+                    attributes["tokens"] += 1
+                    if on_token:
+                        on_token(token)
+                    yield token
+
+            with st.chat_message("assistant"):
+                st.write_stream(tokens())
+            return turn.result
+    
     def display_only_ai_responses(self):
         """Alternative method to display only AI responses"""
         messages = st.session_state.state.get("messages", [])
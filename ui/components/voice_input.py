@@ -1,12 +1,19 @@
 import time
 import streamlit as st
 from audiorecorder import audiorecorder
-from langchain.schema import HumanMessage
+from audio.recording import RecordingBuffer
 from audio.stt_manager import STTManager
+from ui.components.audio_player import AudioPlayer
+from ui.components.chat_interface import ChatInterface
+from utils.session_manager import SessionManager
+from utils.tracing import start_trace
 
 class VoiceInput:
     """Voice input component"""
     
+    def __init__(self, audio_player: AudioPlayer):
+        self.audio_player = audio_player
+    
     def render(self):
         """Render voice input interface"""
         if (st.session_state.state.get("voice_enabled", False) and 
@@ -20,30 +27,35 @@ class VoiceInput:
 
     def _process_audio(self, audio):
         """Process recorded audio"""
-        # Create unique audio ID
-        audio_hash = hash(audio.export().read()[:100])
-        audio_id = f"audio_{len(audio)}_{audio_hash}"
+        # Fingerprint the raw samples; the WAV encode happens once per recording
+        recording = self._get_recording(audio)
+        audio_id = f"audio_{recording.fingerprint}"
 
         if st.session_state.get("last_processed_audio_id") != audio_id:
             st.session_state.last_processed_audio_id = audio_id
-            st.audio(audio.export().read())
+            st.audio(recording.wav_bytes, format="audio/wav")
 
-            with st.spinner("🎯 Processing your voice response..."):
-                try:
-                    if not hasattr(st.session_state, 'stt_manager'):
-                        st.session_state.stt_manager = STTManager()
+            if recording.report:
+                st.caption(f"📉 {recording.report.summary()}")
 
-                    text = st.session_state.stt_manager.record_audio_streamlit(audio)
+            with st.spinner("🎯 Processing your voice response..."), \
+                    start_trace("ui.voice_turn", st.session_state.state["session_id"]) as trace:
+                st.session_state.last_trace = trace
+                try:
+                    text = st.session_state.stt_manager.record_audio_streamlit(recording)
 
                     if text:
                         st.success(f"✅ Heard: '{text}'")
-                        st.session_state.state["messages"].append(HumanMessage(content=text))
-
-                        if hasattr(st.session_state, 'graph'):
-                            with st.spinner("🤖 AI is responding..."):
-                                result = st.session_state.graph.invoke(st.session_state.state)
-                                st.session_state.state = result
-                                self._handle_tts_response()
+                        if hasattr(st.session_state, 'engine'):
+                            tts_pipeline = SessionManager.start_tts_pipeline()
+                            try:
+                                turn = SessionManager.stream_turn(text)
+                                st.session_state.state = ChatInterface.render_streaming_reply(
+                                    turn, self.audio_player.stream_callback(tts_pipeline)
+                                )
+                            finally:
+                                if tts_pipeline:
+                                    tts_pipeline.close()
                         else:
                             st.warning("System not ready")
 
@@ -55,21 +67,15 @@ class VoiceInput:
                 except Exception as e:
                     st.error(f"Speech recognition error: {e}")
         else:
-            st.audio(audio.export().read())
-
-    def _handle_tts_response(self):
-        """Mark message for TTS but defer playback"""
-        from langchain.schema import AIMessage
-        
-        if (getattr(st.session_state, 'tts_enabled', False) and
-            hasattr(st.session_state, 'tts_manager') and
-            st.session_state.tts_manager and
-            st.session_state.state["messages"]):
+            st.audio(recording.wav_bytes, format="audio/wav")
 
-            latest_message = st.session_state.state["messages"][-1]
-            if isinstance(latest_message, AIMessage):
-                st.session_state.pending_tts = {
-                    "text": latest_message.content,
-                    "voice": st.session_state.selected_voice,
-                    "speed": st.session_state.speech_speed,
-                }
\ No newline at end of file
+    def _get_recording(self, audio) -> RecordingBuffer:
+        """Get the prepared in-memory encoding of a recording, reusing it across reruns"""
+        fingerprint = RecordingBuffer.fingerprint_segment(audio)
+        recording = st.session_state.get("last_recording")
+        if recording is None or recording.fingerprint != fingerprint:
+            if not hasattr(st.session_state, 'stt_manager'):
+                st.session_state.stt_manager = STTManager()
+            recording = st.session_state.stt_manager.prepare_recording(audio)
+            st.session_state.last_recording = recording
+        return recording
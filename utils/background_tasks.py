@@ -0,0 +1,96 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from utils.llm_scheduler import llm_session
+
+class BackgroundTask:
+    """Handle on a background job whose results can be collected while it runs"""
+    
+    def __init__(self):
+        self.future = None
+        self.finished_at: Optional[float] = None
+        self._results: List[Any] = []
+        self._collected = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+    
+    def add_result(self, item: Any):
+        """Publish one partial result from the worker"""
+        with self._lock:
+            self._results.append(item)
+    
+    def collect_new(self) -> List[Any]:
+        """Return results published since the last collection"""
+        with self._lock:
+            new_items = self._results[self._collected:]
+            self._collected = len(self._results)
+            return new_items
+    
+    def is_drained(self) -> bool:
+        """Check if the job has finished and every result was collected"""
+        with self._lock:
+            return self.done and self._collected == len(self._results)
+
+class BackgroundTaskRegistry:
+    """Run keyed jobs off the request path on a small shared thread pool
+
+    Keys are interview session ids; a job's LLM calls are scheduled as that session's.
+    """
+    
+    def __init__(self, max_workers: int = 2, retention_seconds: int = 3600):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="background")
+        self._tasks: Dict[Hashable, BackgroundTask] = {}
+        self._lock = threading.Lock()
+        self._retention_seconds = retention_seconds
+    
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> BackgroundTask:
+        """Start fn(task, *args, **kwargs) in the background, replacing any task under key"""
+        task = BackgroundTask()
+        with self._lock:
+            self._prune()
+            self._tasks[key] = task
+            task.future = self._executor.submit(self._run, key, fn, task, *args, **kwargs)
+        task.future.add_done_callback(lambda future: self._on_done(key, task, future))
+        return task
+    
+    @staticmethod
+    def _run(key: Hashable, fn: Callable[..., Any], task: BackgroundTask, *args, **kwargs):
+        with llm_session(str(key)):
+            return fn(task, *args, **kwargs)
+    
+    def get(self, key: Hashable) -> Optional[BackgroundTask]:
+        """Get the task registered under key, if any"""
+        with self._lock:
+            return self._tasks.get(key)
+    
+    def join(self, timeout: Optional[float] = None):
+        """Wait until every registered task has finished"""
+        with self._lock:
+            futures = [task.future for task in self._tasks.values() if task.future is not None]
+        wait(futures, timeout=timeout)
+    
+    def discard(self, key: Hashable):
+        """Forget the task registered under key"""
+        with self._lock:
+            self._tasks.pop(key, None)
+    
+    def _on_done(self, key: Hashable, task: BackgroundTask, future):
+        """Record completion time and report failures"""
+        task.finished_at = time.monotonic()
+        error = future.exception()
+        if error is not None:
+            print(f"Background task {key!r} failed: {error}")
+    
+    def _prune(self):
+        """Drop finished tasks nobody collected within the retention window"""
+        now = time.monotonic()
+        expired = [
+            key for key, task in self._tasks.items()
+            if task.finished_at is not None and now - task.finished_at > self._retention_seconds
+        ]
+        for key in expired:
+            del self._tasks[key]
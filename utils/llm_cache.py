@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
+from config.settings import CONFIG
+
+def make_cache_key(model: str, options: Dict[str, Any], messages) -> str:
+    """Hash the model, its generation options and the prompt with whitespace normalized"""
+    if isinstance(messages, str):
+        prompt = [["human", " ".join(messages.split())]]
+    else:
+        prompt = [
+            [getattr(message, "type", "human"), " ".join(str(getattr(message, "content", message)).split())]
+            for message in messages
+        ]
+    payload = json.dumps({"model": model, "options": options, "prompt": prompt}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class MemoryLLMCache:
+    """In-process LRU of LLM responses with a time to live"""
+    
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, text = entry
+            if self.ttl_seconds and time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return text
+    
+    def set(self, key: str, text: str):
+        with self._lock:
+            self._entries[key] = (time.time(), text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class SQLiteLLMCache:
+    """LLM responses in SQLite with a time to live, shared across processes and restarts"""
+    
+    def __init__(self, path: str, max_entries: int = 512, ttl_seconds: float = 3600):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+    
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT response, stored_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                return None
+            self._connection.execute("UPDATE llm_responses SET used_at = ? WHERE key = ?", (now, key))
+        return row[0]
+    
+    def set(self, key: str, text: str):
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, response, stored_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, text, now, now),
+            )
+            # Least recently used entries go first once the cache is full
+            self._connection.execute(
+                "DELETE FROM llm_responses WHERE key NOT IN "
+                "(SELECT key FROM llm_responses ORDER BY used_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+    
+    def delete(self, key: str):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+    
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM llm_responses")
+
+class InFlightCalls:
+    """LLM calls in progress per cache key, so identical concurrent calls reach the model once"""
+    
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+    
+    def claim(self, key: str) -> Optional[Future]:
+        """Claim the call for key; returns None to make it, or the running call's future to wait for"""
+        with self._lock:
+            running = self._calls.get(key)
+            if running is None:
+                self._calls[key] = Future()
+            return running
+    
+    def release(self, key: str):
+        """Finish a claimed call, waking everyone waiting on it"""
+        with self._lock:
+            future = self._calls.pop(key)
+        future.set_result(None)
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_shared_llm_cache():
+    """Get the process-wide response cache for the configured backend, or None when caching is off"""
+    global _shared_cache
+    backend = CONFIG.model.llm_cache_backend
+    if backend not in ("memory", "sqlite"):
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            if backend == "sqlite":
+                _shared_cache = SQLiteLLMCache(
+                    CONFIG.model.llm_cache_path, CONFIG.model.llm_cache_entries, CONFIG.model.llm_cache_ttl
+                )
+            else:
+                _shared_cache = MemoryLLMCache(CONFIG.model.llm_cache_entries, CONFIG.model.llm_cache_ttl)
+        return _shared_cache
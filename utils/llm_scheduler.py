@@ -0,0 +1,205 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, Optional
+from config.settings import CONFIG
+from utils.tracing import current_trace, record_span
+
+# Most urgent first: a candidate waiting on the reply, then structured extraction, then work off the request path
+PRIORITIES = ("interactive", "extraction", "background")
+
+# Session whose work the current thread or task is doing, when no trace names it
+_current_session: ContextVar[Optional[str]] = ContextVar("llm_session", default=None)
+
+@contextmanager
+def llm_session(session_id: Optional[str]) -> Iterator[None]:
+    """Attribute the LLM calls made inside the block to a session, for fair scheduling"""
+    token = _current_session.set(session_id)
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+def current_session_id() -> Optional[str]:
+    session_id = _current_session.get()
+    if session_id is None:
+        trace = current_trace()
+        session_id = trace.session_id if trace else None
+    return session_id
+
+class _Ticket:
+    """A queued request for a slot, granted to a waiting thread or coroutine"""
+    
+    def __init__(self, priority: str, session_id: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.priority = priority
+        self.session_id = session_id
+        self.queued_at = time.perf_counter()
+        self.granted = False
+        self._event = threading.Event() if loop is None else None
+        self._loop = loop
+        self.future = loop.create_future() if loop is not None else None
+    
+    def grant(self):
+        self.granted = True
+        if self._event is not None:
+            self._event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._resolve)
+    
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+    
+    def wait(self):
+        self._event.wait()
+
+class LLMScheduler:
+    """Bounded-concurrency gate in front of the LLM, shared by all sessions
+
+    Waiting calls are served by priority class, and round-robin across sessions
+    within a class so one interview's burst cannot starve the others. Some slots
+    are kept for interactive calls, so background work never fills the model.
+    """
+    
+    def __init__(self, max_concurrency: int = 2, reserved_interactive: int = 1):
+        self.max_concurrency = max(1, max_concurrency)
+        # Other classes may use every slot but the reserved ones, and always at least one
+        self.shared_limit = max(1, self.max_concurrency - reserved_interactive)
+        self._queues: Dict[str, "OrderedDict[str, Deque[_Ticket]]"] = {priority: OrderedDict() for priority in PRIORITIES}
+        self._running = {priority: 0 for priority in PRIORITIES}
+        self._granted = {priority: 0 for priority in PRIORITIES}
+        self._wait_seconds = {priority: 0.0 for priority in PRIORITIES}
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def slot(self, priority: str, session_id: Optional[str] = None) -> Iterator[None]:
+        """Hold one of the LLM slots for the block, waiting in line if all are busy"""
+        ticket = self._enqueue(_Ticket(priority, session_id or ""))
+        ticket.wait()
+        self._record_wait(ticket)
+        try:
+            yield
+        finally:
+            self._release(ticket)
+    
+    @asynccontextmanager
+    async def aslot(self, priority: str, session_id: Optional[str] = None):
+        """Async variant of slot"""
+        ticket = self._enqueue(_Ticket(priority, session_id or "", asyncio.get_running_loop()))
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if not ticket.granted:
+                    self._remove(ticket)
+                    raise
+            self._release(ticket)
+            raise
+        self._record_wait(ticket)
+        try:
+            yield
+        finally:
+            self._release(ticket)
+    
+    def _enqueue(self, ticket: _Ticket) -> _Ticket:
+        if ticket.priority not in self._queues:
+            raise ValueError(f"Unknown LLM priority {ticket.priority!r}, expected one of {', '.join(PRIORITIES)}")
+        with self._lock:
+            self._queues[ticket.priority].setdefault(ticket.session_id, deque()).append(ticket)
+            self._dispatch()
+        return ticket
+    
+    def _release(self, ticket: _Ticket):
+        with self._lock:
+            self._running[ticket.priority] -= 1
+            self._dispatch()
+    
+    def _remove(self, ticket: _Ticket):
+        sessions = self._queues[ticket.priority]
+        tickets = sessions.get(ticket.session_id)
+        if tickets and ticket in tickets:
+            tickets.remove(ticket)
+            if not tickets:
+                del sessions[ticket.session_id]
+    
+    def _dispatch(self):
+        """Grant free slots to the most urgent waiting tickets; call with the lock held"""
+        while sum(self._running.values()) < self.max_concurrency:
+            ticket = self._next_ticket()
+            if ticket is None:
+                return
+            self._running[ticket.priority] += 1
+            self._granted[ticket.priority] += 1
+            ticket.grant()
+    
+    def _next_ticket(self) -> Optional[_Ticket]:
+        shared_running = sum(count for priority, count in self._running.items() if priority != "interactive")
+        for priority in PRIORITIES:
+            if priority != "interactive" and shared_running >= self.shared_limit:
+                return None
+            sessions = self._queues[priority]
+            if sessions:
+                # Round-robin: serve the first session in line, then move it to the back
+                session_id, tickets = next(iter(sessions.items()))
+                ticket = tickets.popleft()
+                del sessions[session_id]
+                if tickets:
+                    sessions[session_id] = tickets
+                return ticket
+        return None
+    
+    def _record_wait(self, ticket: _Ticket):
+        waited = time.perf_counter() - ticket.queued_at
+        with self._lock:
+            self._wait_seconds[ticket.priority] += waited
+        record_span(f"llm.queue.{ticket.priority}", waited)
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, running calls and totals per priority class"""
+        with self._lock:
+            return {
+                priority: {
+                    "queued": sum(len(tickets) for tickets in self._queues[priority].values()),
+                    "waiting_sessions": len(self._queues[priority]),
+                    "running": self._running[priority],
+                    "granted": self._granted[priority],
+                    "wait_seconds": self._wait_seconds[priority],
+                }
+                for priority in PRIORITIES
+            }
+    
+    def render_prometheus(self) -> str:
+        """Render the scheduler gauges and counters in the Prometheus text format"""
+        stats = self.stats()
+        lines = [
+            "# HELP llm_scheduler_slots Concurrent LLM calls allowed",
+            "# TYPE llm_scheduler_slots gauge",
+            f"llm_scheduler_slots {self.max_concurrency}",
+        ]
+        for metric, key, kind in (
+            ("llm_scheduler_queue_depth", "queued", "gauge"),
+            ("llm_scheduler_waiting_sessions", "waiting_sessions", "gauge"),
+            ("llm_scheduler_running", "running", "gauge"),
+            ("llm_scheduler_granted_total", "granted", "counter"),
+            ("llm_scheduler_wait_seconds_total", "wait_seconds", "counter"),
+        ):
+            lines.append(f"# TYPE {metric} {kind}")
+            for priority in PRIORITIES:
+                lines.append(f'{metric}{{priority="{priority}"}} {stats[priority][key]}')
+        return "\n".join(lines) + "\n"
+
+_shared_scheduler = None
+_shared_scheduler_lock = threading.Lock()
+
+def get_shared_llm_scheduler() -> Optional[LLMScheduler]:
+    """Get the process-wide scheduler, or None when LLM calls are not gated"""
+    global _shared_scheduler
+    if CONFIG.model.llm_max_concurrency <= 0:
+        return None
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = LLMScheduler(CONFIG.model.llm_max_concurrency, CONFIG.model.llm_reserved_interactive)
+        return _shared_scheduler
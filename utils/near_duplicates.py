@@ -0,0 +1,150 @@
+import base64
+import hashlib
+import re
+from typing import Iterable, List, Optional
+import numpy as np
+from utils.question_index import tokenize
+
+SENTENCE_END = re.compile(r"(?<=[.?!])\s+")
+SUFFIX = re.compile(r"(?<=\w{3})(ing|ed|es|s)$")
+
+# Interviewer phrasing that carries no topic ("can you tell me a bit about a time when...")
+FILLER_WORDS = frozenset(
+    "can could would did tell describe share talk give say consider like want bit little please really also "
+    "most recently something everything part been am at now from when where situation example time about "
+    "work worked working ve ll re d s t".split()
+)
+
+# Interview vocabulary that is commonly rephrased, mapped to one canonical word
+SYNONYMS = {
+    word: canonical
+    for canonical, words in {
+        "challenge": "challenge challenges challenging hard hardest tough toughest difficult",
+        "handle": "handle deal cope manage",
+        "top": "top greatest biggest main key",
+        "colleague": "colleague colleagues coworker coworkers teammate teammates",
+        "role": "role position",
+        "company": "company here us our",
+        "show": "show showed demonstrate demonstrated",
+        "fail": "fail failed failure",
+        "year": "year years",
+    }.items()
+    for word in words.split()
+}
+
+# Universal hash family (a * x + b) mod p over the 32-bit shingle hashes. a is drawn
+# from the whole field: a small multiplier barely wraps around p, so a * x would keep
+# the order of x and every permutation would pick the same minimum
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+LOW_32_BITS = np.uint64((1 << 32) - 1)
+LOW_29_BITS = np.uint64((1 << 29) - 1)
+
+def shingles(text: str) -> List[int]:
+    """Hashed content words and content-word bigrams of a text
+
+    Bigrams keep "explain Python to a newcomer" and "explain SQL to a newcomer"
+    apart, while rephrasings that share their content words still overlap.
+    The matching is lexical: rewordings outside SYNONYMS are not recognized.
+    """
+    tokens = [
+        SYNONYMS.get(token) or SUFFIX.sub("", token) for token in tokenize(text) if token not in FILLER_WORDS
+    ]
+    grams = tokens + [" ".join(pair) for pair in zip(tokens, tokens[1:])]
+    # CRC32 is linear, and its values for related grams bias the linear MinHash family; a
+    # cryptographic digest is effectively random, which the MinHash estimate relies on
+    return sorted({
+        int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=4).digest(), "little") for gram in grams
+    })
+
+class NearDuplicateFilter:
+    """MinHash signatures of texts seen so far, for spotting near-duplicates of new ones
+
+    A new text is a near-duplicate when its estimated Jaccard similarity with any
+    seen text reaches the threshold. Signatures are stacked in one matrix so a
+    check is a single vectorized comparison. Only their low 32 bits are kept,
+    which halves their size and leaves chance matches negligible.
+    """
+    
+    def __init__(self, threshold: float = 0.7, num_perm: int = 256, seed: int = 1):
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+    
+    def __len__(self) -> int:
+        return len(self._signatures)
+    
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of a text, or None when it has no content words"""
+        hashes = np.array(shingles(text), dtype=np.uint64)
+        if not len(hashes):
+            return None
+        permuted = (self._multiply(hashes) + self._b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1)
+    
+    def _multiply(self, hashes: np.ndarray) -> np.ndarray:
+        """a * x mod p for every multiplier and hash, without overflowing uint64
+    
+        a is split at bit 32 so each partial product fits. The high part is shifted
+        back up using 2**61 = 1 (mod p): y * 2**32 = (y >> 29) + (y mod 2**29) * 2**32.
+        """
+        high = ((self._a >> np.uint64(32))[:, None] * hashes[None, :]) % MERSENNE_PRIME
+        high = ((high >> np.uint64(29)) + ((high & LOW_29_BITS) << np.uint64(32))) % MERSENNE_PRIME
+        low = ((self._a & LOW_32_BITS)[:, None] * hashes[None, :]) % MERSENNE_PRIME
+        return (high + low) % MERSENNE_PRIME
+    
+    def similarity(self, text: str) -> float:
+        """Highest estimated Jaccard similarity between a text and the seen texts"""
+        signature = self.signature(text)
+        if signature is None or not len(self._signatures):
+            return 0.0
+        return self._best_match(signature.astype(np.uint32))
+    
+    def is_duplicate(self, text: str) -> bool:
+        return self.similarity(text) >= self.threshold
+    
+    def add(self, text: str):
+        self.add_all([text])
+    
+    def add_all(self, texts: Iterable[str]):
+        signatures = self._stack(texts)
+        if signatures is not None:
+            self._signatures = np.vstack([self._signatures, signatures])
+    
+    def add_if_new(self, text: str) -> bool:
+        """Remember a text unless it near-duplicates a seen one; returns whether it was new"""
+        signature = self.signature(text)
+        if signature is None:
+            return True
+        signature = signature.astype(np.uint32)
+        if len(self._signatures) and self._best_match(signature) >= self.threshold:
+            return False
+        self._signatures = np.vstack([self._signatures, signature])
+        return True
+    
+    def encode(self, texts: Iterable[str]) -> Optional[str]:
+        """Pack the signatures of texts into one text block, e.g. to keep them in a checkpointed state"""
+        signatures = self._stack(texts)
+        if signatures is None:
+            return None
+        return base64.b64encode(signatures.astype("<u4").tobytes()).decode("ascii")
+    
+    def add_encoded(self, blocks: Iterable[str]):
+        """Remember signatures packed by encode, without hashing their texts again"""
+        width = self._signatures.shape[1]
+        signatures = [
+            np.frombuffer(base64.b64decode(block), dtype="<u4").reshape(-1, width) for block in blocks
+        ]
+        if signatures:
+            self._signatures = np.vstack([self._signatures] + signatures).astype(np.uint32)
+    
+    def _stack(self, texts: Iterable[str]) -> Optional[np.ndarray]:
+        signatures = [signature for signature in map(self.signature, texts) if signature is not None]
+        return np.vstack(signatures).astype(np.uint32) if signatures else None
+    
+    def _best_match(self, signature: np.ndarray) -> float:
+        return float((self._signatures == signature).mean(axis=1).max())
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence for sentence in SENTENCE_END.split(text.strip()) if sentence]
@@ -0,0 +1,61 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Recorder for the turn being processed in the current thread or task
+_current_recorder: ContextVar[Optional["PromptEvalRecorder"]] = ContextVar("prompt_eval_recorder", default=None)
+
+class PromptEvalRecorder(BaseCallbackHandler):
+    """Collect the prompt-eval timings Ollama reports at the end of each call
+
+    Ollama only evaluates the part of a prompt it cannot reuse from its KV cache,
+    so evaluated tokens well below the prompt size mean the prefix was reused.
+    """
+    
+    def __init__(self, chars_per_token: int = 4):
+        self.chars_per_token = chars_per_token
+        self.calls: List[Dict[str, Any]] = []
+        self._prompt_tokens: List[int] = []
+    
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        chars = sum(len(str(message.content)) for batch in messages for message in batch)
+        self._prompt_tokens.append(-(-chars // self.chars_per_token))
+    
+    def on_llm_end(self, response, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                info = generation.generation_info or {}
+                if "eval_count" not in info:
+                    continue
+                self.calls.append({
+                    # Ollama omits prompt_eval_count when the whole prompt was cached
+                    "prompt_tokens_evaluated": info.get("prompt_eval_count", 0),
+                    "prompt_eval_ms": info.get("prompt_eval_duration", 0) / 1e6,
+                    "prompt_tokens_estimated": self._prompt_tokens.pop(0) if self._prompt_tokens else 0,
+                    "eval_tokens": info.get("eval_count", 0),
+                    "eval_ms": info.get("eval_duration", 0) / 1e6,
+                    "load_ms": info.get("load_duration", 0) / 1e6,
+                })
+    
+    def summary(self) -> Dict[str, Any]:
+        """Totals over the recorded calls"""
+        totals = {"calls": len(self.calls), "recorded_at": time.time()}
+        for key in ("prompt_tokens_evaluated", "prompt_tokens_estimated", "prompt_eval_ms", "eval_tokens", "eval_ms", "load_ms"):
+            totals[key] = sum(call[key] for call in self.calls)
+        return totals
+
+@contextmanager
+def record_prompt_stats(chars_per_token: int = 4) -> Iterator[PromptEvalRecorder]:
+    """Record prompt-eval stats of every LLM call made inside the block"""
+    recorder = PromptEvalRecorder(chars_per_token)
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+def get_current_recorder() -> Optional[PromptEvalRecorder]:
+    """Get the recorder of the enclosing record_prompt_stats block, if any"""
+    return _current_recorder.get()
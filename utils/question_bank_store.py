@@ -0,0 +1,129 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from config.settings import CONFIG
+from core.types import InterviewQuestion, ProfileAnalysis
+
+class QuestionBankStore:
+    """Custom question banks shared across candidates for the same role, in SQLite
+
+    Banks are keyed by an explicit job requisition id, or by the normalized
+    domain, experience level and primary skills of the analyzed profile.
+    """
+    
+    def __init__(self, path: str, key_skills: int = 3):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.key_skills = key_skills
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS question_banks (
+                    key TEXT PRIMARY KEY,
+                    role TEXT NOT NULL,
+                    questions TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )"""
+            )
+    
+    @staticmethod
+    def _normalize(text: Any) -> str:
+        return re.sub(r"\s+", " ", str(text or "")).strip().lower()
+    
+    def role_key(self, profile_analysis: ProfileAnalysis) -> str:
+        """Key for a role: domain, experience level and the first few skills, order-insensitive"""
+        skills = sorted({self._normalize(skill) for skill in profile_analysis.get("skills", [])[:self.key_skills]} - {""})
+        return "role:" + "|".join([
+            self._normalize(profile_analysis.get("domain", "General")),
+            self._normalize(profile_analysis.get("experience_level", "Mid")),
+            ",".join(skills),
+        ])
+    
+    @staticmethod
+    def requisition_key(requisition_id: str) -> str:
+        return f"req:{requisition_id.strip()}"
+    
+    def keys_for(self, profile_analysis: Optional[ProfileAnalysis], requisition_id: Optional[str] = None) -> List[str]:
+        """Keys to try for a candidate, most specific first"""
+        keys = [self.requisition_key(requisition_id)] if requisition_id else []
+        if profile_analysis:
+            keys.append(self.role_key(profile_analysis))
+        return keys
+    
+    def lookup(self, profile_analysis: Optional[ProfileAnalysis],
+               requisition_id: Optional[str] = None) -> Optional[List[InterviewQuestion]]:
+        """Get the stored bank for a candidate's requisition or role, if any"""
+        for key in self.keys_for(profile_analysis, requisition_id):
+            questions = self.get(key)
+            if questions is not None:
+                return questions
+        return None
+    
+    def get(self, key: str) -> Optional[List[InterviewQuestion]]:
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT questions FROM question_banks WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE question_banks SET hits = hits + 1 WHERE key = ?", (key,))
+        return json.loads(row[0])
+    
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            row = self._connection.execute("SELECT 1 FROM question_banks WHERE key = ?", (key,)).fetchone()
+        return row is not None
+    
+    def put(self, key: str, questions: List[InterviewQuestion], role: Optional[Dict[str, Any]] = None,
+            replace: bool = True):
+        """Store a bank, replacing an existing one under the key only when replace is set"""
+        with self._lock, self._connection:
+            if not replace:
+                self._connection.execute(
+                    "INSERT OR IGNORE INTO question_banks (key, role, questions, created_at, hits) VALUES (?, ?, ?, ?, 0)",
+                    (key, json.dumps(role or {}), json.dumps(questions), time.time()),
+                )
+                return
+            self._connection.execute(
+                "INSERT OR REPLACE INTO question_banks (key, role, questions, created_at, hits) "
+                "VALUES (?, ?, ?, ?, COALESCE((SELECT hits FROM question_banks WHERE key = ?), 0))",
+                (key, json.dumps(role or {}), json.dumps(questions), time.time(), key),
+            )
+    
+    def store(self, questions: List[InterviewQuestion], profile_analysis: ProfileAnalysis,
+              requisition_id: Optional[str] = None, replace: bool = False):
+        """Store a generated bank under the candidate's requisition and role keys
+
+        Existing banks are kept unless replace is set, so questions generated while
+        serving a candidate never overwrite a pre-generated or curated bank.
+        """
+        role = {key: profile_analysis.get(key) for key in ("domain", "experience_level", "skills")}
+        if requisition_id:
+            role["requisition_id"] = requisition_id
+        for key in self.keys_for(profile_analysis, requisition_id):
+            self.put(key, questions, role, replace)
+    
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            banks, hits = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM question_banks"
+            ).fetchone()
+        return {"banks": banks, "hits": hits}
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+def get_shared_question_bank_store() -> Optional[QuestionBankStore]:
+    """Get the process-wide store, or None when shared banks are disabled"""
+    global _shared_store
+    if not CONFIG.interview.question_bank_path:
+        return None
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = QuestionBankStore(CONFIG.interview.question_bank_path, CONFIG.interview.question_bank_key_skills)
+        return _shared_store
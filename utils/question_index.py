@@ -0,0 +1,193 @@
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional
+import numpy as np
+from config.settings import CONFIG
+from core.types import InterviewQuestion, ProfileAnalysis
+
+TOKEN = re.compile(r"[a-z0-9+#]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by do does for from has have how i in is it its me of on or that the this "
+    "to was we what when where which who why with you your".split()
+)
+
+DIFFICULTIES = ("easy", "medium", "hard")
+OTHER_DIFFICULTY = len(DIFFICULTIES)
+EXPERIENCE_LEVELS = ("junior", "mid", "senior")
+OTHER_LEVEL = len(EXPERIENCE_LEVELS)
+
+# Priority points per (experience level, difficulty), last row and column for anything else
+DIFFICULTY_FIT = np.array([
+    [2, 2, 0, 0],  # junior: easy and medium
+    [1, 1, 1, 1],  # mid: any difficulty
+    [0, 2, 2, 0],  # senior: medium and hard
+    [0, 0, 0, 0],
+], dtype=np.int32)
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+def difficulty_code(difficulty: Any) -> int:
+    difficulty = str(difficulty or "medium").lower()
+    return DIFFICULTIES.index(difficulty) if difficulty in DIFFICULTIES else OTHER_DIFFICULTY
+
+def level_code(experience_level: Any) -> int:
+    level = str(experience_level or "Mid").lower()
+    return EXPERIENCE_LEVELS.index(level) if level in EXPERIENCE_LEVELS else OTHER_LEVEL
+
+class QuestionFeatures:
+    """Columns of the question fields that prioritization scores on"""
+    
+    def __init__(self, domains: np.ndarray, difficulties: np.ndarray, custom: np.ndarray):
+        self.domains = domains
+        self.difficulties = difficulties
+        self.custom = custom
+    
+    @classmethod
+    def from_questions(cls, questions: List[InterviewQuestion]) -> "QuestionFeatures":
+        domains = np.empty(len(questions), dtype=object)
+        domains[:] = [question.get("domain") for question in questions]
+        return cls(
+            domains,
+            np.fromiter((difficulty_code(q.get("difficulty", "medium")) for q in questions), np.int32, len(questions)),
+            np.fromiter((q.get("category") == "custom" for q in questions), bool, len(questions)),
+        )
+    
+    def take(self, indices: np.ndarray) -> "QuestionFeatures":
+        return QuestionFeatures(self.domains[indices], self.difficulties[indices], self.custom[indices])
+    
+    def priority_scores(self, profile_analysis: ProfileAnalysis) -> np.ndarray:
+        """Relevance to the profile: domain match 3, suitable difficulty up to 2, custom 1"""
+        scores = 3 * (self.domains == profile_analysis.get("domain")).astype(np.int32)
+        scores += DIFFICULTY_FIT[level_code(profile_analysis.get("experience_level", "Mid")), self.difficulties]
+        scores += self.custom
+        return scores
+
+def priority_order(features: QuestionFeatures, profile_analysis: ProfileAnalysis) -> np.ndarray:
+    """Indices from most to least relevant, keeping the original order among equal scores"""
+    return np.argsort(-features.priority_scores(profile_analysis), kind="stable")
+
+class QuestionIndex:
+    """BM25 index over a tagged question corpus, held as NumPy posting arrays
+
+    Each term's postings are a slice of doc_ids and weights (its BM25 term weight
+    per question), so a query is a handful of vectorized scatter-adds.
+    """
+    
+    def __init__(self, questions: List[Dict[str, Any]], k1: float = 1.2, b: float = 0.75):
+        self.questions = questions
+        # Skill and domain tags count twice as much as a word of the question text
+        documents = [
+            tokenize(question["question"])
+            + 2 * tokenize(" ".join(question.get("skills", [])))
+            + 2 * tokenize(question.get("domain", ""))
+            for question in questions
+        ]
+        
+        self.vocabulary: Dict[str, int] = {}
+        term_ids, doc_ids, counts = [], [], []
+        for doc_id, tokens in enumerate(documents):
+            term_counts: Dict[int, int] = {}
+            for token in tokens:
+                term_id = self.vocabulary.setdefault(token, len(self.vocabulary))
+                term_counts[term_id] = term_counts.get(term_id, 0) + 1
+            term_ids.extend(term_counts)
+            doc_ids.extend([doc_id] * len(term_counts))
+            counts.extend(term_counts.values())
+        
+        term_ids = np.array(term_ids, dtype=np.int32)
+        order = np.argsort(term_ids, kind="stable")
+        self.doc_ids = np.array(doc_ids, dtype=np.int32)[order]
+        tf = np.array(counts, dtype=np.float32)[order]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(term_ids, minlength=len(self.vocabulary)))])
+        
+        doc_lengths = np.array([len(tokens) for tokens in documents], dtype=np.float32)
+        doc_freq = np.diff(self.offsets).astype(np.float32)
+        idf = np.log(1 + (len(questions) - doc_freq + 0.5) / (doc_freq + 0.5))
+        norm = k1 * (1 - b + b * doc_lengths[self.doc_ids] / max(doc_lengths.mean(), 1))
+        self.weights = np.repeat(idf, np.diff(self.offsets)) * tf * (k1 + 1) / (tf + norm)
+        
+        self.features = QuestionFeatures.from_questions(questions)
+        self._normalized_domains = np.array([question.get("domain", "").lower() for question in questions], dtype=object)
+        self._skill_keys = [",".join(question.get("skills", [])).lower() for question in questions]
+        self._shape_keys = [f"{question['type']}/{question['difficulty']}" for question in questions]
+    
+    @classmethod
+    def load(cls, path: str) -> "QuestionIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls([json.loads(line) for line in f if line.strip()])
+    
+    def __len__(self) -> int:
+        return len(self.questions)
+    
+    def score(self, query: str) -> np.ndarray:
+        """BM25 score of every question for a free-text query"""
+        scores = np.zeros(len(self.questions), dtype=np.float32)
+        for token in tokenize(query):
+            term_id = self.vocabulary.get(token)
+            if term_id is not None:
+                start, end = self.offsets[term_id], self.offsets[term_id + 1]
+                scores[self.doc_ids[start:end]] += self.weights[start:end]
+        return scores
+    
+    def search(self, profile_analysis: ProfileAnalysis, limit: int = 8, per_key: int = 2) -> List[InterviewQuestion]:
+        """Rank the corpus for a profile and return the best questions, spread over skills and question types
+
+        At most per_key questions share a skill, and at most per_key share a type and difficulty.
+        """
+        query = " ".join(
+            list(profile_analysis.get("skills", [])) + list(profile_analysis.get("focus_areas", []))
+            + [profile_analysis.get("domain", "")]
+        )
+        scores = self.score(query)
+        # Text relevance first; profile fit breaks near-ties towards the right domain and difficulty
+        scores += 0.1 * self.features.priority_scores(profile_analysis)
+        scores[self._normalized_domains == str(profile_analysis.get("domain", "")).lower()] += 1.0
+        
+        candidates = np.flatnonzero(scores > 0)
+        if not len(candidates):
+            return []
+        pool = min(len(candidates), limit * per_key * 8)
+        top = candidates[np.argpartition(-scores[candidates], pool - 1)[:pool]]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        
+        selected, counts = [], {}
+        for doc_id in top:
+            keys = ("skill", self._skill_keys[doc_id]), ("shape", self._shape_keys[doc_id])
+            if all(counts.get(key, 0) < per_key for key in keys):
+                for key in keys:
+                    counts[key] = counts.get(key, 0) + 1
+                selected.append(doc_id)
+                if len(selected) == limit:
+                    break
+        return [self._to_question(doc_id) for doc_id in selected]
+    
+    def _to_question(self, doc_id: int) -> InterviewQuestion:
+        question = self.questions[doc_id]
+        return {
+            "question": question["question"],
+            "type": question["type"],
+            "difficulty": question["difficulty"],
+            "category": question.get("category", "corpus"),
+            "domain": question.get("domain"),
+        }
+
+_shared_index = None
+_shared_index_loaded = False
+_shared_index_lock = threading.Lock()
+
+def get_shared_question_index() -> Optional[QuestionIndex]:
+    """Get the process-wide corpus index, or None when no corpus is configured or found"""
+    global _shared_index, _shared_index_loaded
+    with _shared_index_lock:
+        if not _shared_index_loaded:
+            _shared_index_loaded = True
+            path = CONFIG.interview.question_corpus_path
+            if path and os.path.exists(path):
+                _shared_index = QuestionIndex.load(path)
+                print(f"✅ Question corpus indexed: {len(_shared_index)} questions")
+            elif path:
+                print(f"Question corpus not found at {path}, serving standard questions only")
+        return _shared_index
@@ -1,7 +1,10 @@
 import streamlit as st
-from datetime import datetime
-from langchain.schema import HumanMessage, AIMessage
+from typing import Any, Dict
+from langchain.schema import AIMessage
+from core.exceptions import SessionNotFoundError
 from core.types import ChatState
+from engine.interview_engine import new_chat_state
+from workflow.streaming import TurnStream
 
 class SessionManager:
     """Manage Streamlit session state"""
@@ -10,21 +13,8 @@ class SessionManager:
     def initialize_session_state():
         """Initialize session state variables"""
         if "state" not in st.session_state:
-            st.session_state.state = {
-                "messages": [],
-                "current_question": "",
-                "interview_stage": "greeting",
-                "candidate_info": {},
-                "conversation_history": [],
-                "profile_analysis": {},
-                "question_bank": [],
-                "interview_start_time": None,
-                "interview_duration": 30,
-                "is_interview_ended": False,
-                "voice_enabled": True,
-                "selected_voice": "aria",
-                "auto_initialized": False,  # New flag to track auto-initialization
-            }
+            # Placeholder until the engine starts the session
+            st.session_state.state = new_chat_state()
         
         # Set default voice settings
         defaults = {
@@ -40,28 +30,19 @@ class SessionManager:
     
     @staticmethod
     def auto_initialize_interview():
-        """Auto-initialize the interview with a hidden hello message"""
+        """Auto-initialize the interview; the engine runs the greeting from a hidden hello"""
         if (not st.session_state.state.get("auto_initialized", False) and 
-            hasattr(st.session_state, 'graph')):
-            
-            # Add hidden hello message (won't be displayed)
-            hidden_hello = HumanMessage(content="Hello")
-            st.session_state.state["messages"].append(hidden_hello)
+            hasattr(st.session_state, 'engine')):
             
             try:
-                # Process the hello message through the graph
-                result = st.session_state.graph.invoke(st.session_state.state)
-                st.session_state.state = result
-                
-                # Mark as auto-initialized
-                st.session_state.state["auto_initialized"] = True
+                if SessionManager._restore_session():
+                    return True
                 
-                # Remove the hidden hello message from display
-                # Keep only AI response for display
-                if len(st.session_state.state["messages"]) >= 2:
-                    # Remove the first human message (hello) but keep AI response
-                    ai_response = st.session_state.state["messages"][-1]
-                    st.session_state.state["messages"] = [ai_response]
+                st.session_state.state = st.session_state.engine.start_session(
+                    st.session_state.state["session_id"], SessionManager.get_turn_settings()
+                )
+                # Keep the session id in the URL so a reload or restart can resume it
+                st.query_params["session"] = st.session_state.state["session_id"]
                 
                 # Trigger TTS for the welcome message if enabled
                 SessionManager._trigger_initial_tts()
@@ -70,13 +51,42 @@ class SessionManager:
                 
             except Exception as e:
                 st.error(f"Error during auto-initialization: {e}")
-                # Reset if failed
-                st.session_state.state["auto_initialized"] = False
-                st.session_state.state["messages"] = []
                 return False
         
         return st.session_state.state.get("auto_initialized", False)
     
+    @staticmethod
+    def _restore_session() -> bool:
+        """Resume the interview named in the URL from the engine's checkpoint"""
+        session_id = st.query_params.get("session")
+        if not session_id:
+            return False
+        
+        try:
+            st.session_state.state = st.session_state.engine.get_state(session_id)
+        except SessionNotFoundError:
+            del st.query_params["session"]
+            return False
+        
+        st.session_state.state["auto_initialized"] = True
+        return True
+    
+    @staticmethod
+    def get_turn_settings() -> Dict[str, Any]:
+        """Settings from the sidebar that the engine applies before each turn"""
+        return {
+            "interview_duration": getattr(st.session_state, 'interview_duration', 30),
+            "voice_enabled": getattr(st.session_state, 'voice_enabled', False),
+        }
+    
+    @staticmethod
+    def stream_turn(user_input: str) -> TurnStream:
+        """Send the candidate's input to the engine and stream the reply"""
+        engine = st.session_state.engine
+        session_id = st.session_state.state["session_id"]
+        settings = SessionManager.get_turn_settings()
+        return TurnStream(lambda on_token: engine.run_turn(session_id, user_input, on_token, settings))
+    
     @staticmethod
     def _trigger_initial_tts():
         """Trigger TTS for the initial AI response"""
@@ -93,15 +103,37 @@ class SessionManager:
                     "speed": getattr(st.session_state, 'speech_speed', 1.0),
                 }
     
+    @staticmethod
+    def start_tts_pipeline():
+        """Start sentence-by-sentence TTS for a streamed reply, if TTS is enabled"""
+        if (getattr(st.session_state, 'tts_enabled', False) and
+            hasattr(st.session_state, 'tts_manager') and
+            st.session_state.tts_manager):
+            
+            return st.session_state.tts_manager.create_sentence_pipeline(
+                getattr(st.session_state, 'selected_voice', 'rachel'),
+                getattr(st.session_state, 'speech_speed', 1.0),
+            )
+        return None
+    
     @staticmethod
     def reset_interview():
         """Reset interview while keeping system initialized"""
         keys_to_keep = [
-            'graph', 'tts_manager', 'stt_manager', 
+            'engine', 'tts_manager', 'stt_manager', 
             'voice_enabled', 'tts_enabled', 
             'selected_voice', 'speech_speed'
         ]
         
+        # Release the old interview on the engine side
+        if st.session_state.get("state", {}).get("auto_initialized") and hasattr(st.session_state, 'engine'):
+            try:
+                st.session_state.engine.end_session(st.session_state.state["session_id"])
+            except Exception as e:
+                print(f"Could not end session: {e}")
+        if "session" in st.query_params:
+            del st.query_params["session"]
+        
         for key in list(st.session_state.keys()):
             if key not in keys_to_keep:
                 del st.session_state[key]
@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+from config.settings import CONFIG
+
+# Upper bounds of the duration histogram, in seconds
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Numeric span attributes that are summed into counters
+COUNTED_ATTRIBUTES = ("tokens", "bytes", "chars")
+
+# Trace for the turn being processed in the current thread or task
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+
+class Trace:
+    """Spans recorded for one turn"""
+    
+    def __init__(self, name: str, session_id: Optional[str] = None):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.session_id = session_id
+        self.started_at = time.time()
+        self.duration_ms: Optional[float] = None
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+    
+    def add(self, span: Dict[str, Any]):
+        with self._lock:
+            self.spans.append(span)
+    
+    def breakdown(self) -> List[Dict[str, Any]]:
+        """Spans in start order, as plain dicts"""
+        with self._lock:
+            return sorted(self.spans, key=lambda span: span["offset_ms"])
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "session_id": self.session_id,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "spans": self.breakdown(),
+        }
+
+class StageMetrics:
+    """Process-wide duration histograms and attribute counters per stage"""
+    
+    def __init__(self):
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, stage: str, seconds: float, attributes: Dict[str, Any]):
+        with self._lock:
+            metrics = self._stages.setdefault(stage, {
+                "count": 0,
+                "sum": 0.0,
+                "buckets": [0] * (len(DURATION_BUCKETS) + 1),
+                "counters": {},
+            })
+            metrics["count"] += 1
+            metrics["sum"] += seconds
+            metrics["buckets"][bisect_left(DURATION_BUCKETS, seconds)] += 1
+            for key in COUNTED_ATTRIBUTES:
+                value = attributes.get(key)
+                if isinstance(value, (int, float)):
+                    metrics["counters"][key] = metrics["counters"].get(key, 0) + value
+    
+    def render_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP interview_stage_duration_seconds Duration of traced interview stages",
+            "# TYPE interview_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            stages = {name: dict(metrics, buckets=list(metrics["buckets"]), counters=dict(metrics["counters"]))
+                      for name, metrics in self._stages.items()}
+        
+        for stage, metrics in sorted(stages.items()):
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS + (float("inf"),), metrics["buckets"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'interview_stage_duration_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'interview_stage_duration_seconds_sum{{stage="{stage}"}} {metrics["sum"]}')
+            lines.append(f'interview_stage_duration_seconds_count{{stage="{stage}"}} {metrics["count"]}')
+        
+        for key in COUNTED_ATTRIBUTES:
+            lines.append(f"# TYPE interview_stage_{key}_total counter")
+            for stage, metrics in sorted(stages.items()):
+                if key in metrics["counters"]:
+                    lines.append(f'interview_stage_{key}_total{{stage="{stage}"}} {metrics["counters"][key]}')
+        return "\n".join(lines) + "\n"
+
+METRICS = StageMetrics()
+_export_lock = threading.Lock()
+
+@contextmanager
+def start_trace(name: str, session_id: Optional[str] = None) -> Iterator[Trace]:
+    """Collect the spans recorded inside the block into a new trace, exported when it ends"""
+    trace = Trace(name, session_id)
+    token = _current_trace.set(trace)
+    started = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace.duration_ms = (time.perf_counter() - started) * 1000
+        _current_trace.reset(token)
+        if CONFIG.tracing.enabled:
+            METRICS.observe(name, trace.duration_ms / 1000, {})
+            _export_jsonl(trace)
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Dict[str, Any]]:
+    """Time a stage; attributes added to the yielded dict (tokens, bytes, ...) are recorded with it"""
+    started = time.perf_counter()
+    try:
+        yield attributes
+    except Exception as e:
+        attributes["error"] = type(e).__name__
+        raise
+    finally:
+        record_span(name, time.perf_counter() - started, **attributes)
+
+def record_span(name: str, seconds: float, trace: Optional[Trace] = None, **attributes):
+    """Record a stage timed elsewhere, into the given or current trace and the metrics"""
+    if not CONFIG.tracing.enabled:
+        return
+    METRICS.observe(name, seconds, attributes)
+    trace = trace or _current_trace.get()
+    if trace is not None:
+        ended = time.time()
+        trace.add(dict(
+            attributes,
+            name=name,
+            duration_ms=round(seconds * 1000, 2),
+            offset_ms=round((ended - seconds - trace.started_at) * 1000, 2),
+        ))
+
+def current_trace() -> Optional[Trace]:
+    """Get the trace of the enclosing start_trace block, if any"""
+    return _current_trace.get()
+
+def _export_jsonl(trace: Trace):
+    """Append a finished trace to the JSONL file, if one is configured"""
+    path = CONFIG.tracing.jsonl_path
+    if not path:
+        return
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        line = json.dumps(trace.to_dict(), default=str)
+        with _export_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        print(f"Trace export failed: {e}")
@@ -0,0 +1,47 @@
+import asyncio
+import os
+import sqlite3
+import threading
+from typing import Optional
+from langgraph.checkpoint.sqlite import SqliteSaver
+from config.settings import CONFIG
+
+class ThreadedSqliteSaver(SqliteSaver):
+    """SQLite checkpointer that also serves the async graph path
+
+    SQLite writes are local and short, so the async methods run the sync ones
+    on a worker thread instead of needing a second, loop-bound connection.
+    """
+    
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+    
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+    
+    async def aput_writes(self, config, writes, task_id, *args, **kwargs):
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, *args, **kwargs)
+    
+    async def alist(self, config, **kwargs):
+        for item in await asyncio.to_thread(lambda: list(self.list(config, **kwargs))):
+            yield item
+
+def create_sqlite_checkpointer(path: str) -> ThreadedSqliteSaver:
+    """Open (or create) a SQLite checkpoint database shared by all threads"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return ThreadedSqliteSaver(sqlite3.connect(path, check_same_thread=False))
+
+_shared_checkpointer = None
+_shared_checkpointer_lock = threading.Lock()
+
+def get_shared_checkpointer() -> Optional[ThreadedSqliteSaver]:
+    """Get the process-wide checkpointer, or None when checkpointing is disabled"""
+    global _shared_checkpointer
+    if not CONFIG.engine.checkpoint_path:
+        return None
+    with _shared_checkpointer_lock:
+        if _shared_checkpointer is None:
+            _shared_checkpointer = create_sqlite_checkpointer(CONFIG.engine.checkpoint_path)
+        return _shared_checkpointer
@@ -1,18 +1,47 @@
+import threading
+from typing import Optional
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 from core.types import ChatState
 from agents.chat_agent import EnhancedChatAgent
+from workflow.checkpointing import get_shared_checkpointer
 
-def create_enhanced_chat_graph(model_name: str = "llama3.2"):
-    """Create the enhanced LangGraph workflow"""
+# Compiled graphs keep no per-session state in memory (checkpoints are keyed by
+# thread_id), so one per model serves every session
+_shared_graphs = {}
+_shared_graphs_lock = threading.Lock()
+
+def create_enhanced_chat_graph(model_name: str = "llama3.2", llm=None, checkpointer=None,
+                               chat_agent: Optional[EnhancedChatAgent] = None):
+    """Create the enhanced LangGraph workflow
+
+    With a checkpointer, the state is saved per thread_id after every turn.
+    """
     
-    chat_agent = EnhancedChatAgent(model_name)
+    chat_agent = chat_agent or EnhancedChatAgent(model_name, llm)
     workflow = StateGraph(ChatState)
     
-    def process_message(state: ChatState) -> ChatState:
-        return chat_agent.process(state)
+    def process_message(state: ChatState, config) -> ChatState:
+        # Per-call token sink, so the shared graph can stream to any session
+        on_token = (config or {}).get("configurable", {}).get("on_token")
+        return chat_agent.process(state, on_token)
     
-    workflow.add_node("chat", process_message)
+    async def aprocess_message(state: ChatState, config) -> ChatState:
+        on_token = (config or {}).get("configurable", {}).get("on_token")
+        return await chat_agent.aprocess(state, on_token)
+    
+    # invoke/stream use the sync path, ainvoke/astream the async one
+    workflow.add_node("chat", RunnableLambda(process_message, afunc=aprocess_message))
     workflow.set_entry_point("chat")
     workflow.add_edge("chat", END)
     
-    return workflow.compile()
\ No newline at end of file
+    return workflow.compile(checkpointer=checkpointer)
+
+def get_shared_chat_graph(model_name: str = "llama3.2"):
+    """Get the process-wide compiled graph, building it on first use"""
+    with _shared_graphs_lock:
+        graph = _shared_graphs.get(model_name)
+        if graph is None:
+            graph = create_enhanced_chat_graph(model_name, checkpointer=get_shared_checkpointer())
+            _shared_graphs[model_name] = graph
+        return graph
@@ -0,0 +1,80 @@
+import asyncio
+import queue
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Optional
+from core.types import ChatState
+
+TokenCallback = Callable[[str], None]
+
+class TurnStream:
+    """Run one interview turn in a worker thread and yield reply tokens as they arrive
+
+    run_turn receives a token callback and returns the final state, e.g.
+    lambda on_token: engine.run_turn(session_id, text, on_token).
+    """
+
+    _DONE = object()
+
+    def __init__(self, run_turn: Callable[[TokenCallback], ChatState]):
+        self.result: Optional[ChatState] = None
+        self.error: Optional[Exception] = None
+        self._queue = queue.Queue()
+
+        self._thread = threading.Thread(target=self._run, args=(run_turn,), daemon=True)
+        self._thread.start()
+
+    def _run(self, run_turn: Callable[[TokenCallback], ChatState]):
+        """Drive the turn; the agent pushes tokens onto the queue as it generates"""
+        try:
+            self.result = run_turn(self._queue.put)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._queue.put(self._DONE)
+
+    def __iter__(self) -> Iterator[str]:
+        while True:
+            token = self._queue.get()
+            if token is self._DONE:
+                break
+            yield token
+
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def wait(self) -> ChatState:
+        """Drain any remaining tokens and return the final state"""
+        for _ in self:
+            pass
+        return self.result
+
+class AsyncTurnStream:
+    """Run one interview turn as a task on the event loop and yield reply tokens as they arrive
+
+    Must be created inside a running event loop; many turns can share that loop.
+    """
+
+    _DONE = object()
+
+    def __init__(self, arun_turn: Callable[[TokenCallback], Awaitable[ChatState]]):
+        self.result: Optional[ChatState] = None
+        self._queue = asyncio.Queue()
+
+        self._task = asyncio.ensure_future(arun_turn(self._queue.put_nowait))
+        self._task.add_done_callback(lambda _: self._queue.put_nowait(self._DONE))
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        while True:
+            token = await self._queue.get()
+            if token is self._DONE:
+                break
+            yield token
+
+        self.result = await self._task
+
+    async def wait(self) -> ChatState:
+        """Drain any remaining tokens and return the final state"""
+        async for _ in self:
+            pass
+        return self.result